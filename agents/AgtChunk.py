@@ -0,0 +1,126 @@
+"""
+Chunked (map-reduce) experience extraction node.
+
+Drop-in replacement for the `ExtResExp` / `ExtLkdExp` assistants: documents
+with at least `min_positions` positions are extracted one position per
+request in parallel by `utils.expchunk`; shorter ones keep the single-shot
+prompt, where one generation is faster than the fan-out.
+"""
+
+import time
+from typing import Any, Dict, Optional, Sequence
+
+from autogen_agentchat.agents import BaseChatAgent
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import BaseChatMessage, StructuredMessage, TextMessage
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient, SystemMessage, UserMessage
+from pydantic import ValidationError
+
+from common.constants import CHUNK_CONCURRENCY, CHUNK_MIN_POSITIONS
+from prompts.out_ext import OutComb
+from utils.commonutil import set_logger
+from utils.expchunk import ChunkReport, map_positions, split_positions
+from utils.outrepair import strip_json
+
+logger = set_logger("AgtChunk")
+
+
+class AgtChunk(BaseChatAgent):
+    """
+    Extracts `OutExtExp` from one document, per position when it is long.
+
+    Args:
+        name: Node name in the graph
+        md: Document markdown
+        system: Single-shot system message (document prefix + task)
+        position_system: System message for one position block
+        model_client: Client for both modes
+        min_positions: Positions from which the document is chunked
+        concurrency: Position requests in flight
+    """
+
+    def __init__(
+        self,
+        name: str,
+        md: str,
+        system: str,
+        position_system: str,
+        model_client: ChatCompletionClient,
+        min_positions: int = CHUNK_MIN_POSITIONS,
+        concurrency: int = CHUNK_CONCURRENCY,
+        description: str = "Extracts the work experience of a document, position by position.",
+    ):
+        super().__init__(name, description)
+        self.md = md
+        self.min_positions = min_positions
+        self.concurrency = concurrency
+        self.report = ChunkReport()
+        # Same attributes as AssistantAgent, so node memoization keys cover them
+        self._system_messages = [SystemMessage(content=system), SystemMessage(content=position_system)]
+        self._model_client = model_client
+        self._output_content_type = OutComb.OutExtExp
+
+    @property
+    def produced_message_types(self) -> Sequence[type[BaseChatMessage]]:
+        return (StructuredMessage[OutComb.OutExtExp], TextMessage)
+
+    def memo_config(self) -> Dict[str, Any]:
+        """Settings that determine the output besides the AssistantAgent-like attributes."""
+        return {"min_positions": self.min_positions}
+
+    def _error(self, reason: str) -> Response:
+        return Response(chat_message=TextMessage(content=f"ERROR: {reason}", source=self.name))
+
+    async def _single_shot(
+        self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken
+    ) -> Optional[OutComb.OutExtExp]:
+        result = await self._model_client.create(
+            [
+                self._system_messages[0],
+                *(UserMessage(content=m.to_model_text(), source=m.source) for m in messages),
+            ],
+            json_output=OutComb.OutExtExp,
+            cancellation_token=cancellation_token,
+        )
+        if not isinstance(result.content, str):
+            return None
+        try:
+            return OutComb.OutExtExp.model_validate_json(strip_json(result.content))
+        except (ValidationError, ValueError) as e:
+            logger.warning(f"{self.name}: invalid single-shot output: {e!r}")
+            return None
+
+    async def on_messages(
+        self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken
+    ) -> Response:
+        started = time.perf_counter()
+        blocks = split_positions(self.md)
+        self.report.runs += 1
+
+        if len(blocks) < self.min_positions:
+            self.report.single_shot += 1
+            content = await self._single_shot(messages, cancellation_token)
+            if content is None:
+                return self._error("invalid experience output.")
+        else:
+            entries, failed = await map_positions(
+                self._model_client,
+                self._system_messages[1].content,
+                blocks,
+                self.concurrency,
+                cancellation_token,
+            )
+            self.report.chunks += len(blocks)
+            self.report.failed += failed
+            if failed == len(blocks):
+                return self._error(f"all {failed} position blocks failed.")
+            content = OutComb.OutExtExp.model_validate({"experience": entries})
+
+        self.report.elapsed.append(time.perf_counter() - started)
+        return Response(
+            chat_message=StructuredMessage[OutComb.OutExtExp](content=content, source=self.name)
+        )
+
+    async def on_reset(self, cancellation_token: CancellationToken) -> None:
+        pass
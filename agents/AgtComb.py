@@ -0,0 +1,103 @@
+"""
+Deterministic combination node for the extraction graph.
+
+Replaces the LLM-based `Comb` agent: the upstream `CombExp` and `CombEdu`
+agents already emit validated `OutExtExp` / `OutExtEdu` objects, so the final
+profile is assembled directly in Python without a model call.
+"""
+
+from typing import Any, Dict, Optional, Sequence
+
+from autogen_agentchat.agents import BaseChatAgent
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import BaseChatMessage, StructuredMessage, TextMessage
+from autogen_core import CancellationToken
+from pydantic import BaseModel
+
+from prompts.out_ext import OutComb
+
+# Optional OutComb fields and the output type expected for each
+OPTIONAL_SECTIONS = {
+    "proj": OutComb.OutExtProj,
+    "skill": OutComb.OutExtSkill,
+    "cert": OutComb.OutExtCert,
+    "course": OutComb.OutExtCourse,
+}
+
+
+class AgtComb(BaseChatAgent):
+    """
+    Builds `OutComb` from the last structured experience and education messages.
+
+    Args:
+        name: Node name in the graph
+        exp_source: Agent whose `OutExtExp` output is used
+        edu_source: Agent whose `OutExtEdu` output is used
+        sections: Optional `OutComb` fields (proj, skill, cert, course) -> source agent;
+            a section whose source gave no structured output is left empty
+    """
+
+    def __init__(
+        self,
+        name: str = "Comb",
+        exp_source: str = "CombExp",
+        edu_source: str = "CombEdu",
+        description: str = "Combines the merged experience and education into the final profile.",
+        sections: Optional[Dict[str, str]] = None,
+    ):
+        super().__init__(name, description)
+        self.exp_source = exp_source
+        self.edu_source = edu_source
+        self.sections = dict(sections or {})
+        self._exp: Optional[OutComb.OutExtExp] = None
+        self._edu: Optional[OutComb.OutExtEdu] = None
+        self._extra: Dict[str, BaseModel] = {}
+
+    @property
+    def produced_message_types(self) -> Sequence[type[BaseChatMessage]]:
+        return (StructuredMessage[OutComb], TextMessage)
+
+    def memo_config(self) -> Dict[str, Any]:
+        """Settings that determine the output, for `utils.nodememo.node_key`."""
+        return {"exp_source": self.exp_source, "edu_source": self.edu_source, "sections": self.sections}
+
+    async def on_messages(
+        self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken
+    ) -> Response:
+        # Keep the latest output of each upstream agent, across activations
+        for msg in messages:
+            if not isinstance(msg, StructuredMessage):
+                continue
+            if msg.source == self.exp_source and isinstance(msg.content, OutComb.OutExtExp):
+                self._exp = msg.content
+            elif msg.source == self.edu_source and isinstance(msg.content, OutComb.OutExtEdu):
+                self._edu = msg.content
+            for field, source in self.sections.items():
+                if msg.source == source and isinstance(msg.content, OPTIONAL_SECTIONS[field]):
+                    self._extra[field] = msg.content
+
+        missing = [
+            src
+            for src, out in ((self.exp_source, self._exp), (self.edu_source, self._edu))
+            if out is None
+        ]
+        if missing:
+            return Response(
+                chat_message=TextMessage(
+                    content=f"ERROR: no structured output from {', '.join(missing)}.",
+                    source=self.name,
+                )
+            )
+
+        # Experience first, education second, each in the order provided, then the other sections
+        return Response(
+            chat_message=StructuredMessage[OutComb](
+                content=OutComb(exp=self._exp, edu=self._edu, **self._extra),
+                source=self.name,
+            )
+        )
+
+    async def on_reset(self, cancellation_token: CancellationToken) -> None:
+        self._exp = None
+        self._edu = None
+        self._extra.clear()
@@ -0,0 +1,134 @@
+"""
+Per-node input filtering for the extraction graph.
+
+GraphFlow hands every node all messages broadcast since its last turn: the
+task, the `ExtInEdu` / `ExtInExp` echoes and the outputs of unrelated
+branches, which an `AssistantAgent` then puts into its prompt. `AgtFilter`
+passes a node exactly one message per declared predecessor, the last
+structured one (the last message when the predecessor produced none), like
+a `MessageFilterAgent` with a `PerSourceFilter(position="last", count=1)` per
+parent, derived from the graph instead of written per node.
+"""
+
+from dataclasses import dataclass
+from typing import AsyncGenerator, Dict, List, Optional, Sequence
+
+from autogen_agentchat.agents import BaseChatAgent
+from autogen_agentchat.base import ChatAgent, Response
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, StructuredMessage
+from autogen_agentchat.teams import DiGraph
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient
+
+from utils.commonutil import set_logger
+
+logger = set_logger("AgtFilter")
+
+
+@dataclass
+class FilterReport:
+    """Messages and prompt tokens a node received and was passed, accumulated over runs."""
+
+    activations: int = 0
+    messages_in: int = 0
+    messages_out: int = 0
+    tokens_in: int = 0
+    tokens_out: int = 0
+
+    @property
+    def saved(self) -> float:
+        return 1 - self.tokens_out / self.tokens_in if self.tokens_in else 0.0
+
+
+def model_client(agent: ChatAgent) -> Optional[ChatCompletionClient]:
+    """Client of `agent`, looking through wrappers such as `AgtMemo`."""
+    while agent is not None:
+        client = getattr(agent, "_model_client", None)
+        if client is not None:
+            return client
+        agent = getattr(agent, "inner", None)
+    return None
+
+
+class AgtFilter(BaseChatAgent):
+    """
+    Passes `inner` only the last structured message of each upstream node.
+
+    Args:
+        inner: The wrapped node
+        upstream: Names of the node's parents in the graph ("user" for the task)
+    """
+
+    def __init__(self, inner: ChatAgent, upstream: Sequence[str]):
+        super().__init__(inner.name, inner.description)
+        self.inner = inner
+        self.upstream = list(upstream)
+        self.report = FilterReport()
+        # Prompt tokens are counted with the node's own client; nodes without one are not counted
+        self._client = model_client(inner)
+
+    @property
+    def produced_message_types(self) -> Sequence[type[BaseChatMessage]]:
+        return self.inner.produced_message_types
+
+    def select(self, messages: Sequence[BaseChatMessage]) -> List[BaseChatMessage]:
+        """The last structured (else last) message per upstream node, in upstream order."""
+        last: Dict[str, BaseChatMessage] = {}
+        for msg in messages:
+            if msg.source not in self.upstream:
+                continue
+            if isinstance(msg, StructuredMessage) or not isinstance(last.get(msg.source), StructuredMessage):
+                last[msg.source] = msg
+        return [last[src] for src in self.upstream if src in last]
+
+    def _tokens(self, messages: Sequence[BaseChatMessage]) -> int:
+        if self._client is None or not messages:
+            return 0
+        return self._client.count_tokens([m.to_model_message() for m in messages])
+
+    async def on_messages(
+        self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken
+    ) -> Response:
+        response = None
+        async for item in self.on_messages_stream(messages, cancellation_token):
+            if isinstance(item, Response):
+                response = item
+        assert response is not None
+        return response
+
+    async def on_messages_stream(
+        self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken
+    ) -> AsyncGenerator[BaseAgentEvent | BaseChatMessage | Response, None]:
+        selected = self.select(messages)
+        self.report.activations += 1
+        self.report.messages_in += len(messages)
+        self.report.messages_out += len(selected)
+        self.report.tokens_in += self._tokens(messages)
+        self.report.tokens_out += self._tokens(selected)
+        logger.debug(f"{self.name}: passing {len(selected)} of {len(messages)} messages")
+        async for item in self.inner.on_messages_stream(selected, cancellation_token):
+            yield item
+
+    async def on_reset(self, cancellation_token: CancellationToken) -> None:
+        await self.inner.on_reset(cancellation_token)
+
+
+def filter_inputs(
+    participants: Sequence[ChatAgent], graph: DiGraph, unfiltered: Sequence[str] = ()
+) -> List[ChatAgent]:
+    """
+    Wrap the participants of a graph in `AgtFilter`.
+
+    Args:
+        participants: Graph nodes, e.g. the output of `memoize`
+        graph: The graph they run in
+        unfiltered: Nodes that keep seeing every message
+
+    Returns:
+        List[ChatAgent]: Participants to pass to GraphFlow together with `graph`
+    """
+    parents = graph.get_parents()
+    return [
+        agt if agt.name in unfiltered else AgtFilter(agt, parents.get(agt.name) or ["user"])
+        for agt in participants
+    ]
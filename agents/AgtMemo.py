@@ -0,0 +1,105 @@
+"""
+Memoizing and checkpointing wrapper for graph nodes.
+
+`AgtMemo` takes the name of the node it wraps, so it can replace that node in
+a built `DiGraph` without changing the edges. See `utils.nodememo`.
+"""
+
+from typing import Any, AsyncGenerator, Dict, List, Sequence
+
+from autogen_agentchat.agents import BaseChatAgent
+from autogen_agentchat.base import ChatAgent, Response
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, TextMessage
+from autogen_agentchat.teams import DiGraph
+from autogen_core import CancellationToken
+
+from utils.nodememo import NodeMemo, message_payload, node_key
+
+
+class AgtMemo(BaseChatAgent):
+    """
+    Runs `inner` only when no output is stored for its current inputs.
+
+    Stores are looked up in order; the first hit is copied into the other
+    stores, and a fresh output is written to all of them.
+
+    Args:
+        inner: The wrapped node
+        upstream: Names of the node's parents in the graph ("user" for the task)
+        stores: Shared stores of node outputs, e.g. a run checkpoint and the memo
+    """
+
+    def __init__(self, inner: ChatAgent, upstream: Sequence[str], stores: Sequence[NodeMemo]):
+        super().__init__(inner.name, inner.description)
+        self.inner = inner
+        self.upstream = set(upstream)
+        self.stores = list(stores)
+        self._inputs: Dict[str, Any] = {}
+
+    @property
+    def produced_message_types(self) -> Sequence[type[BaseChatMessage]]:
+        return self.inner.produced_message_types
+
+    async def on_messages(
+        self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken
+    ) -> Response:
+        response = None
+        async for item in self.on_messages_stream(messages, cancellation_token):
+            if isinstance(item, Response):
+                response = item
+        assert response is not None
+        return response
+
+    async def on_messages_stream(
+        self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken
+    ) -> AsyncGenerator[BaseAgentEvent | BaseChatMessage | Response, None]:
+        # Only messages from the declared parents determine the output
+        for msg in messages:
+            if msg.source in self.upstream:
+                self._inputs[msg.source] = message_payload(msg)
+
+        key = node_key(self.inner, self._inputs)
+        for store in self.stores:
+            stored = store.get(key, self.name)
+            if stored is not None:
+                store.reused.append(self.name)
+                for other in self.stores:
+                    if other is not store:
+                        other.put(key, self.name, stored)
+                yield Response(chat_message=stored)
+                return
+
+        for store in self.stores:
+            store.executed.append(self.name)
+        async for item in self.inner.on_messages_stream(messages, cancellation_token):
+            if isinstance(item, Response):
+                msg = item.chat_message
+                # Error replies are not worth keeping
+                if not (isinstance(msg, TextMessage) and msg.content.startswith("ERROR")):
+                    for store in self.stores:
+                        store.put(key, self.name, msg)
+            yield item
+
+    async def on_reset(self, cancellation_token: CancellationToken) -> None:
+        self._inputs.clear()
+        await self.inner.on_reset(cancellation_token)
+
+
+def memoize(
+    participants: Sequence[ChatAgent], graph: DiGraph, stores: Sequence[NodeMemo]
+) -> List[ChatAgent]:
+    """
+    Wrap every participant of a graph in `AgtMemo`.
+
+    Args:
+        participants: Output of `DiGraphBuilder.get_participants()`
+        graph: Output of `DiGraphBuilder.build()`
+        stores: Stores of node outputs, looked up in order
+
+    Returns:
+        List[ChatAgent]: Participants to pass to GraphFlow together with `graph`
+    """
+    parents = graph.get_parents()
+    return [
+        AgtMemo(agt, parents.get(agt.name) or ["user"], stores) for agt in participants
+    ]
@@ -0,0 +1,200 @@
+"""
+Rule-based merge node for the extraction graph.
+
+Replaces the LLM-based `CombEdu` / `CombExp` agents: the resumé and LinkedIn
+entries are paired and merged by `utils.entmatch`, and the model is only
+asked about pairs the rules cannot decide.
+
+With a `SpeculationBoard` the node is speculative: it prepares the entries
+of each source as soon as that source answers and merges once both have,
+before GraphFlow activates it (see `utils.speculate`).
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from autogen_agentchat.agents import BaseChatAgent
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import BaseChatMessage, StructuredMessage, TextMessage
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient
+from pydantic import BaseModel, ValidationError
+
+from prompts.out_ext import OutComb
+from utils.commonutil import set_logger
+from utils.entmatch import MatchReport, match_entries
+from utils.llmclient import get_model_config
+from utils.speculate import SpeculationBoard, SpeculationReport
+
+logger = set_logger("AgtMerge")
+
+# Per entry kind: (output model, list field)
+OUTPUTS = {
+    "edu": (OutComb.OutExtEdu, "education"),
+    "exp": (OutComb.OutExtExp, "experience"),
+}
+
+
+class AgtMerge(BaseChatAgent):
+    """
+    Merges the structured outputs of two extraction agents.
+
+    Args:
+        name: Node name in the graph
+        kind: "edu" or "exp"
+        sources: Upstream agents, the preferred source (resumé) first
+        model_client: Client asked about ambiguous pairs; None keeps both entries
+        board: Board to merge from ahead of the activation; None merges on activation only
+    """
+
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        sources: Sequence[str],
+        model_client: Optional[ChatCompletionClient] = None,
+        description: str = "Merges and de-duplicates the entries of two sources.",
+        board: Optional[SpeculationBoard] = None,
+    ):
+        super().__init__(name, description)
+        self.kind = kind
+        self.sources = list(sources)
+        self.model_client = model_client
+        self.out_type, self.list_field = OUTPUTS[kind]
+        self.report = MatchReport()
+        self._outputs: Dict[str, BaseModel] = {}
+        self.speculation = SpeculationReport()
+        # Speculative state: outputs seen on the board, their entries, the merge in flight
+        self._early: Dict[str, BaseModel] = {}
+        self._prepared: Dict[str, List[Dict[str, Any]]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._token: Optional[CancellationToken] = None
+        self._started = 0.0
+        self._done = 0.0
+        if board is not None:
+            for src in self.sources:
+                board.subscribe(src, self._on_early)
+            # A node served from memo is never activated: drop its merge at the end of the run
+            board.on_close(self._discard)
+
+    @property
+    def produced_message_types(self) -> Sequence[type[BaseChatMessage]]:
+        return (StructuredMessage[self.out_type], TextMessage)
+
+    def memo_config(self) -> Dict[str, Any]:
+        """Settings that determine the output, for `utils.nodememo.node_key`."""
+        return {
+            "kind": self.kind,
+            "sources": self.sources,
+            "model": get_model_config(self.model_client) if self.model_client is not None else None,
+        }
+
+    def _accepts(self, msg: BaseChatMessage) -> bool:
+        return (
+            isinstance(msg, StructuredMessage)
+            and msg.source in self.sources
+            and isinstance(msg.content, self.out_type)
+        )
+
+    def _entries(self, output: BaseModel) -> List[Dict[str, Any]]:
+        return [e.model_dump(mode="json") for e in getattr(output, self.list_field)]
+
+    def _on_early(self, msg: BaseChatMessage) -> None:
+        """Board callback: prepare a source's entries, start the merge once all are in."""
+        if not self._accepts(msg):
+            return
+        self._early[msg.source] = msg.content
+        self._prepared[msg.source] = self._entries(msg.content)
+        if self._task is None and all(src in self._prepared for src in self.sources):
+            first, second = (self._prepared[src] for src in self.sources)
+            self._token = CancellationToken()
+            self._started = time.perf_counter()
+            self._task = asyncio.create_task(
+                match_entries(first, second, self.kind, self.model_client, self._token)
+            )
+            self._task.add_done_callback(self._speculation_done)
+            logger.info(f"{self.name}: merging ahead of activation")
+
+    def _speculation_done(self, task: asyncio.Task) -> None:
+        if task is self._task:
+            self._done = time.perf_counter()
+        # Retrieved here since a discarded merge is never awaited
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"{self.name}: speculative merge failed: {task.exception()!r}")
+
+    def _discard(self) -> None:
+        if self._task is not None:
+            self._token.cancel()
+            self._task.cancel()
+        self._task = None
+        self._early.clear()
+        self._prepared.clear()
+
+    async def _merge(
+        self, cancellation_token: CancellationToken
+    ) -> Tuple[List[Dict[str, Any]], MatchReport]:
+        """The speculative merge if it was made from the current outputs, else a fresh one."""
+        task = self._task
+        if task is not None and all(self._early.get(src) == self._outputs[src] for src in self.sources):
+            finished = self._done if task.done() else time.perf_counter()
+            self._task = None
+            self._early.clear()
+            self._prepared.clear()
+            # From now on the activation's cancellation also stops the speculative merge
+            cancellation_token.add_callback(self._token.cancel)
+            cancellation_token.link_future(task)
+            try:
+                result = await task
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.speculation.misses += 1
+                logger.warning(f"{self.name}: speculative merge failed ({e!r}), merging again")
+            else:
+                self.speculation.hits += 1
+                self.speculation.ahead.append(finished - self._started)
+                return result
+        elif task is not None:
+            self.speculation.misses += 1
+            logger.info(f"{self.name}: inputs changed, discarding the speculative merge")
+        self._discard()
+        first, second = (self._entries(self._outputs[src]) for src in self.sources)
+        return await match_entries(first, second, self.kind, self.model_client, cancellation_token)
+
+    async def on_messages(
+        self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken
+    ) -> Response:
+        # Keep the latest output of each upstream agent, across activations
+        for msg in messages:
+            if self._accepts(msg):
+                self._outputs[msg.source] = msg.content
+
+        missing = [src for src in self.sources if src not in self._outputs]
+        if missing:
+            return Response(
+                chat_message=TextMessage(
+                    content=f"ERROR: no structured output from {', '.join(missing)}.",
+                    source=self.name,
+                )
+            )
+
+        entries, report = await self._merge(cancellation_token)
+        self.report.add(report)
+        logger.info(
+            f"{self.name}: {report.decisions} merge decisions, "
+            f"{report.without_inference:.0%} without inference"
+        )
+        try:
+            content = self.out_type.model_validate({self.list_field: entries})
+        except ValidationError as e:
+            return Response(
+                chat_message=TextMessage(content=f"ERROR: invalid merge: {e}", source=self.name)
+            )
+        return Response(
+            chat_message=StructuredMessage[self.out_type](content=content, source=self.name)
+        )
+
+    async def on_reset(self, cancellation_token: CancellationToken) -> None:
+        self._outputs.clear()
+        self._discard()
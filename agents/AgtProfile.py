@@ -0,0 +1,76 @@
+"""
+Timing wrapper for graph nodes.
+
+`AgtProfile` records the start and end of every activation of the node it
+wraps into a shared `GraphProfile`. See `utils.graphprof`.
+"""
+
+import time
+from typing import AsyncGenerator, List, Sequence
+
+from autogen_agentchat.agents import BaseChatAgent
+from autogen_agentchat.base import ChatAgent, Response
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, TextMessage
+from autogen_core import CancellationToken
+
+from utils.graphprof import GraphProfile
+
+
+class AgtProfile(BaseChatAgent):
+    """
+    Times `inner` into `profile`.
+
+    Args:
+        inner: The wrapped node
+        profile: Shared profile of the run
+    """
+
+    def __init__(self, inner: ChatAgent, profile: GraphProfile):
+        super().__init__(inner.name, inner.description)
+        self.inner = inner
+        self.profile = profile
+
+    @property
+    def produced_message_types(self) -> Sequence[type[BaseChatMessage]]:
+        return self.inner.produced_message_types
+
+    async def on_messages(
+        self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken
+    ) -> Response:
+        response = None
+        async for item in self.on_messages_stream(messages, cancellation_token):
+            if isinstance(item, Response):
+                response = item
+        assert response is not None
+        return response
+
+    async def on_messages_stream(
+        self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken
+    ) -> AsyncGenerator[BaseAgentEvent | BaseChatMessage | Response, None]:
+        started = time.perf_counter()
+        ok = False
+        try:
+            async for item in self.inner.on_messages_stream(messages, cancellation_token):
+                if isinstance(item, Response):
+                    msg = item.chat_message
+                    ok = not (isinstance(msg, TextMessage) and msg.content.startswith("ERROR"))
+                yield item
+        finally:
+            self.profile.record(self.name, started, time.perf_counter(), ok)
+
+    async def on_reset(self, cancellation_token: CancellationToken) -> None:
+        await self.inner.on_reset(cancellation_token)
+
+
+def profile_nodes(participants: Sequence[ChatAgent], profile: GraphProfile) -> List[ChatAgent]:
+    """
+    Wrap every participant of a graph in `AgtProfile`.
+
+    Args:
+        participants: Graph nodes, e.g. the output of `filter_inputs`
+        profile: Profile the spans are recorded into
+
+    Returns:
+        List[ChatAgent]: Participants to pass to GraphFlow
+    """
+    return [AgtProfile(agt, profile) for agt in participants]
@@ -0,0 +1,70 @@
+"""
+Publishing wrapper for graph nodes.
+
+`AgtPublish` puts the answer of the node it wraps on a `SpeculationBoard`
+as soon as it is produced, before GraphFlow delivers it to the next step.
+See `utils.speculate`.
+"""
+
+from typing import AsyncGenerator, List, Sequence
+
+from autogen_agentchat.agents import BaseChatAgent
+from autogen_agentchat.base import ChatAgent, Response
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage
+from autogen_core import CancellationToken
+
+from utils.speculate import SpeculationBoard
+
+
+class AgtPublish(BaseChatAgent):
+    """
+    Publishes the answers of `inner` on `board`.
+
+    Args:
+        inner: The wrapped node
+        board: Board of the run
+    """
+
+    def __init__(self, inner: ChatAgent, board: SpeculationBoard):
+        super().__init__(inner.name, inner.description)
+        self.inner = inner
+        self.board = board
+
+    @property
+    def produced_message_types(self) -> Sequence[type[BaseChatMessage]]:
+        return self.inner.produced_message_types
+
+    async def on_messages(
+        self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken
+    ) -> Response:
+        response = None
+        async for item in self.on_messages_stream(messages, cancellation_token):
+            if isinstance(item, Response):
+                response = item
+        assert response is not None
+        return response
+
+    async def on_messages_stream(
+        self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken
+    ) -> AsyncGenerator[BaseAgentEvent | BaseChatMessage | Response, None]:
+        async for item in self.inner.on_messages_stream(messages, cancellation_token):
+            if isinstance(item, Response):
+                self.board.publish(item.chat_message)
+            yield item
+
+    async def on_reset(self, cancellation_token: CancellationToken) -> None:
+        await self.inner.on_reset(cancellation_token)
+
+
+def publish_outputs(participants: Sequence[ChatAgent], board: SpeculationBoard) -> List[ChatAgent]:
+    """
+    Wrap the participants someone subscribed to on `board` in `AgtPublish`.
+
+    Args:
+        participants: Graph nodes, e.g. the output of `memoize`
+        board: Board of the run
+
+    Returns:
+        List[ChatAgent]: Participants to pass to GraphFlow
+    """
+    return [AgtPublish(agt, board) if agt.name in board.sources else agt for agt in participants]
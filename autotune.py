@@ -0,0 +1,197 @@
+"""
+Model autotuner for the extraction agents.
+
+Runs every extraction role against a labeled sample set with each candidate
+model from `common/constants.py`, scores the outputs against the gold JSON,
+records latency and the memory Ollama reports for the loaded model, and
+writes the recommended agent -> model assignment that final_test.py loads.
+
+Sample manifest (JSON list):
+    [{"role": "ExtResEdu", "doc": "path/to/resume.pdf|.md", "gold": "path/to/gold.json"}]
+
+Usage:
+    python autotune.py samples.json [--models qwen3:30b-a3b gemma3:12b] [--tolerance 0.02]
+"""
+
+import argparse
+import asyncio
+import difflib
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+from autogen_core.models import SystemMessage, UserMessage
+from ollama import AsyncClient, ResponseError
+from pydantic import ValidationError
+
+from common.constants import (
+    MODEL_ASSIGNMENT_FILE,
+    MODEL_CONFIGS,
+    OLLAMA_ENDPOINTS,
+)
+from prompts.out_ext import OutComb
+from prompts.sysmsg_ext import (
+    render_prefix,
+    taskExtLkdEdu,
+    taskExtLkdExp,
+    taskExtResEdu,
+    taskExtResExp,
+)
+from utils.commonutil import load_doc, set_logger
+from utils.datenorm import DateNormClient
+from utils.llmpool import EndpointPool, NoEndpointError, PooledClient
+from utils.outrepair import RepairingClient, strip_json
+
+logger = set_logger("Autotune")
+
+# Role -> (document label, task prompt, user task, output model, list field, key field)
+TASK_EDU = "Please extract the education details from the markdown file"
+TASK_EXP = "Please extract the work experience details from the markdown file"
+ROLES = {
+    "ExtResEdu": ("resumé", taskExtResEdu, TASK_EDU, OutComb.OutExtEdu, "education", "ed_org"),
+    "ExtResExp": ("resumé", taskExtResExp, TASK_EXP, OutComb.OutExtExp, "experience", "exp_org"),
+    "ExtLkdEdu": ("LinkedIn profile", taskExtLkdEdu, TASK_EDU, OutComb.OutExtEdu, "education", "ed_org"),
+    "ExtLkdExp": ("LinkedIn profile", taskExtLkdExp, TASK_EXP, OutComb.OutExtExp, "experience", "exp_org"),
+}
+
+
+def _norm(value: Any) -> Any:
+    if isinstance(value, str):
+        return value.strip().lower()
+    if isinstance(value, list):
+        return sorted(_norm(v) for v in value)
+    return value
+
+
+def score_output(pred: Dict[str, Any], gold: Dict[str, Any], list_field: str, key_field: str) -> float:
+    """
+    Field-level accuracy of a prediction against gold.
+
+    Entries are paired greedily by similarity of `key_field`; each gold entry
+    scores the share of its fields reproduced exactly (case-insensitive,
+    lists as sets). The sum is divided by the number of gold entries plus
+    unmatched predictions, so missing and invented entries both cost accuracy.
+
+    Returns:
+        float: Score in [0, 1]
+    """
+    gold_entries = gold.get(list_field, [])
+    pred_entries = list(pred.get(list_field, []))
+    if not gold_entries and not pred_entries:
+        return 1.0
+
+    total = 0.0
+    for g in gold_entries:
+        best, best_ratio = None, 0.0
+        for p in pred_entries:
+            ratio = difflib.SequenceMatcher(
+                None, _norm(g.get(key_field) or ""), _norm(p.get(key_field) or "")
+            ).ratio()
+            if ratio > best_ratio:
+                best, best_ratio = p, ratio
+        if best is None or best_ratio < 0.6:
+            continue
+        pred_entries.remove(best)
+        total += sum(_norm(best.get(k)) == _norm(v) for k, v in g.items()) / max(len(g), 1)
+    return total / (len(gold_entries) + len(pred_entries))
+
+
+async def model_memory(model: str) -> Optional[int]:
+    """Bytes Ollama reports for the loaded model (max over hosts), if loaded."""
+    sizes = []
+    for host in OLLAMA_ENDPOINTS:
+        try:
+            ps = await AsyncClient(host=host).ps()
+        except Exception:
+            continue
+        sizes += [m.size for m in ps.models if m.model in (model, f"{model}:latest") and m.size]
+    return max(sizes) if sizes else None
+
+
+# Errors of one model call: no host serving the model, Ollama or transport errors
+CALL_ERRORS = (NoEndpointError, ResponseError, httpx.HTTPError, ConnectionError)
+
+
+async def run_sample(client: Any, role: str, doc: str, gold: Dict[str, Any]) -> Dict[str, Any]:
+    label, task, user_task, out_type, list_field, key_field = ROLES[role]
+    messages = [
+        SystemMessage(content=render_prefix(label, doc) + task),
+        UserMessage(content=user_task, source="user"),
+    ]
+    started = time.perf_counter()
+    try:
+        result = await client.create(messages, json_output=out_type)
+        pred = out_type.model_validate_json(strip_json(result.content)).model_dump(mode="json")
+        accuracy = score_output(pred, gold, list_field, key_field)
+    except (ValidationError, ValueError, asyncio.TimeoutError) as e:
+        logger.warning(f"{role}: invalid output: {e!r}")
+        accuracy = 0.0
+    except CALL_ERRORS as e:
+        # One unavailable or failing model scores 0 on the sample, the run goes on
+        logger.warning(f"{role}: call failed: {e!r}")
+        accuracy = 0.0
+    return {"accuracy": accuracy, "latency": time.perf_counter() - started}
+
+
+async def autotune(manifest: Path, models: List[str], tolerance: float) -> Dict[str, Any]:
+    """
+    Evaluate every (role, model) pair and pick a model per role.
+
+    Among models within `tolerance` of the best accuracy for a role, the one
+    with the lowest mean latency wins.
+
+    Returns:
+        Dict[str, Any]: {"assignment": {role: model}, "metrics": {role: {model: ...}}}
+    """
+    samples = json.loads(manifest.read_text())
+    docs = {s["doc"]: load_doc(manifest.parent / s["doc"]) for s in samples}
+    golds = {s["gold"]: json.loads((manifest.parent / s["gold"]).read_text()) for s in samples}
+
+    pool = EndpointPool(OLLAMA_ENDPOINTS)
+    metrics: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for model in models:
+        # Same post-processing as the extractors of the graph
+        client = DateNormClient(RepairingClient(PooledClient(MODEL_CONFIGS[model], pool)))
+        for s in samples:
+            run = await run_sample(client, s["role"], docs[s["doc"]], golds[s["gold"]])
+            m = metrics.setdefault(s["role"], {}).setdefault(
+                model, {"accuracy": [], "latency": [], "memory": None}
+            )
+            m["accuracy"].append(run["accuracy"])
+            m["latency"].append(run["latency"])
+            m["memory"] = await model_memory(model) or m["memory"]
+            logger.info(f"{s['role']} {model}: acc={run['accuracy']:.2f} t={run['latency']:.1f}s")
+        await client.close()
+
+    assignment = {}
+    for role, by_model in metrics.items():
+        for m in by_model.values():
+            m["accuracy"] = sum(m["accuracy"]) / len(m["accuracy"])
+            m["latency"] = sum(m["latency"]) / len(m["latency"])
+        best = max(m["accuracy"] for m in by_model.values())
+        eligible = {k: v for k, v in by_model.items() if v["accuracy"] >= best - tolerance}
+        assignment[role] = min(eligible, key=lambda k: eligible[k]["latency"])
+    return {"assignment": assignment, "metrics": metrics}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pick a model per extraction agent.")
+    parser.add_argument("manifest", type=Path, help="Sample manifest JSON")
+    parser.add_argument("--models", nargs="+", default=list(MODEL_CONFIGS), help="Candidate model names")
+    parser.add_argument("--tolerance", type=float, default=0.02, help="Accuracy slack when preferring faster models")
+    parser.add_argument("--out", type=Path, default=MODEL_ASSIGNMENT_FILE, help="Assignment file to write")
+    args = parser.parse_args()
+
+    unknown = set(args.models) - set(MODEL_CONFIGS)
+    if unknown:
+        parser.error(f"Unknown models: {', '.join(sorted(unknown))}")
+
+    result = asyncio.run(autotune(args.manifest, args.models, args.tolerance))
+    args.out.write_text(json.dumps(result, indent=2))
+    print(json.dumps(result["assignment"], indent=2))
+
+
+if __name__ == "__main__":
+    main()
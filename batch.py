@@ -0,0 +1,183 @@
+"""
+Batch runner for the extraction graph.
+
+Runs one graph instance per candidate from a manifest, several at a time,
+and writes each final `OutComb` JSON as soon as that profile completes.
+Model requests beyond --max-inflight per healthy host wait in the endpoint
+pool, so a slow model backs up the queue instead of piling up requests on
+the hosts.
+
+Manifest (JSON list, paths relative to the manifest):
+    [{"id": "jdoe", "resume": "jdoe/resume.pdf", "linkedin": "jdoe/linkedin.pdf"}]
+
+Usage:
+    python batch.py manifest.json [--out data/batch] [--concurrency 4] [--max-inflight 4]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import final_test
+from prompts.out_ext import OutComb
+from utils.commonutil import load_doc, set_logger
+from utils.docguard import DocumentError
+from utils.eventsink import QuietSink
+
+logger = set_logger("Batch")
+
+
+@dataclass
+class ProfileResult:
+    id: str
+    ok: bool
+    elapsed: float
+    stages: Dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+    issues: List[Dict[str, str]] = field(default_factory=list)
+
+
+async def run_profile(
+    entry: Dict[str, Any], base: Path, out_dir: Path, batch_id: str, pipeline: str = "default"
+) -> ProfileResult:
+    pid = entry.get("id") or Path(entry["resume"]).stem
+    started = time.perf_counter()
+    try:
+        md_resume, md_lkd = await asyncio.gather(
+            asyncio.to_thread(load_doc, base / entry["resume"]),
+            asyncio.to_thread(load_doc, base / entry["linkedin"]),
+        )
+        pipe = final_test.build_flow(md_resume, md_lkd, run_id=f"{batch_id}_{pid}", pipeline=pipeline)
+        parents = pipe.graph.get_parents()
+
+        sink = QuietSink(list(parents))
+        try:
+            await sink.consume(pipe.flow.run_stream(task="Start the flow"))
+        finally:
+            pipe.board.close()
+        final = sink.output(pipe.final)
+        if not isinstance(final, OutComb):
+            raise RuntimeError("graph finished without an OutComb output")
+        (out_dir / f"{pid}.json").write_text(final.model_dump_json(indent=2))
+        elapsed = time.perf_counter() - started
+        logger.info(f"{pid}: done in {elapsed:.1f}s")
+        return ProfileResult(pid, True, elapsed, sink.stage_latencies(parents))
+    except DocumentError as e:
+        logger.warning(f"{pid}: rejected: {e}")
+        return ProfileResult(
+            pid,
+            False,
+            time.perf_counter() - started,
+            error="invalid_input",
+            issues=[i.model_dump() for i in e.issues],
+        )
+    except Exception as e:
+        logger.warning(f"{pid}: failed: {e!r}")
+        return ProfileResult(pid, False, time.perf_counter() - started, error=repr(e))
+
+
+def _distribution(values: List[float]) -> Dict[str, float]:
+    values = sorted(values)
+    pick = lambda q: values[round(q * (len(values) - 1))]
+    return {
+        "n": len(values),
+        "mean": sum(values) / len(values),
+        "p50": pick(0.5),
+        "p90": pick(0.9),
+        "max": values[-1],
+    }
+
+
+def summarize(results: List[ProfileResult], elapsed: float) -> Dict[str, Any]:
+    """
+    Returns:
+        Dict[str, Any]: Throughput, per-stage latency distribution and failures
+    """
+    ok = [r for r in results if r.ok]
+    stages: Dict[str, List[float]] = {}
+    for r in ok:
+        for node, t in r.stages.items():
+            stages.setdefault(node, []).append(t)
+    return {
+        "profiles": len(results),
+        "completed": len(ok),
+        "failed": [{"id": r.id, "error": r.error, "issues": r.issues} for r in results if not r.ok],
+        "elapsed": elapsed,
+        "profiles_per_hour": len(ok) / elapsed * 3600 if elapsed else 0.0,
+        "profile_latency": _distribution([r.elapsed for r in ok]) if ok else {},
+        "stages": {node: _distribution(ts) for node, ts in sorted(stages.items())},
+    }
+
+
+async def run_batch(
+    manifest: Path,
+    out_dir: Path,
+    concurrency: int,
+    max_inflight: int,
+    force: bool = False,
+    pipeline: str = "default",
+) -> Dict[str, Any]:
+    """
+    Run every profile of `manifest`, at most `concurrency` at a time.
+
+    Profiles with an output file in `out_dir` are skipped unless `force`, so
+    an interrupted batch can simply be started again.
+
+    Returns:
+        Dict[str, Any]: The batch report, also written to `out_dir/report.json`
+    """
+    entries = json.loads(manifest.read_text())
+    out_dir.mkdir(parents=True, exist_ok=True)
+    todo = [
+        e
+        for e in entries
+        if force or not (out_dir / f"{e.get('id') or Path(e['resume']).stem}.json").exists()
+    ]
+    logger.info(f"{len(todo)} of {len(entries)} profiles to run")
+
+    batch_id = final_test.telemetry.run_id
+    slots = asyncio.Semaphore(concurrency)
+    # Backpressure: model requests wait for a free slot on a host
+    final_test.pool.max_inflight = max_inflight
+
+    async def worker(entry: Dict[str, Any]) -> ProfileResult:
+        async with slots:
+            return await run_profile(entry, manifest.parent, out_dir, batch_id, pipeline)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(worker(e) for e in todo))
+    report = summarize(list(results), time.perf_counter() - started)
+    report["pipeline"] = pipeline
+    report["results"] = [asdict(r) for r in results]
+    (out_dir / "report.json").write_text(json.dumps(report, indent=2))
+    final_test.telemetry.write_prometheus(final_test.TELEMETRY_DIR / "job_applicator.prom")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the extraction graph over many profiles.")
+    parser.add_argument("manifest", type=Path, help="Profile manifest JSON")
+    parser.add_argument("--out", type=Path, default=Path(__file__).parent / "data" / "batch")
+    parser.add_argument("--concurrency", type=int, default=4, help="Profiles in flight")
+    parser.add_argument("--max-inflight", type=int, default=4, help="Model requests per host before new ones wait")
+    parser.add_argument("--pipeline", default="default", help="Pipeline spec path or name in pipelines/")
+    parser.add_argument("--force", action="store_true", help="Re-run profiles that already have an output")
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        run_batch(args.manifest, args.out, args.concurrency, args.max_inflight, args.force, args.pipeline)
+    )
+    print(
+        f"{report['completed']}/{report['profiles']} profiles in {report['elapsed']:.0f}s "
+        f"({report['profiles_per_hour']:.1f} profiles/hour)"
+    )
+    for node, dist in report["stages"].items():
+        print(f"  {node:<10} p50={dist['p50']:.1f}s p90={dist['p90']:.1f}s max={dist['max']:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark of chunked (map-reduce) vs single-shot experience extraction.
+
+Default: positions found per document by the Python splitter and the time
+it takes. With --llm: runs `AgtChunk` on every document in both modes and
+prints latency, failed runs and, for the chunked mode, the failure rate of
+the position blocks (needs Ollama).
+
+Usage:
+    python bench/bench_chunk.py resume.pdf [linkedin.pdf ...] [--runs 3] [--llm] [--model qwen3:30b-a3b]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from autogen_agentchat.messages import StructuredMessage, TextMessage
+from autogen_core import CancellationToken
+
+from agents.AgtChunk import AgtChunk
+from utils.commonutil import load_doc
+from utils.expchunk import split_positions
+
+
+def bench_split(docs: Dict[str, str], runs: int = 100) -> None:
+    for name, md in docs.items():
+        started = time.perf_counter()
+        for _ in range(runs):
+            blocks = split_positions(md)
+        per_call = (time.perf_counter() - started) / runs
+        print(f"{name}: {len(blocks)} positions, split in {per_call * 1e3:.2f} ms")
+
+
+async def bench_mode(agent: AgtChunk, runs: int) -> Dict[str, float]:
+    token = CancellationToken()
+    latencies: List[float] = []
+    failed = 0
+    for _ in range(runs):
+        started = time.perf_counter()
+        response = await agent.on_messages([TextMessage(content="Start the flow", source="user")], token)
+        latencies.append(time.perf_counter() - started)
+        failed += not isinstance(response.chat_message, StructuredMessage)
+    return {
+        "mean": sum(latencies) / len(latencies),
+        "max": max(latencies),
+        "failed_runs": failed / runs,
+        "block_failure_rate": agent.report.failure_rate,
+    }
+
+
+async def bench_llm(docs: Dict[str, str], runs: int, model: str) -> None:
+    import final_test
+    import prompts.sysmsg_ext as sysmsg
+
+    client = final_test.get_llm(final_test.MODEL_CONFIGS[model])
+    for name, md in docs.items():
+        system = sysmsg.render_prefix("document", md) + sysmsg.taskExtResExp
+        results = {}
+        for mode, min_positions in (("single-shot", 10**6), ("chunked", 0)):
+            agent = AgtChunk(
+                f"Bench_{mode}", md, system, sysmsg.taskExtExpPos, client, min_positions=min_positions
+            )
+            results[mode] = await bench_mode(agent, runs)
+        for mode, r in results.items():
+            print(
+                f"{name} {mode:<11}: mean={r['mean']:.1f}s max={r['max']:.1f}s "
+                f"failed_runs={r['failed_runs']:.0%} block_failures={r['block_failure_rate']:.0%}"
+            )
+    await client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("docs", nargs="+", type=Path, help="Resumé / LinkedIn documents")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--llm", action="store_true", help="Also extract with the model both ways")
+    parser.add_argument("--model", default="qwen3:30b-a3b")
+    args = parser.parse_args()
+
+    docs = {path.name: load_doc(path) for path in args.docs}
+    bench_split(docs)
+    if args.llm:
+        asyncio.run(bench_llm(docs, args.runs, args.model))
+
+
+if __name__ == "__main__":
+    main()
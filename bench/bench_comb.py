@@ -0,0 +1,103 @@
+"""
+Benchmark of the final combination step.
+
+Default: latency of the Python `AgtComb` node on a synthetic profile.
+With --e2e: runs the full final_test.py graph with the LLM `Comb` agent and
+with `AgtComb` and prints the end-to-end wall time of both (needs Ollama).
+
+Usage:
+    python bench/bench_comb.py [--runs 1000] [--e2e]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from autogen_agentchat.messages import StructuredMessage
+from autogen_core import CancellationToken
+
+from agents.AgtComb import AgtComb
+from prompts.out_ext import OutComb
+
+
+def sample_messages(n_exp: int = 8, n_edu: int = 3):
+    exp = OutComb.OutExtExp(
+        experience=[
+            {
+                "exp_org": f"Company {i}",
+                "exp_role": "Software Engineer",
+                "exp_startdate": "01/20",
+                "exp_enddate": "12/22",
+                "exp_location": "Philadelphia, PA",
+                "exp_type": "Full-time",
+                "exp_desc": ["Built things", "Shipped things"],
+            }
+            for i in range(n_exp)
+        ]
+    )
+    edu = OutComb.OutExtEdu(
+        education=[
+            {
+                "ed_lvl": "Undergraduate",
+                "ed_org": f"University {i}",
+                "ed_degree": "Bachelor of Science",
+                "ed_startdate": None,
+                "ed_enddate": "05/22",
+                "ed_status": "Complete",
+                "ed_majors": ["Computer Science"],
+                "ed_minors": [],
+                "ed_location": "Blacksburg, VA",
+                "ed_gpa": None,
+            }
+            for i in range(n_edu)
+        ]
+    )
+    return [
+        StructuredMessage[OutComb.OutExtExp](content=exp, source="CombExp"),
+        StructuredMessage[OutComb.OutExtEdu](content=edu, source="CombEdu"),
+    ]
+
+
+async def bench_node(runs: int) -> float:
+    agent = AgtComb()
+    messages = sample_messages()
+    token = CancellationToken()
+    started = time.perf_counter()
+    for _ in range(runs):
+        await agent.on_messages(messages, token)
+        await agent.on_reset(token)
+    return (time.perf_counter() - started) / runs
+
+
+async def bench_e2e() -> None:
+    import final_test
+
+    # Own run id (checkpoint directory) per run and no memo, so the second
+    # run executes every node instead of restoring the first run's outputs
+    base = final_test.telemetry.run_id
+    times = {}
+    for pipeline in ("llm_comb", "default"):
+        final_test.telemetry.run_id = f"{base}_{pipeline}"
+        times[pipeline] = await final_test.main(pipeline=pipeline, memo=False)
+    llm, py = times["llm_comb"], times["default"]
+    print(f"End-to-end LLM Comb: {llm:.1f}s | Python Comb: {py:.1f}s | saved {llm - py:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--e2e", action="store_true", help="Also run the full graph both ways")
+    args = parser.parse_args()
+
+    per_call = asyncio.run(bench_node(args.runs))
+    print(f"AgtComb: {per_call * 1e6:.1f} us per profile over {args.runs} runs")
+    if args.e2e:
+        asyncio.run(bench_e2e())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Benchmark of the few-shot encodings.
+
+Modes: "raw" embeds the examples of `prompts/fewshot_ext.py` as written
+(banners, pretty-printed JSON), "compact" the compiled examples the prompts
+use, "top-k" the k compiled example entries most similar to the document.
+
+Always: tokens of every few-shot block raw vs compiled, per task prompt
+(also for other few-shot modules given with --fewshot-files, e.g.
+n/prompts/fewshot_ext.py). With a sample manifest: prompt tokens of every
+sample's system message per mode and the time the selection takes; with
+--llm also mean latency and accuracy against the gold JSON (needs Ollama).
+
+Samples use the autotune manifest format:
+    [{"role": "ExtResEdu", "doc": "path/to/resume.pdf|.md", "gold": "path/to/gold.json"}]
+
+Usage:
+    python bench/bench_fewshot.py [samples.json] [--k 2] [--llm] [--model qwen3:30b-a3b]
+        [--fewshot-files n/prompts/fewshot_ext.py]
+"""
+
+import argparse
+import asyncio
+import json
+import runpy
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from autogen_core.models import SystemMessage, UserMessage
+from pydantic import ValidationError
+
+import prompts.fewshot_ext as fewshot_ext
+import prompts.sysmsg_ext as sysmsg
+from autotune import ROLES, score_output
+from utils.commonutil import load_doc
+from utils.datenorm import DateNormClient
+from utils.docguard import DOC_LABELS
+from utils.fewshot import compile_fewshot, select_fewshots
+from utils.outrepair import strip_json
+
+MODES = ("raw", "compact", "top-k")
+
+
+def system_messages(role: str, md: str, k: int) -> Dict[str, str]:
+    task = f"task{role}"
+    doc = "resume" if role.startswith("ExtRes") else "linkedin"
+    tpl = sysmsg.template(task, DOC_LABELS[doc])
+    return {
+        "raw": tpl.render(md, getattr(fewshot_ext, f"fs{role}")),
+        "compact": tpl.render(md),
+        "top-k": tpl.render(md, select_fewshots(sysmsg.FEWSHOTS[task][0], md, k)),
+    }
+
+
+def report_blocks(client: Any, files: List[Path]) -> None:
+    """Tokens of every few-shot block, as written and compiled."""
+    count = lambda text: client.count_tokens([SystemMessage(content=text)])
+    modules = {"prompts/fewshot_ext.py": vars(fewshot_ext)}
+    modules.update({str(f): runpy.run_path(str(f)) for f in files})
+    for path, names in modules.items():
+        for name, raw in names.items():
+            if not (name.startswith("fs") and isinstance(raw, str)):
+                continue
+            kind = "edu" if name.endswith("Edu") else "exp"
+            before, after = count(raw), count(compile_fewshot(raw, kind))
+            print(f"{path} {name}: {before} -> {after} tokens ({1 - after / before:.0%} saved)")
+
+
+async def run(client: Any, role: str, system: str, gold: Dict[str, Any]) -> Dict[str, float]:
+    _, _, user_task, out_type, list_field, key_field = ROLES[role]
+    started = time.perf_counter()
+    try:
+        result = await client.create(
+            [SystemMessage(content=system), UserMessage(content=user_task, source="user")],
+            json_output=out_type,
+        )
+        pred = out_type.model_validate_json(strip_json(result.content)).model_dump(mode="json")
+        accuracy = score_output(pred, gold, list_field, key_field)
+    except (ValidationError, ValueError):
+        accuracy = 0.0
+    return {"latency": time.perf_counter() - started, "accuracy": accuracy}
+
+
+async def bench(manifest: Optional[Path], k: int, llm: bool, model: str, files: List[Path]) -> None:
+    import final_test
+
+    client = DateNormClient(final_test.get_llm(final_test.MODEL_CONFIGS[model]))
+    report_blocks(client, files)
+    if manifest is None:
+        await client.close()
+        return
+
+    samples = json.loads(manifest.read_text())
+    totals: Dict[str, Dict[str, List[float]]] = {
+        m: {"tokens": [], "latency": [], "accuracy": []} for m in MODES
+    }
+    for s in samples:
+        md = load_doc(manifest.parent / s["doc"])
+        started = time.perf_counter()
+        systems = system_messages(s["role"], md, k)
+        select_ms = (time.perf_counter() - started) * 1e3
+        gold = json.loads((manifest.parent / s["gold"]).read_text()) if llm else None
+        for mode, system in systems.items():
+            totals[mode]["tokens"].append(client.count_tokens([SystemMessage(content=system)]))
+            if llm:
+                r = await run(client, s["role"], system, gold)
+                totals[mode]["latency"].append(r["latency"])
+                totals[mode]["accuracy"].append(r["accuracy"])
+        print(
+            f"{s['role']} {s['doc']}: tokens raw={totals['raw']['tokens'][-1]} "
+            f"compact={totals['compact']['tokens'][-1]} top-{k}={totals['top-k']['tokens'][-1]} "
+            f"(render {select_ms:.2f} ms)"
+        )
+
+    mean = lambda xs: sum(xs) / len(xs) if xs else float("nan")
+    for mode, t in totals.items():
+        line = f"{mode:<7}: prompt_tokens={mean(t['tokens']):.0f}"
+        if llm:
+            line += f" latency={mean(t['latency']):.1f}s accuracy={mean(t['accuracy']):.3f}"
+        print(line)
+    for mode in ("compact", "top-k"):
+        saved = 1 - mean(totals[mode]["tokens"]) / mean(totals["raw"]["tokens"])
+        print(f"Prompt tokens saved by {mode}: {saved:.0%}")
+    await client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("manifest", type=Path, nargs="?", help="Sample manifest JSON (autotune format)")
+    parser.add_argument("--k", type=int, default=2, help="Example entries to select")
+    parser.add_argument("--llm", action="store_true", help="Also run both prompts and score them")
+    parser.add_argument("--model", default="qwen3:30b-a3b")
+    parser.add_argument("--fewshot-files", nargs="*", type=Path, default=[], help="Other few-shot modules to report")
+    args = parser.parse_args()
+    asyncio.run(bench(args.manifest, args.k, args.llm, args.model, args.fewshot_files))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Micro-benchmark of `OutComb` validation.
+
+Profiles are assembled from the valid example outputs of
+`prompts/fewshot_ext.py` and serialized once; each path then validates all
+of them from the raw JSON bytes:
+
+    dict:     json.loads + OutComb.model_validate (generic path)
+    model:    OutComb.model_validate_json, as used by the repair client, the
+              chunked extractors and AssistantAgent's `output_content_type`
+    batch:    one JSON array through a `List[OutComb]` adapter
+
+Usage:
+    python bench/bench_validate.py [--profiles 10000] [--repeat 5]
+"""
+
+import argparse
+import itertools
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pydantic import TypeAdapter, ValidationError
+
+from prompts.fewshot_ext import fsExtLkdEdu, fsExtLkdExp, fsExtResEdu, fsExtResExp
+from prompts.out_ext import OutComb
+from utils.fewshot import parse_examples
+
+
+def valid_outputs(model_cls: type, fewshots: List[str]) -> List[dict]:
+    out = []
+    for fewshot in fewshots:
+        for _, output in parse_examples(fewshot):
+            try:
+                out.append(model_cls.model_validate(output).model_dump(mode="json"))
+            except ValidationError:
+                continue
+    return out
+
+
+def profiles(n: int) -> List[bytes]:
+    """`n` serialized profiles, cycling through the example outputs."""
+    edus = valid_outputs(OutComb.OutExtEdu, [fsExtResEdu, fsExtLkdEdu])
+    exps = valid_outputs(OutComb.OutExtExp, [fsExtResExp, fsExtLkdExp])
+    pairs = itertools.cycle(itertools.product(exps, edus))
+    return [json.dumps({"exp": exp, "edu": edu}).encode() for exp, edu in itertools.islice(pairs, n)]
+
+
+def best_rate(run: Callable[[], object], count: int, repeat: int) -> float:
+    """Validations per second of the fastest of `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return count / best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profiles", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    raws = profiles(args.profiles)
+    batch = b"[" + b",".join(raws) + b"]"
+    batch_adapter = TypeAdapter(List[OutComb])
+    print(f"{len(raws)} profiles, {sum(map(len, raws)) / len(raws):.0f} bytes each")
+
+    paths = {
+        "dict": lambda: [OutComb.model_validate(json.loads(r)) for r in raws],
+        "model": lambda: [OutComb.model_validate_json(r) for r in raws],
+        "batch": lambda: batch_adapter.validate_json(batch),
+    }
+    base = None
+    for name, run in paths.items():
+        rate = best_rate(run, len(raws), args.repeat)
+        base = base or rate
+        print(f"{name:<8}: {rate:,.0f} validations/s ({rate / base:.2f}x dict)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,36 @@
 # Imports
+import json
+import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 
-from docling.document_converter import DocumentConverter
-
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 """
 Prompts
 """
 
-# Main markdown for the resume and LinkedIn data
-MD_RESUME = (
-    DocumentConverter()
-    .convert(Path(__file__).parent.parent / "data" / "resume" / "self1.pdf")
-    .document.export_to_markdown()
-)
-MD_LKD = (
-    DocumentConverter()
-    .convert(Path(__file__).parent.parent / "data" / "lkd" / "self1.pdf")
-    .document.export_to_markdown()
-)
+# Default resume and LinkedIn documents, converted on first use only
+DOC_RESUME = Path(__file__).parent.parent / "data" / "resume" / "self1.pdf"
+DOC_LKD = Path(__file__).parent.parent / "data" / "lkd" / "self1.pdf"
+
+
+@lru_cache(maxsize=None)
+def default_doc(kind: str) -> str:
+    """Markdown of the default resume ("resume") or LinkedIn profile ("linkedin")."""
+    from utils.commonutil import load_doc
+
+    return load_doc(DOC_RESUME if kind == "resume" else DOC_LKD)
+
+
+def __getattr__(name: str) -> str:
+    # MD_RESUME / MD_LKD for scripts: importing this module converts nothing
+    if name == "MD_RESUME":
+        return default_doc("resume")
+    if name == "MD_LKD":
+        return default_doc("linkedin")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 """
 Model Configs Setup
@@ -43,6 +53,10 @@ def create_model_config(model_name: str) -> dict:
     elif "gemma" in model_name:
         config["model_info"] = MODEL_INFO_GEMMA
 
+    # Cap generation for reasoning models so endless thinking cannot stall a run
+    if "deepseek-r1" in model_name:
+        config["num_predict"] = MAX_TOKENS_REASONING
+
     return config
 
 
@@ -72,6 +86,9 @@ MODEL_INFO_GEMMA = {
     "multiple_system_messages": False,
 }
 
+# Generation cap (Ollama num_predict) for reasoning models
+MAX_TOKENS_REASONING = 8192
+
 # Qwen3
 qwen3_30b = create_model_config("qwen3:30b-a3b")
 qwen3_1_7b = create_model_config("qwen3:1.7b")
@@ -92,15 +109,93 @@ gemma3qat_12b = create_model_config("gemma3:12b-it-qat")
 llama32fp16_3b = create_model_config("llama3.2:3b-instruct-fp16")
 llama32_1b = create_model_config("llama3.2:1b")
 
+# All configs by model name, the candidate set for autotune.py
+MODEL_CONFIGS = {
+    cfg["model"]: cfg
+    for cfg in [
+        qwen3_30b,
+        qwen3_1_7b,
+        deepR1_1b,
+        deepR1_7b,
+        deepR1_14b,
+        deepR1_32b,
+        deepR1distill_7b,
+        gemma3_4b,
+        gemma3_12b,
+        gemma3qat_12b,
+        llama32fp16_3b,
+        llama32_1b,
+    ]
+}
+
+# Per-agent model assignment written by autotune.py
+MODEL_ASSIGNMENT_FILE = Path(__file__).parent.parent / "data" / "model_assignment.json"
+
+
+def load_model_assignment(path: Path = MODEL_ASSIGNMENT_FILE) -> dict:
+    """
+    Load the agent -> model name mapping recommended by autotune.py.
+
+    Returns:
+        dict: Agent name to model name, empty if the file does not exist
+    """
+    if not path.exists():
+        return {}
+    with open(path, "r") as f:
+        return json.load(f).get("assignment", {})
+
+"""
+Endpoints
+"""
+
+# Ollama hosts shared by all model configs, comma separated in OLLAMA_HOSTS
+OLLAMA_ENDPOINTS = [
+    h.strip()
+    for h in os.environ.get("OLLAMA_HOSTS", "http://localhost:11434").split(",")
+    if h.strip()
+]
+
+"""
+Latency Budgets
+"""
+
+# Per-agent budgets in seconds: `timeout` is the hard cap for one model call,
+# `hedge_after` is when a backup request goes to the agent's hedge model
+AGENT_BUDGETS = {
+    "ExtInEdu": {"timeout": 60},
+    "ExtInExp": {"timeout": 60},
+    "ExtResEdu": {"timeout": 300},
+    "ExtResExp": {"timeout": 300},
+    "ExtLkdEdu": {"timeout": 300},
+    "ExtLkdExp": {"timeout": 900, "hedge_after": 300},
+    "ExtResProj": {"timeout": 300},
+    "ExtResSkill": {"timeout": 300},
+    "ExtResCert": {"timeout": 300},
+    "ExtResCourse": {"timeout": 300},
+    "CombEdu": {"timeout": 300},
+    "CombExp": {"timeout": 900, "hedge_after": 300},
+    "Comb": {"timeout": 900, "hedge_after": 300},
+}
+
+"""
+Chunked Extraction
+"""
+
+# Experience sections with at least this many positions are extracted one
+# position per request (map-reduce) instead of in a single generation
+CHUNK_MIN_POSITIONS = 10
+# Position requests in flight per chunked node
+CHUNK_CONCURRENCY = 4
+
 
 def main():
     """
     Main function to run the script.
     """
     print("Resume Markdown:")
-    print(MD_RESUME)
+    print(default_doc("resume"))
     print("\nLinkedIn Markdown:")
-    print(MD_LKD)
+    print(default_doc("linkedin"))
 
 
 if __name__ == "__main__":
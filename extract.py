@@ -0,0 +1,115 @@
+"""
+Headless extraction of one candidate profile.
+
+Runs the extraction graph on a resumé and a LinkedIn export without the
+Console UI: stdout (or --out) receives only the validated `OutComb` JSON,
+logs go to stderr, and run metrics can be written to a separate file.
+
+Documents failing the pre-flight checks (`utils.docguard`) are rejected
+before any model call: the output is then `{"error": "invalid_input",
+"issues": [...]}` and the exit status 2.
+
+Usage:
+    python extract.py resume.pdf linkedin.pdf [--out profile.json] [--metrics metrics.json]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import final_test
+from prompts.out_ext import OutComb
+from utils.commonutil import load_doc, set_logger
+from utils.docguard import DocumentError
+from utils.eventsink import QuietSink
+
+logger = set_logger("Extract")
+
+
+async def extract(
+    resume: Path, linkedin: Path, pipeline: str = "default", memo: bool = True
+) -> Tuple[Optional[OutComb], Dict[str, Any]]:
+    """
+    Run the graph once, quietly.
+
+    Returns:
+        Tuple[Optional[OutComb], Dict[str, Any]]: The final profile (None on failure) and the run metrics
+
+    Raises:
+        DocumentError: If a document fails the pre-flight checks
+    """
+    md_resume, md_lkd = await asyncio.gather(
+        asyncio.to_thread(load_doc, resume), asyncio.to_thread(load_doc, linkedin)
+    )
+    pipe = final_test.build_flow(md_resume, md_lkd, pipeline=pipeline, memo=memo)
+    parents = pipe.graph.get_parents()
+
+    sink = QuietSink(list(parents))
+    try:
+        result = await sink.consume(pipe.flow.run_stream(task="Start the flow"))
+    finally:
+        pipe.board.close()
+        for llm in final_test.llms.values():
+            await llm.close()
+
+    final = sink.output(pipe.final)
+    pipe.profile.add_calls(final_test.telemetry.records)
+    metrics = {
+        "run_id": final_test.telemetry.run_id,
+        "pipeline": pipeline,
+        "ok": isinstance(final, OutComb),
+        "stop_reason": result.stop_reason if result else None,
+        "elapsed": sink.elapsed(),
+        "stages": sink.stage_latencies(parents),
+        "usage": sink.usage,
+        "stream_events": sink.events,
+        "merge": {
+            agt.name: {**vars(agt.report), "speculation": vars(agt.speculation)} for agt in pipe.merges
+        },
+        "chunked": {agt.name: vars(agt.report) for agt in pipe.chunks},
+        "context": {agt.name: vars(agt.report) for agt in pipe.filters},
+        "profile": pipe.profile.to_dict(),
+        "nodes": pipe.memo.report() if pipe.memo else pipe.checkpoint.report(),
+    }
+    return (final if isinstance(final, OutComb) else None), metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract one candidate profile as OutComb JSON.")
+    parser.add_argument("resume", type=Path, help="Resumé (PDF, DOCX or markdown)")
+    parser.add_argument("linkedin", type=Path, help="LinkedIn profile export (PDF or markdown)")
+    parser.add_argument("--out", type=Path, help="Output file (default: stdout)")
+    parser.add_argument("--metrics", type=Path, help="Write run metrics JSON here")
+    parser.add_argument("--pipeline", default="default", help="Pipeline spec path or name in pipelines/")
+    parser.add_argument("--no-memo", action="store_true", help="Execute every node, ignoring stored outputs")
+    args = parser.parse_args()
+
+    try:
+        profile, metrics = asyncio.run(
+            extract(args.resume, args.linkedin, args.pipeline, not args.no_memo)
+        )
+    except DocumentError as e:
+        # Rejected before any model call: the structured error replaces the profile
+        error = json.dumps({"error": "invalid_input", "issues": [i.model_dump() for i in e.issues]}, indent=2)
+        if args.out:
+            args.out.write_text(error)
+        else:
+            print(error)
+        sys.exit(2)
+    if args.metrics:
+        args.metrics.write_text(json.dumps(metrics, indent=2))
+    if profile is None:
+        logger.error(f"No valid profile produced (stop reason: {metrics['stop_reason']})")
+        sys.exit(1)
+
+    if args.out:
+        args.out.write_text(profile.model_dump_json(indent=2))
+    else:
+        print(profile.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,195 +1,266 @@
+import argparse
 import asyncio
+import time
+from dataclasses import dataclass
 from datetime import datetime
+from pathlib import Path
 from enum import Enum
 from typing import List, Optional
 
 # --- Autogen Imports ---
-from autogen_agentchat.agents import AssistantAgent
-from autogen_agentchat.teams import DiGraphBuilder, GraphFlow
+from autogen_agentchat.messages import StructuredMessage, TextMessage
+from autogen_agentchat.teams import DiGraph, GraphFlow
 from autogen_agentchat.ui import Console
 from autogen_core.models import UserMessage
-from autogen_ext.models.ollama import OllamaChatCompletionClient as set_model
 
 # --- Pydantic Imports ---
 from pydantic import BaseModel
 
 # Prompts Common MD
 from common.constants import (
+    AGENT_BUDGETS,
+    MODEL_CONFIGS,
+    OLLAMA_ENDPOINTS,
     deepR1_1b,
     deepR1_7b,
     deepR1_14b,
     deepR1_32b,
+    default_doc,
     gemma3_4b,
     gemma3_12b,
     gemma3qat_12b,
     llama32_1b,
     llama32fp16_3b,
+    load_model_assignment,
     qwen3_30b,
 )
-from prompts.out_ext import OutComb
-
-# Prompts specific
-from prompts.sysmsg_ext import (
-    sysmsgComb,
-    sysmsgCombEdu,
-    sysmsgCombExp,
-    sysmsgExtLkdEdu,
-    sysmsgExtLkdExp,
-    sysmsgExtResEdu,
-    sysmsgExtResExp,
-)
+from agents.AgtChunk import AgtChunk
+from agents.AgtFilter import AgtFilter, filter_inputs
+from agents.AgtMemo import memoize
+from agents.AgtMerge import AgtMerge
+from agents.AgtProfile import profile_nodes
+from agents.AgtPublish import publish_outputs
+from utils.docguard import guard_docs
+from utils.graphprof import GraphProfile
+from utils.llmclient import BudgetClient, CoalescingClient, PromptStatsClient
+from utils.llmpool import EndpointPool, PooledClient
+from utils.nodememo import NodeCheckpoint, NodeMemo
+from utils.outrepair import RepairingClient
+from utils.pipeline import OUTPUT_TYPES, compile_pipeline, load_pipeline
+from utils.speculate import SpeculationBoard
+from utils.telemetry import Telemetry, TelemetryClient
+
+# Clients setup, every model is load balanced over the configured Ollama hosts
+pool = EndpointPool(OLLAMA_ENDPOINTS)
+
+
+def set_model(**config):
+    return PooledClient(config, pool)
+
 
-# Clients setup
-llm_qwen3_30b = set_model(**qwen3_30b)
-# llm_llama32fp16_3b = set_model(**llama32fp16_3b)
-llm_llama32_1b = set_model(**llama32_1b)
-# llm_deepR1_1b = set_model(**deepR1_1b)
-# llm_deepR1_7b = set_model(**deepR1_7b)
-# llm_deepR1_14b = set_model(**deepR1_14b)
-llm_deepR1_32b = set_model(**deepR1_32b)
-# llm_gemma3_4b = set_model(**gemma3_4b)
-# llm_gemma3_12b = set_model(**gemma3_12b)
-# llm_gemma3qat_12b = set_model(**gemma3qat_12b)
-# llm_qwen3_1_7b = set_model(**qwen3_1_7b)
+# Full client stack per model: prompt stats -> output repair -> coalescing
+prompt_stats = {}
+llms = {}
+
+
+def get_llm(config):
+    name = config["model"]
+    if name not in llms:
+        prompt_stats[name] = PromptStatsClient(set_model(**config))
+        llms[name] = CoalescingClient(RepairingClient(prompt_stats[name]))
+    return llms[name]
+
+
+llm_qwen3_30b = get_llm(qwen3_30b)
+# llm_llama32fp16_3b = get_llm(llama32fp16_3b)
+llm_llama32_1b = get_llm(llama32_1b)
+# llm_deepR1_1b = get_llm(deepR1_1b)
+# llm_deepR1_7b = get_llm(deepR1_7b)
+# llm_deepR1_14b = get_llm(deepR1_14b)
+llm_deepR1_32b = get_llm(deepR1_32b)
+# llm_gemma3_4b = get_llm(gemma3_4b)
+# llm_gemma3_12b = get_llm(gemma3_12b)
+# llm_gemma3qat_12b = get_llm(gemma3qat_12b)
+# llm_qwen3_1_7b = get_llm(qwen3_1_7b)
 eval_llm = llm_qwen3_30b
 # eval_llm = llm_qwen3_1_7b
 
+# Per-agent models recommended by autotune.py override the defaults below
+MODEL_ASSIGNMENT = load_model_assignment()
 
-# Main
-async def main():
-    """
-    1. Initial Input Agents
-    """
-    agt_ext_in_edu = AssistantAgent(
-        name="ExtInEdu",
-        system_message="You have one job. No matter what the user says, you will ALWAYS respond with the following exact phrase and nothing else: 'Please extract the education details from the markdown file'",
-        model_client=llm_llama32_1b,
-        model_client_stream=True,
-    )
-    agt_ext_in_exp = AssistantAgent(
-        name="ExtInExp",
-        system_message="You have one job. No matter what the user says, you will ALWAYS respond with the following exact phrase and nothing else: 'Please extract the work experience details from the markdown file'",
-        model_client=llm_llama32_1b,
-        model_client_stream=True,
-    )
 
-    """
-    2. Resume Extraction Agents
-    """
-    agt_ext_res_edu = AssistantAgent(
-        name="ExtResEdu",
-        system_message=sysmsgExtResEdu,
-        model_client=eval_llm,
-        # model_client_stream=True,
-        output_content_type=OutComb.OutExtEdu,
-    )
-    agt_ext_res_exp = AssistantAgent(
-        name="ExtResExp",
-        system_message=sysmsgExtResExp,
-        model_client=eval_llm,
-        model_client_stream=True,
-        output_content_type=OutComb.OutExtExp,
-    )
+# Per-call token/latency records, exported as JSONL and Prometheus text
+TELEMETRY_DIR = Path(__file__).parent / "data" / "telemetry"
+telemetry = Telemetry(TELEMETRY_DIR / "calls.jsonl", run_id=datetime.now().strftime("%y%m%d_%H%M%S"))
 
-    """
-    3. Linkedin Extraction Agents
-    """
-    agt_ext_lkd_edu = AssistantAgent(
-        name="ExtLkdEdu",
-        system_message=sysmsgExtLkdEdu,
-        model_client=eval_llm,
-        # model_client_stream=True,
-        output_content_type=OutComb.OutExtEdu,
-    )
-    agt_ext_lkd_exp = AssistantAgent(
-        name="ExtLkdExp",
-        system_message=sysmsgExtLkdExp,
-        model_client=llm_deepR1_32b,
-        model_client_stream=True,
-        output_content_type=OutComb.OutExtExp,
-    )
 
-    """
-    4. Combination Agents
-    """
-    agt_comb_edu = AssistantAgent(
-        name="CombEdu",
-        system_message=sysmsgCombEdu,
-        model_client=eval_llm,
-        model_client_stream=True,
-        output_content_type=OutComb.OutExtEdu,
-    )
+# Structured outputs exchanged in the graph, registered with GraphFlow
+MESSAGE_TYPES = [StructuredMessage[t] for t in OUTPUT_TYPES.values()]
 
-    agt_comb_exp = AssistantAgent(
-        name="CombExp",
-        system_message=sysmsgCombExp,
-        model_client=llm_deepR1_32b,
-        model_client_stream=True,
-        output_content_type=OutComb.OutExtExp,
-    )
+# Stored node outputs, keyed by a hash of each node's inputs
+MEMO_DIR = Path(__file__).parent / "data" / "memo"
+# Per-run node checkpoints, one directory per run id
+RUNS_DIR = Path(__file__).parent / "data" / "runs"
+# Per-run timelines: <run id>.json and <run id>.trace.json (Chrome trace)
+PROFILES_DIR = Path(__file__).parent / "data" / "profiles"
 
-    agt_comb = AssistantAgent(
-        name="Comb",
-        system_message=sysmsgComb,
-        model_client=llm_deepR1_32b,
-        model_client_stream=True,
-        output_content_type=OutComb,
-    )
 
-    """
-    5. Graph Setup -> Nodes
-    """
-    builder = DiGraphBuilder()
+# Agent client: assigned model, latency budget (hedging to `hedge`) and telemetry
+def agent_client(agt_name, client, hedge=None):
+    model = MODEL_ASSIGNMENT.get(agt_name)
+    if model in MODEL_CONFIGS:
+        client = get_llm(MODEL_CONFIGS[model])
+    budgeted = BudgetClient(client, hedge=hedge, name=agt_name, **AGENT_BUDGETS.get(agt_name, {}))
+    return TelemetryClient(budgeted, agt_name, telemetry)
 
-    # 5a. Input Nodes
-    builder.add_node(agt_ext_in_edu).add_node(agt_ext_in_exp)
 
-    # 5bi. Extraction Resume Nodes
-    builder.add_node(agt_ext_res_edu).add_node(agt_ext_res_exp)
+# Graph for one candidate
+@dataclass
+class Pipeline:
+    flow: GraphFlow
+    graph: DiGraph
+    checkpoint: NodeCheckpoint
+    memo: Optional[NodeMemo]
+    merges: List[AgtMerge]
+    chunks: List[AgtChunk]
+    filters: List[AgtFilter]
+    profile: GraphProfile
+    board: SpeculationBoard
+    # Node that answers with the OutComb profile
+    final: str
 
-    # 5bii. Extraction Linkedin Nodes
-    builder.add_node(agt_ext_lkd_edu).add_node(agt_ext_lkd_exp)
 
-    # 5c. Combination Nodes
-    builder.add_node(agt_comb_edu)
-    builder.add_node(agt_comb_exp)
-    builder.add_node(agt_comb)
+def client_for(agt_name, model, hedge=None):
+    hedge_llm = get_llm(MODEL_CONFIGS[hedge]) if hedge else None
+    return agent_client(agt_name, get_llm(MODEL_CONFIGS[model]), hedge=hedge_llm)
 
+
+def build_flow(
+    md_resume: Optional[str] = None,
+    md_lkd: Optional[str] = None,
+    run_id: Optional[str] = None,
+    pipeline: str = "default",
+    memo: bool = True,
+) -> Pipeline:
     """
-    6. Graph Flow -> Edges
-    """
-    # 6a. Input -> Extraction
-    # i. Education
-    builder.add_edge(agt_ext_in_edu, agt_ext_res_edu)
-    builder.add_edge(agt_ext_in_edu, agt_ext_lkd_edu)
+    Build the extraction graph for one resumé / LinkedIn pair.
 
-    # ii. Experience
-    builder.add_edge(agt_ext_in_exp, agt_ext_res_exp)
-    builder.add_edge(agt_ext_in_exp, agt_ext_lkd_exp)
+    Args:
+        md_resume: Resumé markdown, the default resumé if None
+        md_lkd: LinkedIn profile markdown, the default profile if None
+        run_id: Checkpoint run id, the telemetry run id if not given
+        pipeline: Pipeline spec, a path or a name in `pipelines/`
+            ("default", "llm_merge", "llm_comb", "chunked", "speculative")
+        memo: Reuse stored outputs of nodes whose inputs are unchanged
 
-    # 6b. Extraction -> Combination
-    # i. Education
-    builder.add_edge(agt_ext_res_edu, agt_comb_edu)
-    builder.add_edge(agt_ext_lkd_edu, agt_comb_edu)
+    Returns:
+        Pipeline: The GraphFlow, and the stores, nodes and profile to report on
 
-    # ii. Experience
-    builder.add_edge(agt_ext_res_exp, agt_comb_exp)
-    builder.add_edge(agt_ext_lkd_exp, agt_comb_exp)
+    Raises:
+        DocumentError: If a document fails the pre-flight checks (no model is called)
+    """
+    docs = {
+        "resume": default_doc("resume") if md_resume is None else md_resume,
+        "linkedin": default_doc("linkedin") if md_lkd is None else md_lkd,
+    }
+    guard_docs(docs)
 
-    builder.add_edge(agt_comb_edu, agt_comb)
-    builder.add_edge(agt_comb_exp, agt_comb)
+    # Agents are created per run, the validated spec and its graph are cached
+    board = SpeculationBoard()
+    agents, graph = compile_pipeline(pipeline, docs, client_for, board)
+
+    # Reuse stored outputs of unchanged nodes; every completed node is checkpointed
+    checkpoint = NodeCheckpoint(RUNS_DIR, run_id or telemetry.run_id, [TextMessage, *MESSAGE_TYPES])
+    node_memo = NodeMemo(MEMO_DIR, [TextMessage, *MESSAGE_TYPES]) if memo else None
+    stores = [checkpoint, node_memo] if node_memo else [checkpoint]
+    participants = memoize(agents, graph, stores)
+    # Speculative merges see their sources' outputs as soon as they are produced
+    participants = publish_outputs(participants, board)
+    # Each node only sees the last structured output of its parents
+    spec, _ = load_pipeline(pipeline)
+    unfiltered = [a.name for a in spec.agents if a.context == "all"]
+    participants = filter_inputs(participants, graph, unfiltered)
+    filters = [agt for agt in participants if isinstance(agt, AgtFilter)]
+    # Start / end of every node, for the critical path
+    profile = GraphProfile(graph.get_parents())
+    participants = profile_nodes(participants, profile)
+    return Pipeline(
+        flow=GraphFlow(participants=participants, graph=graph, custom_message_types=MESSAGE_TYPES),
+        graph=graph,
+        checkpoint=checkpoint,
+        memo=node_memo,
+        merges=[agt for agt in agents if isinstance(agt, AgtMerge)],
+        chunks=[agt for agt in agents if isinstance(agt, AgtChunk)],
+        filters=filters,
+        profile=profile,
+        board=board,
+        final=spec.final,
+    )
 
-    # 6. Define the flow of the graph
-    flow = GraphFlow(participants=builder.get_participants(), graph=builder.build())
+
+# Main
+async def main(
+    pipeline: str = "default",
+    memo: bool = True,
+    resume: Optional[str] = None,
+):
+    # `resume` restores the checkpointed nodes of an earlier run
+    run_id = resume or telemetry.run_id
+    telemetry.run_id = run_id
+    pipe = build_flow(run_id=run_id, pipeline=pipeline, memo=memo)
+    if resume:
+        print(f"Resuming run {run_id}, checkpointed: {pipe.checkpoint.completed()}")
+    else:
+        print(f"Run {run_id} (resume with --resume {run_id})")
 
     # Trigger the flow with initial input
-    await Console(flow.run_stream(task=f"Start the flow"), output_stats=True)
+    started = time.perf_counter()
+    try:
+        await Console(pipe.flow.run_stream(task=f"Start the flow"), output_stats=True)
+    finally:
+        pipe.board.close()
+    elapsed = time.perf_counter() - started
+    print(f"End-to-end: {elapsed:.1f}s (pipeline {pipeline})")
+
+    # Timeline with the critical path and idle time per model
+    pipe.profile.add_calls(telemetry.records)
+    print(pipe.profile.gantt())
+    print(f"Critical path: {' -> '.join(pipe.profile.critical_path())}")
+    pipe.profile.write(PROFILES_DIR / run_id)
+
+    # Coalescing and prompt cache counters per model
+    for name, llm in llms.items():
+        print(f"{name}: coalesce={llm.report()} prompt_cache={prompt_stats[name].report()}")
+    for agt in pipe.merges:
+        print(f"{agt.name}: {agt.report} without_inference={agt.report.without_inference:.0%}")
+        if agt.speculation.hits or agt.speculation.misses:
+            print(f"{agt.name}: {agt.speculation}")
+    for agt in pipe.chunks:
+        print(f"{agt.name}: {agt.report} failure_rate={agt.report.failure_rate:.0%}")
+    for agt in pipe.filters:
+        if agt.report.tokens_in:
+            print(f"{agt.name}: {agt.report} context_saved={agt.report.saved:.0%}")
+    tokens_in = sum(agt.report.tokens_in for agt in pipe.filters)
+    tokens_out = sum(agt.report.tokens_out for agt in pipe.filters)
+    if tokens_in:
+        print(f"Context tokens: {tokens_in} received, {tokens_out} passed ({1 - tokens_out / tokens_in:.0%} saved)")
+    print(f"Endpoints: {pool.report()}")
+    print(f"Restored from checkpoint: {pipe.checkpoint.reused}")
+    if pipe.memo:
+        print(f"Nodes: {pipe.memo.report()}")
+    telemetry.write_prometheus(TELEMETRY_DIR / "job_applicator.prom")
 
     # Cleanup and close models
     # await llm_qwen3_30b.close()
     await eval_llm.close()
     await llm_llama32_1b.close()
+    return elapsed
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pipeline", default="default", help="Pipeline spec path or name in pipelines/")
+    parser.add_argument("--no-memo", action="store_true", help="Execute every node, ignoring stored outputs")
+    parser.add_argument("--resume", metavar="RUN_ID", help="Resume a run from its node checkpoints")
+    args = parser.parse_args()
+    asyncio.run(main(pipeline=args.pipeline, memo=not args.no_memo, resume=args.resume))
@@ -110,7 +110,7 @@ Output:
       "ed_lvl": "Postgraduate",
       "ed_org": "Drexel University, College of Computing and Informatics",
       "ed_degree": "Masters",
-      "ed_startdate": 09/23,
+      "ed_startdate": "09/23",
       "ed_enddate": "06/25",
       "ed_status": "Ongoing",
       "ed_majors": [
@@ -124,7 +124,7 @@ Output:
       "ed_lvl": "Undergraduate",
       "ed_org": "Virginia Tech, College of Science",
       "ed_degree": "Bachelor of Science",
-      "ed_startdate": 08/18,
+      "ed_startdate": "08/18",
       "ed_enddate": "05/22",
       "ed_status": "Complete",
       "ed_majors": [
@@ -141,7 +141,7 @@ Output:
       "ed_lvl": "Highschool",
       "ed_org": "UWC South East Asia",
       "ed_degree": "Bachelor of Science",
-      "ed_startdate": 08/15,
+      "ed_startdate": "08/15",
       "ed_enddate": "05/18",
       "ed_status": "Complete",
       "ed_majors": ["IB Diploma"],
@@ -39,7 +39,7 @@ Output:
       "ed_org": "Drexel University",
       "ed_degree": "Master of Science",
       "ed_startdate": null,
-      "ed_enddate": "06/25",
+      "ed_enddate": "June 2025 (Expected)",
       "ed_status": "Ongoing",
       "ed_majors": [
         "Artificial Intelligence and Machine Learning"
@@ -53,7 +53,7 @@ Output:
       "ed_org": "Virginia Tech",
       "ed_degree": "Bachelor of Science",
       "ed_startdate": null,
-      "ed_enddate": "05/22",
+      "ed_enddate": "May 2022",
       "ed_status": "Complete",
       "ed_majors": [
         "Computational Modelling and Data Analytics"
@@ -94,8 +94,8 @@ Output:
     {
       "exp_org": "Optium Data Solutions LLP",
       "exp_role": "Lead System Architect",
-      "exp_startdate": "06/22",
-      "exp_enddate": "08/23",
+      "exp_startdate": "June 2022",
+      "exp_enddate": "August 2023",
       "exp_location": "New Delhi, India",
       "exp_modality": "In-Person",
       "exp_type": "Full-time",
@@ -180,8 +180,8 @@ Output:
       "ed_lvl": "Postgraduate",
       "ed_org": "Drexel University, College of Computing and Informatics",
       "ed_degree": "Masters",
-      "ed_startdate": 09/23,
-      "ed_enddate": "05/25",
+      "ed_startdate": "September 2023",
+      "ed_enddate": "May 2025",
       "ed_status": "Ongoing",
       "ed_majors": [
         "Artificial Intelligence and Machine Learning"
@@ -194,8 +194,8 @@ Output:
       "ed_lvl": "Undergraduate",
       "ed_org": "Virginia Tech, College of Science",
       "ed_degree": "Bachelor of Science",
-      "ed_startdate": 08/18,
-      "ed_enddate": "05/22",
+      "ed_startdate": "August 2018",
+      "ed_enddate": "May 2022",
       "ed_status": "Complete",
       "ed_majors": [
         "Computational Modelling and Data Analytics"
@@ -211,8 +211,8 @@ Output:
       "ed_lvl": "Highschool",
       "ed_org": "UWC South East Asia",
       "ed_degree": "Bachelor of Science",
-      "ed_startdate": 08/15,
-      "ed_enddate": "05/18",
+      "ed_startdate": "August 2015",
+      "ed_enddate": "May 2018",
       "ed_status": "Complete",
       "ed_majors": ["IB Diploma"],
       "ed_minors": [],
@@ -309,8 +309,8 @@ Output:
     {
       "exp_org": "Optium Data Solutions LLP",
       "exp_role": "CEO & Founder",
-      "exp_startdate": "06/22",
-      "exp_enddate": "08/23",
+      "exp_startdate": "June 2022",
+      "exp_enddate": "August 2023",
       "exp_location": "New Delhi, Delhi, India",
       "exp_modality": "In-Person",
       "exp_type": "Full-time",
@@ -363,8 +363,8 @@ Output:
     {
       "exp_org": "Martian Subsurface Analysis Team",
       "exp_role": "Treasurer & Programming Team Member",
-      "exp_startdate": "01/19",
-      "exp_enddate": "05/21",
+      "exp_startdate": "January 2019",
+      "exp_enddate": "May 2021",
       "exp_location": "Blacksburg, Virginia, United States",
       "exp_modality": "In-Person",
       "exp_type": "Full-time",
@@ -394,8 +394,8 @@ Output:
     {
       "exp_org": "Dr. Aamir Abbasi Research",
       "exp_role": "Postdoctoral Scientist Intern",
-      "exp_startdate": "10/20",
-      "exp_enddate": "12/20",
+      "exp_startdate": "October 2020",
+      "exp_enddate": "December 2020",
       "exp_location": null,
       "exp_modality": "In-Person",
       "exp_type": "Research",
@@ -428,8 +428,8 @@ Output:
     {
       "exp_org": "Indian Institute of Technology, Roorkee",
       "exp_role": "AIML Research Intern",
-      "exp_startdate": "08/20",
-      "exp_enddate": "09/20",
+      "exp_startdate": "August 2020",
+      "exp_enddate": "September 2020",
       "exp_location": null,
       "exp_modality": "In-Person",
       "exp_type": "Intern",
@@ -460,8 +460,8 @@ Output:
     {
       "exp_org": "Ogmat",
       "exp_role": "Founder",
-      "exp_startdate": "05/17",
-      "exp_enddate": "06/18",
+      "exp_startdate": "May 2017",
+      "exp_enddate": "June 2018",
       "exp_location": "Kanpur",
       "exp_modality": "In-Person",
       "exp_type": "Full-time",
@@ -499,8 +499,8 @@ Output:
     {
       "exp_org": "Indian Institute of Technology, Kanpur",
       "exp_role": "Programmer & Summer Intern",
-      "exp_startdate": "05/17",
-      "exp_enddate": "07/17",
+      "exp_startdate": "May 2017",
+      "exp_enddate": "July 2017",
       "exp_location": "Kanpur, Uttar Pradesh, India",
       "exp_modality": "In-Person",
       "exp_type": "Intern",
@@ -4,7 +4,7 @@ Naming: Out(put)Ext(raction)Edu(cation)
 """
 
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -67,6 +67,96 @@ class OutComb(BaseModel):
             exp_action_words: Optional[List[str]] = None
 
         experience: list[OutExpInfo]
-    
+
+    # Projects
+    class OutExtProj(BaseModel):
+        class OutProjType(str, Enum):
+            research = "research"
+            coursework = "coursework"
+            personal = "personal"
+
+        class OutProjInfo(BaseModel):
+            proj_name: str
+            proj_startdate: Optional[str]
+            proj_enddate: Optional[str]
+            proj_desc: str
+            proj_skills: List[str]
+            proj_tech: Optional[List[str]] = None
+            proj_metrics: Optional[List[str]] = None
+            proj_url: Optional[str] = None
+            proj_team: Optional[List[str]] = None
+            proj_role: Optional[str] = None
+            proj_type: Optional["OutExtProj.OutProjType"] = None
+
+        projects: list[OutProjInfo]
+
+    # Skills
+    class OutExtSkill(BaseModel):
+        class OutSkillType(str, Enum):
+            Soft = "Soft"
+            Hard = "Hard"
+            Technical = "Technical"
+
+        class OutSkillInfo(BaseModel):
+            skill_category: str
+            skill_items: List[str]
+            skill_type: "OutExtSkill.OutSkillType"
+            skill_lvl: Optional[str] = None
+            skill_exp: Optional[int] = None  # Years
+            skill_spread: Optional[Dict[str, str]] = None  # Project/role name -> description
+
+        skills: list[OutSkillInfo]
+
+    # Certifications
+    class OutExtCert(BaseModel):
+        class OutCertInfo(BaseModel):
+            cert_name: str
+            cert_issuer: str
+            cert_date: Optional[str]
+            cert_id: Optional[str] = None
+            cert_expiry: Optional[str] = None
+            cert_url: Optional[str] = None
+            cert_skills: Optional[List[str]] = None
+            cert_lvl: Optional[str] = None
+
+        certificates: list[OutCertInfo]
+
+    # Courses
+    class OutExtCourse(BaseModel):
+        class OutCourseInfo(BaseModel):
+            course_name: str
+            course_org: str
+            course_category: str
+            course_code: Optional[str] = None
+            course_date: Optional[str] = None
+            course_grade: Optional[str] = None
+            course_desc: Optional[str] = None
+            course_skills: Optional[List[str]] = None
+            course_projects: Optional[List[str]] = None
+
+        courses: list[OutCourseInfo]
+
     exp: OutExtExp
     edu: OutExtEdu
+    # Optional sections, filled when the pipeline runs their extractors
+    proj: Optional[OutExtProj] = None
+    skill: Optional[OutExtSkill] = None
+    cert: Optional[OutExtCert] = None
+    course: Optional[OutExtCourse] = None
+
+
+# Resolve the string forward references so the entry models can also be used
+# on their own (e.g. validating or re-prompting a single experience entry)
+OutComb.OutExtEdu.OutExtEduResp.model_rebuild(
+    _types_namespace={"OutExtEdu": OutComb.OutExtEdu}
+)
+OutComb.OutExtExp.OutExpInfo.model_rebuild(
+    _types_namespace={"OutExtExp": OutComb.OutExtExp}
+)
+OutComb.OutExtProj.OutProjInfo.model_rebuild(
+    _types_namespace={"OutExtProj": OutComb.OutExtProj}
+)
+OutComb.OutExtSkill.OutSkillInfo.model_rebuild(
+    _types_namespace={"OutExtSkill": OutComb.OutExtSkill}
+)
+
@@ -1,19 +1,89 @@
 # Imports
-from common.constants import MD_LKD, MD_RESUME
+from functools import lru_cache
+from typing import Optional
 
-from .fewshot_ext import fsExtLkdEdu, fsExtLkdExp, fsExtResEdu, fsExtResExp
+from utils.fewshot import compile_fewshot
 
-####################### 1. Resume #######################
+from . import fewshot_ext
 
-# 1a. Edu
-sysmsgExtResEdu = f"""
-You are a specialized assistant for parsing education history from a resume. 
+# Examples as the prompts embed them: minified, schema-ordered, no banners
+fsExtResEdu = compile_fewshot(fewshot_ext.fsExtResEdu, "edu")
+fsExtResExp = compile_fewshot(fewshot_ext.fsExtResExp, "exp")
+fsExtLkdEdu = compile_fewshot(fewshot_ext.fsExtLkdEdu, "edu")
+fsExtLkdExp = compile_fewshot(fewshot_ext.fsExtLkdExp, "exp")
 
-The complete resumé markdown file the user refers to is provided between the <MD> tags below. You MUST refer to this, inside the <MD> tags. Do not use any other text.
+####################### 0. Document prefixes #######################
+
+# Every agent reading the same document starts with exactly this text and puts
+# its task-specific instructions after it, so agents sharing a model reuse the
+# already evaluated prefix (KV/prompt cache) instead of re-reading the document.
+PREFIX_HEAD = """
+The complete {label} markdown file the user refers to is provided between the <MD> tags below. You MUST refer to this, inside the <MD> tags. Do not use any other text.
 
 <MD>
-{MD_RESUME}
+"""
+PREFIX_TAIL = """
 </MD>
+"""
+
+
+def render_prefix(label: str, md: str) -> str:
+    return PREFIX_HEAD.format(label=label) + md + PREFIX_TAIL
+
+
+class PromptTemplate:
+    """
+    System message skeleton of one task for one document kind.
+
+    The task prompts (few-shots included) are built once at import; the
+    skeleton is split around the document slot and the few-shot block, so
+    rendering it for a candidate is a concatenation and no module is bound
+    to a document.
+
+    Args:
+        label: Document label, e.g. "resumé"
+        task: Task prompt placed after the document
+        fewshot: Few-shot block embedded in `task` that `render` may replace
+    """
+
+    __slots__ = ("head", "tail", "fewshot", "rest")
+
+    def __init__(self, label: str, task: str, fewshot: str = ""):
+        self.head = PREFIX_HEAD.format(label=label)
+        before, found, self.rest = task.partition(fewshot) if fewshot else (task, "", "")
+        self.tail = PREFIX_TAIL + before
+        self.fewshot = found
+
+    def render(self, md: str, fewshot: Optional[str] = None) -> str:
+        """
+        Args:
+            md: Document markdown
+            fewshot: Few-shot block replacing the task's own examples, if given
+        """
+        return self.head + md + self.tail + (self.fewshot if fewshot is None else fewshot) + self.rest
+
+
+@lru_cache(maxsize=None)
+def template(task: str, label: str) -> PromptTemplate:
+    """
+    Compiled template of a task prompt of this module, cached per document label.
+
+    Args:
+        task: Prompt name, e.g. "taskExtResEdu"
+        label: Document label, e.g. "resumé"
+
+    Returns:
+        PromptTemplate: Template to render per document
+    """
+    return PromptTemplate(label, globals()[task], FEWSHOTS.get(task, ("", ""))[1])
+
+
+####################### 1. Resume #######################
+
+# 1a. Edu
+taskExtResEdu = f"""
+### ROLE
+You are a specialized assistant for parsing education history from a resume.
 
 ### CRITICAL INSTRUCTIONS
 These are high-priority rules that you must follow before attempting any extraction.
@@ -26,8 +96,7 @@ These are the specific formatting and logic rules for processing the fields with
 
 - **Degree vs. Major**: `ed_degree` must ONLY contain the degree name (e.g., "Master of Science"). The `ed_majors` list must contain the field(s) of study and MUST NOT repeat the degree name.
 - **Organization vs. Location**: `ed_org` must ONLY contain the institution's name (e.g., "Drexel University"). `ed_location` must ONLY contain the city and state. Do not duplicate the location in the organization field.
-- **Date Formatting**: All dates MUST be converted to `MM/YY` format. For example, "June 2025 (Expected)" becomes "06/25".
-- **Single Date Logic**: If an education entry has only one date, it MUST be treated as the `ed_enddate`. The `ed_startdate` must be `null`.
+- **Dates**: Copy the dates as written (e.g., "June 2025 (Expected)"). If an entry has only one date, it is the `ed_enddate`.
 - **GPA**: If a GPA is not mentioned for an entry, `ed_gpa` MUST be `null`. Do not invent a value.
 - **Minors**: If minors are not mentioned for an entry, `ed_minors` MUST be `[]`. Expand abbreviations (e.g., "CS" -> "Computer Science").
 
@@ -39,15 +108,10 @@ Now, process the resume markdown provided in the user's prompt according to thes
 """
 
 # 2b. Exp
-sysmsgExtLkdExp = f"""
+taskExtLkdExp = f"""
+### ROLE
 You are a specialized assistant for parsing work experience from a LinkedIn profile.
 
-The complete LinkedIn profile markdown file the user refers to is provided between the <MD> tags below. You MUST refer to this, inside the <MD> tags. Do not use any other text.
-
-<MD>
-{MD_LKD}
-</MD>
-
 ### CRITICAL INSTRUCTIONS
 These are high-priority rules that you must follow before attempting any extraction.
 
@@ -59,8 +123,8 @@ This section describes the keys that should be present in your JSON output.
 
 - `exp_org`: The name of the company or organization.
 - `exp_role`: The job title.
-- `exp_startdate`: The start date of the experience in `MM/YY` format.
-- `exp_enddate`: The end date of the experience in `MM/YY` format.
+- `exp_startdate`: The start date of the experience, as written.
+- `exp_enddate`: The end date of the experience, as written (e.g., "Present"); the only date if there is one.
 - `exp_location`: The location of the experience. If not mentioned, use `null`.
 - `exp_modality`: The modality of the work (e.g., "In-Person", "Remote", "Hybrid").
 - `exp_type`: The type of work (e.g., "Full-time", "Intern", "Research").
@@ -76,7 +140,6 @@ These are the specific formatting and logic rules for processing the fields with
 - **Job Title**: `exp_role` must ONLY contain the job title (e.g., "Senior Software Engineer").
 - **Company Name**: `exp_org` must ONLY contain the company or organization name (e.g., "Microsoft").
 - **Location**: `exp_location` must ONLY contain the city and state or city and country if applicable. If not mentioned, use `null`.
-- **Start/End Dates**: Dates MUST be converted to `MM/YY` format.
 - **Description**: The description should be a list of strings.
 - **Skill Extraction**:
     - `exp_skills_soft`: Non-technical skills describing work style and interaction.
@@ -92,15 +155,10 @@ Now, process the LinkedIn markdown provided in the user's prompt according to th
 """
 
 # 1b. Exp
-sysmsgExtResExp = f"""
+taskExtResExp = f"""
+### ROLE
 You are a specialized assistant for parsing work experience from a resume.
 
-The complete resumé markdown file the user refers to is provided between the <MD> tags below. You MUST refer to this, inside the <MD> tags. Do not use any other text.
-
-<MD>
-{MD_RESUME}
-</MD>
-
 ### CRITICAL INSTRUCTIONS
 These are high-priority rules that you must follow before attempting any extraction.
 
@@ -113,9 +171,7 @@ These are the specific formatting and logic rules for processing the fields with
 - **Job Title**: `exp_title` must ONLY contain the job title (e.g., "Senior Software Engineer").
 - **Company Name**: `exp_org` must ONLY contain the company or organization name (e.g., "Microsoft").
 - **Location**: `exp_location` must ONLY contain the city and state or city and country if applicable. If not mentioned, use `null`.
-- **Start/End Dates**: 
-  - Dates MUST be converted to `MM/YY` format. For example, "March 2023 - Present" becomes `"exp_startdate": "03/23"` and `"exp_enddate": null`.
-  - If only one date is provided, treat it as `exp_enddate` and set `exp_startdate` to `null`.
+- **Dates**: Copy the dates as written (e.g., "March 2023 - Present" gives `"exp_startdate": "March 2023"` and `"exp_enddate": "Present"`). If only one date is provided, it is the `exp_enddate`.
 - **Description**:
   - If a description is provided (usually as bullet points or a summary), it must be included as a single string in `exp_desc`.
   - If no description is available, `exp_desc` must be `null`.
@@ -127,17 +183,141 @@ Provided below are complete examples of an input task and the corresponding, cor
 Now, process the resume markdown provided in the user's prompt according to these strict rules and examples.
 """
 
-####################### 2. Linkedin #######################
+# 1c. Projects
+taskExtResProj = """
+### ROLE
+You are a specialized assistant for parsing projects from a resume.
 
-# 2a. Edu
-sysmsgExtLkdEdu = f"""
-You are a specialized assistant for parsing education history from a user's linkedin profile. 
+### CRITICAL INSTRUCTIONS
+These are high-priority rules that you must follow before attempting any extraction.
 
-The complete linkedin profile markdown file the user refers to is provided between the <MD> tags below. You MUST refer to this, inside the <MD> tags. Do not use any other text.
+1. **Guardrail**: First, you must verify that a resume markdown is present in the user's prompt. If the resume is missing, empty, or seems like placeholder text, your ONLY response must be: "ERROR: Resume markdown not found." Do not proceed and do not try to output JSON.
+2. **Strictness**: You must be STRICT. Do not infer, guess, or hallucinate any information that is not explicitly present in the "Projects" section of the resume text. If a value for an optional field is not found, the field must be `null`.
+3. **Missing Section**: If the resume has no "Projects" section, output `{"projects": []}`.
 
-<MD>
-{MD_LKD}
-</MD>
+### OUTPUT DESCRIPTION
+This section describes the keys of every entry in the `projects` list of your JSON output.
+
+- `proj_name`: The project title.
+- `proj_startdate`: The start date, as written.
+- `proj_enddate`: The end date, as written (e.g., "Present"); the only date if there is one.
+- `proj_desc`: A single string describing the project.
+- `proj_skills`: A list of skills applied in the project.
+- `proj_tech`: A list of technologies, languages and tools used.
+- `proj_metrics`: A list of quantified results (e.g., "Reduced latency by 40%").
+- `proj_url`: A link to the project, if given.
+- `proj_team`: A list of collaborators, if named.
+- `proj_role`: The candidate's role in the project.
+- `proj_type`: One of "research", "coursework", "personal".
+
+### EXTRACTION RULES
+- **Dates**: Copy the dates as written (e.g., "Jan 2024 - Present" gives `"proj_startdate": "Jan 2024"` and `"proj_enddate": "Present"`). If only one date is provided, it is the `proj_enddate`.
+- **Description**: Join the bullet points of a project into one string in `proj_desc`.
+- **Skills vs. Technologies**: Put named technologies, languages and tools in `proj_tech`; put the remaining skills in `proj_skills`.
+
+Now, process the resume markdown provided in the user's prompt according to these strict rules.
+"""
+
+# 1d. Skills
+taskExtResSkill = """
+### ROLE
+You are a specialized assistant for parsing skills from a resume.
+
+### CRITICAL INSTRUCTIONS
+These are high-priority rules that you must follow before attempting any extraction.
+
+1. **Guardrail**: First, you must verify that a resume markdown is present in the user's prompt. If the resume is missing, empty, or seems like placeholder text, your ONLY response must be: "ERROR: Resume markdown not found." Do not proceed and do not try to output JSON.
+2. **Strictness**: You must be STRICT. Do not infer, guess, or hallucinate any information that is not explicitly present in the "Skills" or "Technical Skills" section of the resume text. If a value for an optional field is not found, the field must be `null`.
+3. **Missing Section**: If the resume has no "Skills" or "Technical Skills" section, output `{"skills": []}`.
+
+### OUTPUT DESCRIPTION
+This section describes the keys of every entry in the `skills` list of your JSON output.
+
+- `skill_category`: The category as written in the resume (e.g., "Languages", "Frameworks").
+- `skill_items`: A list of the skills listed under that category.
+- `skill_type`: One of "Soft", "Hard", "Technical".
+- `skill_lvl`: The proficiency level, only if stated (e.g., "Advanced").
+- `skill_exp`: Years of experience as an integer, only if stated.
+- `skill_spread`: Always `null`.
+
+### EXTRACTION RULES
+- **One Entry per Category**: Create one entry per category line of the section. Skills listed without a category go into one entry with `skill_category` "General".
+- **Items**: Split comma or bullet separated skills into separate strings in `skill_items`. Do not add skills that are not listed.
+
+Now, process the resume markdown provided in the user's prompt according to these strict rules.
+"""
+
+# 1e. Certifications
+taskExtResCert = """
+### ROLE
+You are a specialized assistant for parsing certifications from a resume.
+
+### CRITICAL INSTRUCTIONS
+These are high-priority rules that you must follow before attempting any extraction.
+
+1. **Guardrail**: First, you must verify that a resume markdown is present in the user's prompt. If the resume is missing, empty, or seems like placeholder text, your ONLY response must be: "ERROR: Resume markdown not found." Do not proceed and do not try to output JSON.
+2. **Strictness**: You must be STRICT. Do not infer, guess, or hallucinate any information that is not explicitly present in the "Certifications" section of the resume text. If a value for an optional field is not found, the field must be `null`.
+3. **Missing Section**: If the resume has no "Certifications" section, output `{"certificates": []}`.
+
+### OUTPUT DESCRIPTION
+This section describes the keys of every entry in the `certificates` list of your JSON output.
+
+- `cert_name`: The certification name.
+- `cert_issuer`: The issuing organization.
+- `cert_date`: The date obtained, as written.
+- `cert_id`: The credential ID, if given.
+- `cert_expiry`: The expiry date as written, if given.
+- `cert_url`: The verification link, if given.
+- `cert_skills`: A list of skills the certification covers, if listed.
+- `cert_lvl`: The level (e.g., "Associate", "Professional"), if stated.
+
+### EXTRACTION RULES
+- **Dates**: Copy the dates as written (e.g., "March 2024").
+- **Name vs. Issuer**: `cert_name` must NOT repeat the issuer (e.g., "Solutions Architect – Associate" issued by "Amazon Web Services").
+
+Now, process the resume markdown provided in the user's prompt according to these strict rules.
+"""
+
+# 1f. Courses
+taskExtResCourse = """
+### ROLE
+You are a specialized assistant for parsing relevant coursework from a resume.
+
+### CRITICAL INSTRUCTIONS
+These are high-priority rules that you must follow before attempting any extraction.
+
+1. **Guardrail**: First, you must verify that a resume markdown is present in the user's prompt. If the resume is missing, empty, or seems like placeholder text, your ONLY response must be: "ERROR: Resume markdown not found." Do not proceed and do not try to output JSON.
+2. **Strictness**: You must be STRICT. Do not infer, guess, or hallucinate any information that is not explicitly present in the "Relevant Courses" or "Coursework" section of the resume text. If a value for an optional field is not found, the field must be `null`.
+3. **Missing Section**: If the resume has no "Relevant Courses" or "Coursework" section, output `{"courses": []}`.
+
+### OUTPUT DESCRIPTION
+This section describes the keys of every entry in the `courses` list of your JSON output.
+
+- `course_name`: The course title.
+- `course_org`: The institution or platform offering the course.
+- `course_category`: The subject area (e.g., "Computer Science").
+- `course_code`: The course code, if given (e.g., "CS 500").
+- `course_date`: The completion date as written, if given.
+- `course_grade`: The grade, if given.
+- `course_desc`: A short description, if given.
+- `course_skills`: A list of skills the course covers, if listed.
+- `course_projects`: A list of course project titles, if listed.
+
+### EXTRACTION RULES
+- **One Entry per Course**: Split comma separated course lists into one entry per course.
+- **Organization**: If the courses are listed under an education entry, use that institution as `course_org`.
+- **Dates**: Copy the dates as written (e.g., "Fall 2023").
+
+Now, process the resume markdown provided in the user's prompt according to these strict rules.
+"""
+
+
+####################### 2. Linkedin #######################
+
+# 2a. Edu
+taskExtLkdEdu = f"""
+### ROLE
+You are a specialized assistant for parsing education history from a user's linkedin profile.
 
 ### CRITICAL INSTRUCTIONS
 These are high-priority rules that you must follow before attempting any extraction.
@@ -150,8 +330,7 @@ These are the specific formatting and logic rules for processing the fields with
 
 - **Degree vs. Major**: `ed_degree` must ONLY contain the degree name (e.g., "Master of Science"). The `ed_majors` list must contain the field(s) of study and MUST NOT repeat the degree name.
 - **Organization vs. Location**: `ed_org` must ONLY contain the institution's name (e.g., "Drexel University"). `ed_location` must ONLY contain the city and state. Do not duplicate the location in the organization field.
-- **Date Formatting**: All dates MUST be converted to `MM/YY` format. For example, "June 2025 (Expected)" becomes "06/25".
-- **Single Date Logic**: If an education entry has only one date, it MUST be treated as the `ed_enddate`. The `ed_startdate` must be `null`.
+- **Dates**: Copy the dates as written (e.g., "June 2025 (Expected)"). If an entry has only one date, it is the `ed_enddate`.
 - **GPA**: If a GPA is not mentioned for an entry, `ed_gpa` MUST be `null`. Do not invent a value.
 - **Minors**: If minors are not mentioned for an entry, `ed_minors` MUST be `[]`. Expand abbreviations (e.g., "CS" -> "Computer Science").
 
@@ -162,6 +341,50 @@ Provided below are complete examples of an input task and the corresponding, cor
 Now, process the resume markdown provided in the user's prompt according to these strict rules and examples.
 """
 
+# 2c. Exp, one position block (chunked resumé / LinkedIn extraction)
+taskExtExpPos = """
+### ROLE
+You are a specialized assistant for parsing ONE position from the work experience section of a resume or LinkedIn profile.
+
+### INPUT
+The user's prompt contains one position between <BLOCK> tags, cut out of the experience section. It may be preceded by the header of the previous position between <CONTEXT> tags.
+
+### CRITICAL INSTRUCTIONS
+1. **Strictness**: You must be STRICT. Do not infer, guess, or hallucinate any information that is not explicitly present in the block. If a value for an optional field is not found, the field must be `null`.
+2. **Context**: Use the context ONLY for `exp_org`, and only when the block names a job title but no company (several roles listed under one company). Never extract the context position itself.
+3. **Output**: Return `{"experience": [...]}` with one entry for the position in the block. If the block holds no position (e.g., only a company summary), return `{"experience": []}`.
+
+### OUTPUT DESCRIPTION
+- `exp_org`: The name of the company or organization.
+- `exp_role`: The job title.
+- `exp_startdate`: The start date of the experience, as written.
+- `exp_enddate`: The end date of the experience, as written (e.g., "Present"); the only date if there is one.
+- `exp_location`: The location of the experience. If not mentioned, use `null`.
+- `exp_modality`: The modality of the work (e.g., "In-Person", "Remote", "Hybrid").
+- `exp_type`: The type of work (e.g., "Full-time", "Intern", "Research").
+- `exp_desc`: A list of strings containing the description of the work experience.
+- `exp_skills_soft`: A list of soft skills.
+- `exp_skills_hard`: A list of hard skills.
+- `exp_skills_tech`: A list of technical skills.
+- `exp_action_words`: A list of action words.
+
+### EXTRACTION RULES
+- **Description**: One string per bullet point or sentence of the block.
+- **Skill Extraction**:
+    - `exp_skills_soft`: Non-technical skills describing work style and interaction.
+    - `exp_skills_tech`: Technology and science-related buzzwords.
+    - `exp_skills_hard`: Other hard skills not covered by the other two categories.
+    - `exp_action_words`: Action verbs that start the description points.
+"""
+
+# Task prompt -> (section kind, embedded few-shot block), for `utils.fewshot` selection
+FEWSHOTS = {
+    "taskExtResEdu": ("edu", fsExtResEdu),
+    "taskExtResExp": ("exp", fsExtResExp),
+    "taskExtLkdEdu": ("edu", fsExtLkdEdu),
+    "taskExtLkdExp": ("exp", fsExtLkdExp),
+}
+
 ####################### 2. Combine #######################
 
 # 3a. Edu
@@ -273,3 +496,26 @@ Guidelines and Expectations:
 
 Your output should be a clean, well-structured, and complete document that presents the candidate’s professional experience followed by their education history.
 """
+
+
+####################### 3. Legacy system messages #######################
+
+# Extraction system messages bound to the default documents, for the scripts
+# that import them by name (n/final_test.py). Rendered on first access, so
+# importing this module converts no document.
+LEGACY_SYSMSGS = {
+    "sysmsgExtResEdu": ("taskExtResEdu", "resume"),
+    "sysmsgExtResExp": ("taskExtResExp", "resume"),
+    "sysmsgExtLkdEdu": ("taskExtLkdEdu", "linkedin"),
+    "sysmsgExtLkdExp": ("taskExtLkdExp", "linkedin"),
+}
+
+
+def __getattr__(name: str) -> str:
+    if name in LEGACY_SYSMSGS:
+        from common.constants import default_doc
+        from utils.docguard import DOC_LABELS
+
+        task, doc = LEGACY_SYSMSGS[name]
+        return template(task, DOC_LABELS[doc]).render(default_doc(doc))
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,30 @@
+import asyncio
+
+import httpx
+import pytest
+from ollama import ResponseError
+
+from autotune import ROLES, run_sample
+from utils.llmpool import NoEndpointError
+
+
+class FailingClient:
+    def __init__(self, error: Exception):
+        self.error = error
+
+    async def create(self, messages, **kwargs):
+        raise self.error
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        NoEndpointError("no host serves the model"),
+        ResponseError("model crashed", 500),
+        httpx.ConnectError("connection refused"),
+    ],
+)
+def test_failed_call_scores_zero(error):
+    role = next(iter(ROLES))
+    run = asyncio.run(run_sample(FailingClient(error), role, "# Resume", {}))
+    assert run["accuracy"] == 0.0
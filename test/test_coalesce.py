@@ -0,0 +1,112 @@
+import asyncio
+from typing import Optional
+
+import pytest
+from autogen_core import CancellationToken
+from autogen_core.models import UserMessage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from utils.llmclient import CoalescingClient, WrappedClient
+
+MESSAGES = [UserMessage(content="Extract the education", source="user")]
+
+
+class GatedClient(WrappedClient):
+    """Answers once `release` is set, counting upstream calls; raises `error` if given."""
+
+    def __init__(self, error: Optional[Exception] = None):
+        super().__init__(ReplayChatCompletionClient(["answer"] * 10))
+        self.release = asyncio.Event()
+        self.calls = 0
+        self.error = error
+
+    async def create(self, messages, **kwargs):
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        result = await self.inner.create(messages)
+        return result.model_copy(update={"cached": False})
+
+
+async def started(*coros):
+    tasks = [asyncio.ensure_future(c) for c in coros]
+    # Let every caller reach the shared upstream call
+    await asyncio.sleep(0.01)
+    return tasks
+
+
+def test_identical_in_flight_calls_share_one_upstream_call():
+    async def run():
+        upstream = GatedClient()
+        client = CoalescingClient(upstream)
+        tasks = await started(client.create(MESSAGES), client.create(MESSAGES))
+        upstream.release.set()
+        return upstream, client, await asyncio.gather(*tasks)
+
+    upstream, client, (leader, follower) = asyncio.run(run())
+    assert upstream.calls == 1
+    assert leader.content == follower.content == "answer"
+    assert (leader.cached, follower.cached) == (False, True)
+    assert client.report() == {"requests": 2, "upstream": 1, "coalesced": 1}
+
+
+def test_cancelled_waiter_does_not_cancel_the_others():
+    async def run():
+        upstream = GatedClient()
+        client = CoalescingClient(upstream)
+        token = CancellationToken()
+        dropped, kept = await started(
+            client.create(MESSAGES, cancellation_token=token), client.create(MESSAGES)
+        )
+        token.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await dropped
+        upstream.release.set()
+        return upstream, await kept
+
+    upstream, result = asyncio.run(run())
+    assert upstream.calls == 1
+    assert result.content == "answer"
+
+
+def test_last_waiter_cancelling_cancels_the_upstream_call():
+    async def run():
+        client = CoalescingClient(GatedClient())
+        token = CancellationToken()
+        (only,) = await started(client.create(MESSAGES, cancellation_token=token))
+        token.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await only
+        await asyncio.sleep(0)
+        return client
+
+    assert asyncio.run(run())._inflight == {}
+
+
+def test_failure_reaches_every_waiter():
+    async def run():
+        upstream = GatedClient(error=RuntimeError("model crashed"))
+        client = CoalescingClient(upstream)
+        tasks = await started(*(client.create(MESSAGES) for _ in range(3)))
+        upstream.release.set()
+        return upstream, await asyncio.gather(*tasks, return_exceptions=True)
+
+    upstream, results = asyncio.run(run())
+    assert upstream.calls == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_streaming_follower_gets_the_final_result():
+    async def run():
+        client = CoalescingClient(ReplayChatCompletionClient(["streamed answer"]))
+
+        async def consume():
+            return [chunk async for chunk in client.create_stream(MESSAGES)]
+
+        return client, await asyncio.gather(consume(), consume())
+
+    client, (leader, follower) = asyncio.run(run())
+    assert client.report()["upstream"] == 1
+    assert leader[-1].content == follower[-1].content == "streamed answer"
+    assert len(follower) == 1 and follower[0].cached
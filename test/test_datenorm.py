@@ -0,0 +1,65 @@
+from datetime import date
+
+from utils.datenorm import normalize_entry
+
+TODAY = date(2026, 10, 19)
+
+
+def test_current_position_keeps_start_date():
+    entry = normalize_entry({"exp_startdate": "03/23", "exp_enddate": None}, "exp", TODAY)
+    assert entry == {"exp_startdate": "03/23", "exp_enddate": None}
+
+
+def test_current_degree_stays_ongoing():
+    entry = {"ed_startdate": "08/22", "ed_enddate": None, "ed_status": "Ongoing"}
+    normalize_entry(entry, "edu", TODAY)
+    assert entry == {"ed_startdate": "08/22", "ed_enddate": None, "ed_status": "Ongoing"}
+
+
+def test_present_end_date_is_null():
+    entry = normalize_entry({"exp_startdate": "March 2023", "exp_enddate": "Present"}, "exp", TODAY)
+    assert entry == {"exp_startdate": "03/23", "exp_enddate": None}
+
+
+def test_range_in_one_field_is_split():
+    entry = normalize_entry({"exp_startdate": "Mar 2023 - Present", "exp_enddate": None}, "exp", TODAY)
+    assert entry == {"exp_startdate": "03/23", "exp_enddate": None}
+
+
+def test_single_date_without_end_field_is_end_date():
+    entry = normalize_entry({"exp_startdate": "May 2022"}, "exp", TODAY)
+    assert entry == {"exp_startdate": None, "exp_enddate": "05/22"}
+
+
+def test_past_expected_date_is_complete():
+    entry = {"ed_startdate": None, "ed_enddate": "June 2025 (Expected)", "ed_status": "Ongoing"}
+    normalize_entry(entry, "edu", TODAY)
+    assert entry["ed_enddate"] == "06/25"
+    assert entry["ed_status"] == "Complete"
+
+
+def test_future_expected_date_is_ongoing():
+    entry = {"ed_startdate": None, "ed_enddate": "June 2027 (Expected)", "ed_status": "Complete"}
+    normalize_entry(entry, "edu", TODAY)
+    assert entry["ed_status"] == "Ongoing"
+
+
+def test_expected_within_year_only_end_date_is_ongoing():
+    entry = {"ed_startdate": None, "ed_enddate": "2026 (Expected)", "ed_status": "Complete"}
+    normalize_entry(entry, "edu", TODAY)
+    assert entry == {"ed_startdate": None, "ed_enddate": "2026", "ed_status": "Ongoing"}
+
+
+def test_project_range_as_written():
+    entry = normalize_entry({"proj_startdate": "Jan 2024", "proj_enddate": "Present"}, "proj", TODAY)
+    assert entry == {"proj_startdate": "01/24", "proj_enddate": None}
+
+
+def test_certificate_dates_are_reformatted():
+    entry = normalize_entry({"cert_date": "March 2024", "cert_expiry": "n/a"}, "cert", TODAY)
+    assert entry == {"cert_date": "03/24", "cert_expiry": "n/a"}
+
+
+def test_course_date_without_month_keeps_year():
+    entry = normalize_entry({"course_date": "Fall 2023"}, "course", TODAY)
+    assert entry == {"course_date": "2023"}
@@ -0,0 +1,34 @@
+import pytest
+
+from utils.docguard import check_doc
+
+BODY = (
+    "Built data pipelines in Python and SQL for the analytics team, "
+    "shipped dashboards used by forty analysts across three offices, "
+    "mentored two junior engineers and ran the weekly design review. "
+) * 3
+
+
+def resume(*headings: str) -> str:
+    return "\n\n".join(f"## {h}\n\n{BODY}" for h in headings)
+
+
+@pytest.mark.parametrize("heading", ["WORKEXPERIENCE", "Industry Experience", "Education & Certifications"])
+def test_section_variants_are_accepted(heading):
+    assert check_doc(resume(heading), "resume") == []
+
+
+def test_no_profile_section_is_rejected():
+    issues = check_doc(resume("Hobbies"), "resume")
+    assert [i.code for i in issues] == ["missing_sections"]
+
+
+def test_resume_with_linkedin_url_and_contact_is_accepted():
+    md = "linkedin.com/in/jane-doe\n\n" + resume("Contact", "Experience")
+    assert check_doc(md, "resume") == []
+
+
+def test_linkedin_export_as_resume_is_rejected():
+    md = "## Contact\n\n## Top Skills\n\nPython\n\n" + resume("Experience") + "\n\nPage 1 of 2\n"
+    issues = check_doc(md, "resume")
+    assert [i.code for i in issues] == ["wrong_type"]
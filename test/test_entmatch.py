@@ -0,0 +1,40 @@
+from utils.entmatch import DISTINCT, SAME, dates_compatible, decide, sort_recent_first
+
+IBM = {"exp_org": "IBM", "exp_role": "Data Science Intern", "exp_startdate": "05/19", "exp_enddate": "08/19"}
+
+
+def test_year_only_date_spans_the_year():
+    b = {"exp_startdate": None, "exp_enddate": "2019"}
+    assert dates_compatible(IBM, b, "exp_startdate", "exp_enddate") is True
+
+
+def test_year_only_date_of_another_year_is_distinct():
+    b = {"exp_startdate": None, "exp_enddate": "2021"}
+    assert dates_compatible(IBM, b, "exp_startdate", "exp_enddate") is False
+
+
+def test_year_only_linkedin_entry_matches_resume_entry():
+    b = {
+        "exp_org": "International Business Machines",
+        "exp_role": "Data Science Intern",
+        "exp_startdate": None,
+        "exp_enddate": "2019",
+    }
+    assert decide(IBM, b, "exp")[0] == SAME
+
+
+def test_year_only_range_with_different_title_is_not_distinct():
+    b = {"exp_org": "IBM", "exp_role": "Intern", "exp_startdate": "2019", "exp_enddate": "2019"}
+    assert decide(IBM, b, "exp")[0] != DISTINCT
+
+
+def test_current_role_sorts_first():
+    past = {"exp_org": "A", "exp_startdate": "01/19", "exp_enddate": "12/23"}
+    current = {"exp_org": "B", "exp_startdate": "03/21", "exp_enddate": None}
+    assert sort_recent_first([past, current], "exp") == [current, past]
+
+
+def test_current_role_overlaps_later_dates():
+    current = {"exp_startdate": "03/21", "exp_enddate": None}
+    later = {"exp_startdate": "06/24", "exp_enddate": "08/24"}
+    assert dates_compatible(current, later, "exp_startdate", "exp_enddate") is True
@@ -0,0 +1,49 @@
+from prompts.fewshot_ext import fsExtLkdExp, fsExtResExp
+from utils.expchunk import split_positions
+from utils.fewshot import parse_examples
+
+RESUME = """## WORKEXPERIENCE
+
+## Acme Corp - Data Engineer
+
+## New York, NY: Jan 2022 - Present
+
+- Built pipelines
+
+## Beta LLC - Analyst
+
+## Remote: May 2021 - August 2021
+
+- Did analysis
+
+## EDUCATION
+
+## Drexel University
+"""
+
+
+def test_linkedin_fewshot_headers_start_their_position():
+    text, _ = parse_examples(fsExtLkdExp)[0]
+    blocks = split_positions(text)
+    assert len(blocks) == 6
+    postdoc, roorkee, ogmat = (block for _, block in blocks[2:5])
+    assert "Roorkee" not in postdoc
+    assert roorkee.startswith("## Indian Institute of Technology, Roorkee\n\nAIML Research Intern")
+    assert "Ogmat" not in roorkee
+    assert ogmat.startswith("## Ogmat\n\nFounder")
+
+
+def test_resume_headers_start_their_position():
+    blocks = split_positions(RESUME)
+    assert blocks == [
+        ("", "## Acme Corp - Data Engineer\n\n## New York, NY: Jan 2022 - Present\n\n- Built pipelines"),
+        (
+            "## Acme Corp - Data Engineer\n\n## New York, NY: Jan 2022 - Present",
+            "## Beta LLC - Analyst\n\n## Remote: May 2021 - August 2021\n\n- Did analysis",
+        ),
+    ]
+
+
+def test_spaceless_section_title():
+    text, _ = parse_examples(fsExtResExp)[0]
+    assert len(split_positions(text)) == 1
@@ -0,0 +1,107 @@
+import json
+import re
+
+import pytest
+from pydantic import ValidationError
+
+from prompts.fewshot_ext import fsExtLkdEdu, fsExtLkdExp, fsExtResEdu, fsExtResExp
+from prompts.out_ext import OutComb
+from utils.fewshot import (
+    POOLS,
+    FewShotStore,
+    compile_fewshot,
+    entry_model,
+    parse_examples,
+    select_fewshots,
+    split_units,
+    store,
+)
+
+RESUME = """## EDUCATION
+
+## Virginia Tech, Blacksburg, VA
+
+Master of Science in Computer Science, May 2024
+
+## EXPERIENCE
+
+## Ogmat - Founder
+
+May 2017 - June 2018
+"""
+
+
+def test_split_units_cuts_at_each_organization():
+    text = "## Drexel University\n\nMS\n\n## Virginia Tech\n\nBS"
+    units = split_units(text, [{"ed_org": "Drexel University"}, {"ed_org": "Virginia Tech"}], "ed_org")
+    assert [u.text for u in units] == ["## Drexel University\n\nMS", "## Virginia Tech\n\nBS"]
+
+
+def test_split_units_falls_back_to_whole_example():
+    text = "## Drexel University\n\nMS"
+    units = split_units(text, [{"ed_org": "Stanford"}], "ed_org")
+    assert len(units) == 1 and units[0].text == text
+
+
+def test_store_has_one_unit_per_entry():
+    edu = FewShotStore(OutComb.OutExtEdu, "education", "ed_org", [fsExtResEdu])
+    assert [u.entries[0]["ed_org"] for u in edu.units] == ["Drexel University", "Virginia Tech"]
+
+
+def test_most_similar_unit_comes_first():
+    (unit,) = store("edu").select("Blacksburg, VA", 1)
+    assert unit.entries[0]["ed_org"] == "Virginia Tech"
+    (unit,) = store("exp").select("Roorkee research intern deep learning", 1)
+    assert "Roorkee" in unit.entries[0]["exp_org"]
+
+
+def test_select_fewshots_uses_the_matching_section():
+    edu = select_fewshots("edu", RESUME, 1)
+    exp = select_fewshots("exp", RESUME, 1)
+    assert edu.count("<example>") == 1 and "Virginia Tech" in edu
+    assert '"exp_org":"Ogmat"' in exp
+
+
+def test_k_larger_than_the_pool_keeps_every_unit():
+    rendered = select_fewshots("edu", RESUME, 100)
+    assert rendered.count('"ed_org"') == len(store("edu").units)
+
+
+
+COMPILED = re.compile(r"<example>\n<input>\n(.*?)\n</input>\n<output>\n(.*?)\n</output>\n</example>", re.S)
+
+
+def restore(entry, model):
+    """A compact entry with the fields it leaves out set to their schema default."""
+    return {name: entry.get(name, info.default) for name, info in model.model_fields.items()}
+
+
+def empty_as_default(entry, model):
+    return {
+        name: info.default if not info.is_required() and entry.get(name) in (None, [], "") else entry[name]
+        for name, info in model.model_fields.items()
+    }
+
+
+@pytest.mark.parametrize(
+    "fewshot, kind",
+    [(fsExtResEdu, "edu"), (fsExtResExp, "exp"), (fsExtLkdEdu, "edu"), (fsExtLkdExp, "exp")],
+    ids=["res-edu", "res-exp", "lkd-edu", "lkd-exp"],
+)
+def test_compiled_examples_round_trip(fewshot, kind):
+    _, model_cls, list_field = POOLS[kind][:3]
+    model = entry_model(model_cls, list_field)
+    originals = parse_examples(fewshot)
+    compiled = COMPILED.findall(compile_fewshot(fewshot, kind))
+    assert len(compiled) == len(originals)
+    for (text, output), (compiled_text, compiled_output) in zip(originals, compiled):
+        assert compiled_text == text
+        entries = json.loads(compiled_output)[list_field]
+        assert [list(e) for e in entries] == [[k for k in model.model_fields if k in e] for e in entries]
+        assert [restore(e, model) for e in entries] == [empty_as_default(e, model) for e in output[list_field]]
+        try:
+            expected = model_cls.model_validate(output)
+        except ValidationError:
+            # The example itself breaks the schema (a null `exp_location`)
+            continue
+        assert model_cls.model_validate_json(compiled_output) == expected
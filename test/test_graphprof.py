@@ -0,0 +1,80 @@
+import pytest
+
+from utils.graphprof import GraphProfile, merge_intervals
+from utils.telemetry import CallRecord
+
+# a fans out to b and c; b is the long branch
+PARENTS = {"a": [], "b": ["a"], "c": ["a"]}
+
+
+def call(agent: str, model: str, start: float, end: float) -> CallRecord:
+    return CallRecord(
+        ts=end,
+        run_id="run",
+        agent=agent,
+        model=model,
+        prompt_tokens=100,
+        completion_tokens=10,
+        prompt_cached_tokens=0,
+        ttft=None,
+        latency=end - start,
+        cached=False,
+        ok=True,
+    )
+
+
+@pytest.fixture
+def profile() -> GraphProfile:
+    profile = GraphProfile(PARENTS)
+    # Call records share the span clock
+    profile._clock = (0.0, 0.0)
+    profile.record("a", 10.0, 12.0)
+    profile.record("b", 12.0, 15.0)
+    profile.record("c", 12.0, 13.0)
+    profile.add_calls(
+        [
+            call("b", "qwen3:8b", 12.0, 14.0),
+            call("b", "qwen3:8b", 13.0, 15.0),
+            call("c", "llama3.2:1b", 12.0, 13.0),
+            # Outside the run
+            call("c", "llama3.2:1b", 20.0, 21.0),
+        ]
+    )
+    return profile
+
+
+def test_critical_path(profile):
+    assert profile.makespan == 5.0
+    assert profile.critical_path() == ["a", "b"]
+
+
+def test_slack(profile):
+    assert profile.slack() == {"a": 0.0, "b": 0.0, "c": 2.0}
+
+
+def test_model_idle(profile):
+    assert profile.model_idle() == {
+        "llama3.2:1b": {"busy": 1.0, "idle": 4.0},
+        "qwen3:8b": {"busy": 3.0, "idle": 2.0},
+    }
+
+
+def test_to_dict_is_relative_to_run_start(profile):
+    out = profile.to_dict()
+    assert list(out["nodes"]) == ["a", "b", "c"]
+    assert out["nodes"]["c"] == {"start": 2.0, "end": 3.0, "ok": True, "slack": 2.0}
+
+
+def test_merge_intervals():
+    assert merge_intervals([(3, 4), (0, 2), (1, 2.5), (4, 5)]) == [(0, 2.5), (3, 5)]
+
+
+def test_empty_profile():
+    profile = GraphProfile(PARENTS)
+    assert profile.critical_path() == [] and profile.slack() == {} and profile.gantt() == ""
+
+
+def test_write_keeps_dots_in_the_run_id(profile, tmp_path):
+    profile.write(tmp_path / "profiles" / "cand.v2_20251019")
+    written = sorted(p.name for p in (tmp_path / "profiles").iterdir())
+    assert written == ["cand.v2_20251019.json", "cand.v2_20251019.trace.json"]
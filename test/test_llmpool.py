@@ -0,0 +1,154 @@
+import asyncio
+from typing import Dict, Optional, Set
+
+import httpx
+import pytest
+from autogen_core.models import UserMessage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+from ollama import ResponseError
+
+from utils.llmpool import Endpoint, EndpointPool, NoEndpointError, PooledClient
+
+MODEL = "llama3.2:1b"
+MESSAGES = [UserMessage(content="Extract the education", source="user")]
+
+
+class FakePool(EndpointPool):
+    """Health checks read `up` and `models` instead of calling /api/tags."""
+
+    def __init__(self, hosts, models: Set[str] = {MODEL}):
+        super().__init__(hosts, health_interval=3600)
+        self.up = {h: True for h in hosts}
+        self.pulled = {h: set(models) for h in hosts}
+
+    async def _check(self, endpoint: Endpoint) -> None:
+        endpoint.healthy = self.up[endpoint.host]
+        if endpoint.healthy:
+            endpoint.models = set(self.pulled[endpoint.host])
+
+
+class FakeHost(ReplayChatCompletionClient):
+    """Answers with its host name, or raises `error` once set."""
+
+    def __init__(self, host: str):
+        super().__init__([host] * 10)
+        self.error: Optional[Exception] = None
+
+    async def create(self, messages, **kwargs):
+        if self.error is not None:
+            raise self.error
+        return await super().create(messages)
+
+
+def pooled(pool: FakePool) -> tuple[PooledClient, Dict[str, FakeHost]]:
+    client = PooledClient({"model": MODEL}, pool)
+    hosts = {h: FakeHost(h) for h in pool.up}
+    client._client = hosts.__getitem__
+    return client, hosts
+
+
+def test_least_outstanding_host_is_picked():
+    async def run():
+        pool = FakePool(["a", "b", "c"])
+        first = await pool.acquire(MODEL)
+        second = await pool.acquire(MODEL)
+        pool.release(first)
+        third = await pool.acquire(MODEL)
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert (first.host, second.host) == ("a", "b")
+    # "a" and "c" are both idle, "c" has served fewer requests
+    assert third.host == "c"
+
+
+def test_host_without_the_model_is_skipped():
+    async def run():
+        pool = FakePool(["a", "b"])
+        pool.pulled["a"] = {"qwen3:8b"}
+        return (await pool.acquire(MODEL)).host
+
+    assert asyncio.run(run()) == "b"
+
+
+def test_connection_error_fails_over_to_next_host():
+    async def run():
+        pool = FakePool(["a", "b"])
+        client, hosts = pooled(pool)
+        hosts["a"].error = httpx.ConnectError("connection refused")
+        result = await client.create(MESSAGES)
+        return pool, result
+
+    pool, result = asyncio.run(run())
+    assert result.content == "b"
+    report = {r["host"]: r for r in pool.report()}
+    assert report["a"]["healthy"] is False and report["a"]["failures"] == 1
+    assert report["b"]["served"] == 1
+    assert all(r["outstanding"] == 0 for r in report.values())
+
+
+def test_missing_model_fails_over_and_is_forgotten():
+    async def run():
+        pool = FakePool(["a", "b"])
+        await pool.refresh(force=True)
+        client, hosts = pooled(pool)
+        hosts["a"].error = ResponseError("model not found", 404)
+        result = await client.create(MESSAGES)
+        return pool, result
+
+    pool, result = asyncio.run(run())
+    assert result.content == "b"
+    assert pool.endpoints[0].healthy and MODEL not in pool.endpoints[0].models
+
+
+def test_other_errors_are_not_retried():
+    async def run():
+        pool = FakePool(["a", "b"])
+        client, hosts = pooled(pool)
+        hosts["a"].error = ValueError("bad request")
+        with pytest.raises(ValueError):
+            await client.create(MESSAGES)
+        return pool
+
+    pool = asyncio.run(run())
+    assert [ep.healthy for ep in pool.endpoints] == [True, True]
+
+
+def test_unhealthy_host_comes_back():
+    async def run():
+        pool = FakePool(["a"])
+        client, hosts = pooled(pool)
+        hosts["a"].error = httpx.ConnectError("connection refused")
+        pool.up["a"] = False
+        with pytest.raises(NoEndpointError):
+            await client.create(MESSAGES)
+        # The host restarts: no usable host forces a new health check
+        hosts["a"].error = None
+        pool.up["a"] = True
+        return pool, await client.create(MESSAGES)
+
+    pool, result = asyncio.run(run())
+    assert result.content == "a"
+    assert pool.report()[0]["healthy"] is True
+
+
+def test_max_inflight_holds_requests_until_a_slot_frees():
+    async def run():
+        pool = FakePool(["a", "b"])
+        pool.max_inflight = 1
+        a, b = await pool.acquire(MODEL), await pool.acquire(MODEL)
+        waiting = [asyncio.ensure_future(pool.acquire(MODEL)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        assert not any(w.done() for w in waiting)
+        pool.release(b)
+        await asyncio.sleep(0.01)
+        # One slot freed, one waiter admitted
+        done = [w for w in waiting if w.done()]
+        assert [w.result().host for w in done] == ["b"]
+        pool.release(a)
+        hosts = sorted(ep.host for ep in await asyncio.gather(*waiting))
+        return pool, hosts
+
+    pool, hosts = asyncio.run(run())
+    assert hosts == ["a", "b"]
+    assert [ep.outstanding for ep in pool.endpoints] == [1, 1]
@@ -0,0 +1,25 @@
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from agents.AgtComb import AgtComb
+from agents.AgtMerge import AgtMerge
+from utils.nodememo import node_key
+
+SOURCES = ["ExtResExp", "ExtLkdExp"]
+INPUTS = {"ExtResExp": {"experience": []}, "ExtLkdExp": {"experience": []}}
+
+
+def test_rule_and_llm_merges_have_different_keys():
+    rules = AgtMerge("CombExp", "exp", SOURCES)
+    llm = AgtMerge("CombExp", "exp", SOURCES, model_client=ReplayChatCompletionClient(["yes"]))
+    assert node_key(rules, INPUTS) != node_key(llm, INPUTS)
+
+
+def test_merge_key_covers_kind_and_sources():
+    key = node_key(AgtMerge("Comb", "exp", SOURCES), INPUTS)
+    assert key != node_key(AgtMerge("Comb", "edu", SOURCES), INPUTS)
+    assert key != node_key(AgtMerge("Comb", "exp", SOURCES[::-1]), INPUTS)
+    assert key == node_key(AgtMerge("Comb", "exp", SOURCES), INPUTS)
+
+
+def test_comb_key_covers_sections():
+    assert node_key(AgtComb(), {}) != node_key(AgtComb(sections={"proj": "ExtResProj"}), {})
@@ -0,0 +1,122 @@
+import asyncio
+import json
+
+import pytest
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from prompts.out_ext import OutComb
+from utils.outrepair import RepairReport, fix_deterministic, match_enum, repair_output, strip_json
+
+Exp = OutComb.OutExtExp
+Edu = OutComb.OutExtEdu
+
+ENTRY = {
+    "exp_org": "Acme Corp",
+    "exp_role": "Data Engineer",
+    "exp_startdate": "01/22",
+    "exp_enddate": None,
+    "exp_location": "New York, NY",
+    "exp_type": "Full-time",
+}
+PAYLOAD = json.dumps({"experience": [ENTRY]})
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        PAYLOAD,
+        f"  {PAYLOAD}\n",
+        f"```json\n{PAYLOAD}\n```",
+        f"```\n{PAYLOAD}\n```",
+        f"<think>The answer is {{}}</think>\n{PAYLOAD}",
+        f"<think>Let me see</think>\nHere it is:\n```json\n{PAYLOAD}\n```\nDone.",
+    ],
+)
+def test_strip_json(text):
+    assert strip_json(text) == PAYLOAD
+
+
+@pytest.mark.parametrize(
+    "value, enum_cls, expected",
+    [
+        ("Internship", Exp.OutExpType, "Intern"),
+        ("full time", Exp.OutExpType, "Full-time"),
+        ("FULL-TIME", Exp.OutExpType, "Full-time"),
+        ("Contract", Exp.OutExpType, "Freelance"),
+        ("Self-employed", Exp.OutExpType, "Freelance"),
+        ("on-site", Exp.OutExpModality, "In-Person"),
+        ("WFH", Exp.OutExpModality, "Remote"),
+        ("IRL", Exp.OutExpModality, "In-Person"),
+        ("Master's", Edu.OutExtEduLvl, "Postgraduate"),
+        ("PhD", Edu.OutExtEduLvl, "Doctoral"),
+        ("Undergrad", Edu.OutExtEduLvl, "Undergraduate"),
+        ("In progress", Edu.OutExtEduStat, "Ongoing"),
+        ("Volunteer", Exp.OutExpType, None),
+        (None, Exp.OutExpType, None),
+    ],
+)
+def test_match_enum(value, enum_cls, expected):
+    assert match_enum(value, enum_cls) == expected
+
+
+@pytest.mark.parametrize(
+    "field, value, fixed",
+    [
+        ("exp_type", "Internship", "Intern"),
+        ("exp_modality", "somewhere", None),
+        ("exp_location", None, ""),
+        ("exp_desc", "Built pipelines", ["Built pipelines"]),
+    ],
+)
+def test_fix_deterministic(field, value, fixed):
+    data = {"experience": [{**ENTRY, field: value}]}
+    report = RepairReport()
+    out = fix_deterministic(Exp, data, report)
+    assert out is not None
+    assert out.experience[0].model_dump(mode="json")[field] == fixed
+    assert report.fixed == [f"experience.0.{field}"]
+
+
+class RecordingClient(ReplayChatCompletionClient):
+    """Replays `answers` and keeps the messages of every call."""
+
+    def __init__(self, answers):
+        super().__init__(answers)
+        self.calls = []
+
+    async def create(self, messages, **kwargs):
+        self.calls.append(messages)
+        return await super().create(messages)
+
+
+def test_only_the_broken_entry_is_reprompted():
+    broken = {**ENTRY, "exp_org": "Beta LLC", "exp_type": "Volunteer"}
+    client = RecordingClient([json.dumps({**broken, "exp_type": "Freelance"})])
+    content = json.dumps({"experience": [ENTRY, broken]})
+
+    out, report = asyncio.run(repair_output(Exp, content, client))
+
+    assert report.valid and report.reprompted == [1]
+    assert [e.exp_type.value for e in out.experience] == ["Full-time", "Freelance"]
+    (messages,) = client.calls
+    prompt = messages[-1].content
+    assert "Beta LLC" in prompt and "exp_type" in prompt
+    assert "Acme Corp" not in prompt
+
+
+def test_invalid_reprompt_answer_leaves_output_invalid():
+    broken = {**ENTRY, "exp_type": "Volunteer"}
+    client = RecordingClient([json.dumps(broken)])
+    out, report = asyncio.run(repair_output(Exp, json.dumps({"experience": [broken]}), client))
+    assert out is None and not report.valid and report.reprompted == []
+
+
+def test_without_client_nothing_is_reprompted():
+    broken = {**ENTRY, "exp_type": "Volunteer"}
+    out, report = asyncio.run(repair_output(Exp, json.dumps({"experience": [broken]})))
+    assert out is None and report.errors
+
+
+def test_unparseable_answer():
+    out, report = asyncio.run(repair_output(Exp, "I could not find any experience."))
+    assert out is None and report.errors[0].startswith("json:")
@@ -0,0 +1,39 @@
+import pytest
+from pydantic import ValidationError
+
+from utils.pipeline import PipelineSpec, load_pipeline
+
+
+def spec(agents, edges):
+    return PipelineSpec.model_validate({"name": "t", "agents": agents, "edges": edges})
+
+
+def test_default_pipeline_final_is_comb():
+    assert load_pipeline("default")[0].final == "Comb"
+
+
+def test_renamed_comb_agent_is_final():
+    s, _ = load_pipeline("default")
+    data = s.model_dump()
+    for agent in data["agents"]:
+        if agent["kind"] == "comb":
+            agent["name"] = "Profile"
+    data["edges"] = [[src, "Profile" if dst == "Comb" else dst] for src, dst in data["edges"]]
+    assert PipelineSpec.model_validate(data).final == "Profile"
+
+
+def test_single_leaf_is_final():
+    agents = [
+        {"name": "A", "model": "llama3.2:1b", "system": "a"},
+        {"name": "Out", "model": "llama3.2:1b", "system": "b"},
+    ]
+    assert spec(agents, [["A", "Out"]]).final == "Out"
+
+
+def test_no_single_final_agent_is_rejected():
+    agents = [
+        {"name": "A", "model": "llama3.2:1b", "system": "a"},
+        {"name": "B", "model": "llama3.2:1b", "system": "b"},
+    ]
+    with pytest.raises(ValidationError):
+        spec(agents, [])
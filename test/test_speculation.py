@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+from autogen_agentchat.messages import StructuredMessage
+from autogen_core import CancellationToken
+
+import agents.AgtMerge as merge_module
+from agents.AgtMerge import AgtMerge
+from prompts.out_ext import OutComb
+from utils.entmatch import match_entries
+from utils.speculate import SpeculationBoard
+
+SOURCES = ["ExtResEdu", "ExtLkdEdu"]
+
+
+def edu_message(source: str) -> StructuredMessage:
+    edu = OutComb.OutExtEdu(
+        education=[
+            {
+                "ed_lvl": "Undergraduate",
+                "ed_org": "Virginia Tech",
+                "ed_degree": "Bachelor of Science",
+                "ed_startdate": None,
+                "ed_enddate": "05/22",
+                "ed_status": "Complete",
+                "ed_majors": ["Computer Science"],
+                "ed_minors": [],
+                "ed_location": "Blacksburg, VA",
+                "ed_gpa": None,
+            }
+        ]
+    )
+    return StructuredMessage[OutComb.OutExtEdu](content=edu, source=source)
+
+
+async def slow_match(*args, **kwargs):
+    await asyncio.sleep(60)
+
+
+def speculate(board: SpeculationBoard) -> AgtMerge:
+    merge = AgtMerge("CombEdu", "edu", SOURCES, board=board)
+    for src in SOURCES:
+        board.publish(edu_message(src))
+    return merge
+
+
+def test_closing_the_board_cancels_an_unused_merge(monkeypatch):
+    monkeypatch.setattr(merge_module, "match_entries", slow_match)
+
+    async def run():
+        board = SpeculationBoard()
+        merge = speculate(board)
+        task = merge._task
+        assert task is not None
+        # The node was served from memo: no activation, the run ends
+        board.close()
+        await asyncio.sleep(0)
+        return task
+
+    assert asyncio.run(run()).cancelled()
+
+
+def test_failed_speculation_merges_again(monkeypatch):
+    calls = []
+
+    async def failing_once(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == 1:
+            raise RuntimeError("endpoint down")
+        return await match_entries(*args, **kwargs)
+
+    monkeypatch.setattr(merge_module, "match_entries", failing_once)
+
+    async def run():
+        merge = speculate(SpeculationBoard())
+        messages = [edu_message(src) for src in SOURCES]
+        return merge, await merge.on_messages(messages, CancellationToken())
+
+    merge, response = asyncio.run(run())
+    assert isinstance(response.chat_message.content, OutComb.OutExtEdu)
+    assert len(calls) == 2
+    assert (merge.speculation.hits, merge.speculation.misses) == (0, 1)
+
+
+def test_cancelling_the_activation_cancels_the_merge(monkeypatch):
+    monkeypatch.setattr(merge_module, "match_entries", slow_match)
+
+    async def run():
+        merge = speculate(SpeculationBoard())
+        task = merge._task
+        token = CancellationToken()
+        activation = asyncio.ensure_future(
+            merge.on_messages([edu_message(src) for src in SOURCES], token)
+        )
+        await asyncio.sleep(0)
+        token.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await activation
+        return task
+
+    assert asyncio.run(run()).cancelled()
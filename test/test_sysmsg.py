@@ -0,0 +1,10 @@
+import common.constants
+
+
+def test_legacy_system_messages_render_the_default_documents(monkeypatch):
+    monkeypatch.setattr(common.constants, "default_doc", lambda kind: f"<{kind} markdown>")
+    from prompts.sysmsg_ext import sysmsgExtLkdExp, sysmsgExtResEdu, taskExtResEdu
+
+    assert "<resume markdown>" in sysmsgExtResEdu
+    assert sysmsgExtResEdu.endswith(taskExtResEdu)
+    assert "<linkedin markdown>" in sysmsgExtLkdExp
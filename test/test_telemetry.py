@@ -0,0 +1,43 @@
+import asyncio
+
+from autogen_core.models import UserMessage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from utils.llmclient import CoalescingClient, WrappedClient
+from utils.telemetry import Telemetry, TelemetryClient
+
+
+class FreshClient(WrappedClient):
+    """Replayed answers as if a model produced them (the replay client marks them cached)."""
+
+    async def create(self, messages, **kwargs):
+        result = await self.inner.create(messages, **kwargs)
+        return result.model_copy(update={"cached": False})
+
+
+async def coalesced_calls(telemetry: Telemetry) -> None:
+    model = CoalescingClient(FreshClient(ReplayChatCompletionClient(["answer"])))
+    clients = [TelemetryClient(model, agent, telemetry) for agent in ("ExtA", "ExtB")]
+    messages = [UserMessage(content="same prompt", source="user")]
+    await asyncio.gather(*(client.create(messages) for client in clients))
+
+
+def test_coalesced_follower_records_no_tokens():
+    telemetry = Telemetry()
+    asyncio.run(coalesced_calls(telemetry))
+    leader, follower = sorted(telemetry.records, key=lambda r: r.cached)
+    assert not leader.cached and leader.prompt_tokens > 0
+    assert follower.cached
+    assert follower.prompt_tokens == follower.completion_tokens == follower.prompt_cached_tokens == 0
+
+
+def test_latency_is_a_summary(tmp_path):
+    telemetry = Telemetry(run_id="r1")
+    asyncio.run(coalesced_calls(telemetry))
+    path = tmp_path / "job_applicator.prom"
+    telemetry.write_prometheus(path)
+    text = path.read_text()
+    assert "# TYPE agent_latency_seconds summary" in text
+    assert 'agent_latency_seconds_count{agent="ExtA",model="ReplayChatCompletionClient",run_id="r1"} 1' in text
+    assert "# TYPE agent_ttft_seconds summary" in text
+    assert "agent_latency_seconds_sum counter" not in text
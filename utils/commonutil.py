@@ -4,6 +4,7 @@ Common utilities shared across the application.
 """
 
 import logging
+from pathlib import Path
 from typing import Dict, List, Tuple
 
 
@@ -32,3 +33,21 @@ def set_logger(name: str, level: int = logging.INFO) -> logging.Logger:
 def setup_browser() -> Dict[str, int]:
     """Returns viewport settings."""
     return {"width": 1000, "height": 800}
+
+
+def load_doc(path: Path) -> str:
+    """
+    Markdown of a candidate document.
+
+    Args:
+        path: Markdown files are read as is, anything else goes through docling
+
+    Returns:
+        str: Document markdown
+    """
+    path = Path(path)
+    if path.suffix == ".md":
+        return path.read_text()
+    from docling.document_converter import DocumentConverter
+
+    return DocumentConverter().convert(path).document.export_to_markdown()
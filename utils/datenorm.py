@@ -0,0 +1,280 @@
+"""
+Deterministic normalization of extracted dates.
+
+The extraction prompts used to teach the model to convert "June 2025
+(Expected)" to `06/25`, to read a lone date as the end date and, through
+the examples, to derive `ed_status`. These rules now run in Python on the
+extractor outputs, and the prompts only ask for the dates as written:
+
+- Dates become `MM/YY`; a year without a month stays `YYYY` (no month is
+  invented). "Present" / "Current" as end date becomes null.
+- A whole range in one field ("Mar 2023 - Present") is split into start and end.
+- The prompts put a single date in the end date; when an answer leaves the
+  end date field out, its start date is moved there. A null end date is
+  "Present" and is kept.
+- `ed_status` is "Ongoing" when the end date is "Present" or lies in the
+  future, "Complete" when it lies in the past, whether or not it was marked
+  as expected. Within the year of a year-only end date, "(Expected)" decides.
+
+Projects follow the same range rules; the single dates of certificates and
+courses are only reformatted. `DateNormClient` applies this to the answers
+of an extractor's model client. Unparseable dates are left as they are.
+"""
+
+import json
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import (
+    Any,
+    AsyncGenerator,
+    Dict,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from autogen_core import CancellationToken
+from autogen_core.models import CreateResult, LLMMessage
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel
+
+from prompts.out_ext import OutComb
+from utils.commonutil import set_logger
+from utils.entmatch import KINDS, MONTHS, PRESENT
+from utils.llmclient import WrappedClient
+from utils.outrepair import strip_json
+
+logger = set_logger("DateNorm")
+
+# Output model -> (entry kind, list field)
+DATED_OUTPUTS = {
+    OutComb.OutExtEdu: ("edu", "education"),
+    OutComb.OutExtExp: ("exp", "experience"),
+    OutComb.OutExtProj: ("proj", "projects"),
+    OutComb.OutExtCert: ("cert", "certificates"),
+    OutComb.OutExtCourse: ("course", "courses"),
+}
+# Entry kind -> (start field, end field) of its date range
+RANGE_FIELDS = {
+    "edu": KINDS["edu"][2:4],
+    "exp": KINDS["exp"][2:4],
+    "proj": ("proj_startdate", "proj_enddate"),
+}
+# Entry kind -> fields holding one date each
+DATE_FIELDS = {
+    "cert": ("cert_date", "cert_expiry"),
+    "course": ("course_date",),
+}
+
+EXPECTED = re.compile(r"\b(expected|anticipated|exp\.|est\.|projected|in progress|pursuing)", re.I)
+# Separators of a range written in one field ("Jan 2020 - Present", "2019–2021", "May 2020 to Jun 2021")
+RANGE_SEP = re.compile(r"\s*(?:–|—|-|\bto\b|\buntil\b|\bthrough\b)\s*", re.I)
+MONTH_YEAR = re.compile(r"\b(\d{1,2})\s*[/.\-]\s*(\d{4}|\d{2})\b")
+YEAR_MONTH = re.compile(r"\b(\d{4})[/.\-](\d{1,2})\b")
+NAMED_MONTH = re.compile(r"\b([a-z]{3})[a-z]*\.?,?\s*'?(\d{4}|\d{2})\b", re.I)
+YEAR = re.compile(r"\b(\d{4})\b")
+PRESENT_WORD = re.compile(rf"\b({'|'.join(PRESENT)})\b", re.I)
+
+
+@dataclass(frozen=True)
+class ParsedDate:
+    year: Optional[int] = None
+    month: Optional[int] = None
+    present: bool = False
+    expected: bool = False
+
+    def format(self) -> Optional[str]:
+        """`MM/YY`, `YYYY` without a month, None for "Present"."""
+        if self.present or self.year is None:
+            return None
+        if self.month is None:
+            return f"{self.year:04d}"
+        return f"{self.month:02d}/{self.year % 100:02d}"
+
+    def after(self, today: date) -> Optional[bool]:
+        """Whether the date lies after `today`; None when the year alone cannot tell."""
+        if self.present:
+            return True
+        if self.month is None:
+            return None if self.year == today.year else self.year > today.year
+        return (self.year, self.month) > (today.year, today.month)
+
+
+def _year(y: str) -> int:
+    return int(y) + (2000 if int(y) < 70 else 1900) if len(y) == 2 else int(y)
+
+
+def parse_date(value: Optional[str]) -> Optional[ParsedDate]:
+    """
+    Parse one date as written in a document or by the model.
+
+    Understands MM/YY, MM/YYYY, YYYY-MM, "June 2025", "Jun '25", YYYY and
+    "Present", with markers such as "(Expected)".
+
+    Returns:
+        Optional[ParsedDate]: None if `value` holds no date
+    """
+    if not value or not value.strip():
+        return None
+    text = value.strip()
+    expected = bool(EXPECTED.search(text))
+    m = MONTH_YEAR.search(text)
+    if m and 1 <= int(m.group(1)) <= 12:
+        return ParsedDate(_year(m.group(2)), int(m.group(1)), expected=expected)
+    m = YEAR_MONTH.search(text)
+    if m and 1 <= int(m.group(2)) <= 12:
+        return ParsedDate(int(m.group(1)), int(m.group(2)), expected=expected)
+    for m in NAMED_MONTH.finditer(text):
+        month = MONTHS.get(m.group(1).lower())
+        if month is not None:
+            return ParsedDate(_year(m.group(2)), month, expected=expected)
+    m = YEAR.search(text)
+    if m:
+        return ParsedDate(int(m.group(1)), expected=expected)
+    if PRESENT_WORD.search(text):
+        return ParsedDate(present=True)
+    return None
+
+
+def split_range(value: Optional[str]) -> Optional[Tuple[str, str]]:
+    """(start, end) texts of a range written in one field, None if `value` is one date."""
+    if not value:
+        return None
+    for sep in RANGE_SEP.finditer(value):
+        start, end = value[: sep.start()], value[sep.end() :]
+        if parse_date(start) is not None and parse_date(end) is not None:
+            return start, end
+    return None
+
+
+def normalize_entry(entry: Dict[str, Any], kind: str, today: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Normalize the dates of one entry in place (and `ed_status` for education).
+
+    Args:
+        entry: Entry as a dict, e.g. one item of `OutExtEdu.education`
+        kind: "edu", "exp", "proj", "cert" or "course"
+        today: Reference date for `ed_status`, today if None
+
+    Returns:
+        Dict[str, Any]: `entry`
+    """
+    if kind in DATE_FIELDS:
+        for field in DATE_FIELDS[kind]:
+            parsed = parse_date(entry.get(field))
+            if parsed is not None and not parsed.present:
+                entry[field] = parsed.format()
+        return entry
+
+    start_field, end_field = RANGE_FIELDS[kind]
+    raw_start, raw_end = entry.get(start_field), entry.get(end_field)
+    if not (raw_start or "").strip() or not (raw_end or "").strip():
+        both = split_range(raw_start or raw_end)
+        if both is not None:
+            raw_start, raw_end = both
+    start, end = parse_date(raw_start), parse_date(raw_end)
+    # A single date is the end date, but only if the answer has no end date
+    # field at all: a null end date is "Present", i.e. a current position
+    if end is None and start is not None and end_field not in entry:
+        start, end = None, start
+        raw_start, raw_end = None, raw_start
+
+    for field, raw, parsed in ((start_field, raw_start, start), (end_field, raw_end, end)):
+        if parsed is not None:
+            entry[field] = parsed.format()
+        elif raw is not None and not raw.strip():
+            entry[field] = None
+        else:
+            entry[field] = raw
+
+    if kind == "edu":
+        if end is not None:
+            later = end.after(today or date.today())
+        else:
+            # A start date without an end date is a current degree
+            later = True if start is not None else None
+        # A past date is complete even if the document still says "(Expected)"
+        if later or (later is None and end is not None and end.expected):
+            entry["ed_status"] = "Ongoing"
+        elif later is False:
+            entry["ed_status"] = "Complete"
+    return entry
+
+
+def normalize_output(
+    model_cls: type[BaseModel], data: Dict[str, Any], today: Optional[date] = None
+) -> Dict[str, Any]:
+    """Normalize every entry of an answer of one of the `DATED_OUTPUTS` models in place."""
+    kind, list_field = DATED_OUTPUTS[model_cls]
+    for entry in data.get(list_field) or []:
+        if isinstance(entry, dict):
+            normalize_entry(entry, kind, today)
+    return data
+
+
+class DateNormClient(WrappedClient):
+    """
+    Normalizes the dates of answers of the `DATED_OUTPUTS` models.
+
+    Meant for extractor agents only: the merge and combination agents work
+    on answers that are already normalized.
+    """
+
+    def _normalize(self, result: CreateResult, json_output: Optional[bool | type[BaseModel]]) -> CreateResult:
+        if json_output not in DATED_OUTPUTS or not isinstance(result.content, str):
+            return result
+        try:
+            data = json.loads(strip_json(result.content))
+        except ValueError:
+            # Invalid JSON is for the agent to report
+            return result
+        if not isinstance(data, dict):
+            return result
+        normalize_output(json_output, data)
+        return result.model_copy(update={"content": json.dumps(data, ensure_ascii=False)})
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        result = await self.inner.create(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+        return self._normalize(result, json_output)
+
+    async def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        async for chunk in self.inner.create_stream(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        ):
+            if isinstance(chunk, CreateResult):
+                chunk = self._normalize(chunk, json_output)
+            yield chunk
@@ -0,0 +1,136 @@
+"""
+Pre-flight checks of the candidate documents.
+
+The extraction prompts open with a guardrail asking the model to answer
+"ERROR: Resume markdown not found" on missing or placeholder input, which
+costs a full inference per agent to detect an empty file. These checks run
+in Python before the graph is built: empty or too short text, placeholder
+text, no education / experience section, a LinkedIn export passed as the
+resumé, or the same file passed twice. Any issue stops the run with a `DocumentError`
+listing structured `DocIssue`s, so the checks only flag what is certain:
+section titles are matched by keyword, and an export is recognized by the
+traits resumés do not have.
+"""
+
+import re
+from typing import Dict, List, Literal
+
+from pydantic import BaseModel
+
+from utils.commonutil import set_logger
+from utils.mdsections import has_profile_section
+
+logger = set_logger("DocGuard")
+
+# Below this many characters / words of text a document cannot hold a profile
+MIN_DOC_CHARS = 200
+MIN_DOC_WORDS = 40
+
+PLACEHOLDER = re.compile(r"lorem ipsum|\[(your|full) name\]|\byour name here\b|<insert\b", re.I)
+# docling comments (images) and markdown markup carry no text
+MARKUP = re.compile(r"<!--.*?-->|[#*_|`>\-]+", re.S)
+# Traits of the LinkedIn "Save to PDF" export
+LINKEDIN_MARKERS = [
+    re.compile(r"linkedin\.com/in/", re.I),
+    re.compile(r"^\s*page \d+ of \d+\s*$", re.I | re.M),
+    re.compile(r"^[#\s]*top skills\s*$", re.I | re.M),
+    re.compile(r"^[#\s]*contact\s*$", re.I | re.M),
+]
+# A resumé may link its LinkedIn profile and have a "Contact" heading; only
+# the page footer and the "Top Skills" sidebar, together, make an export
+LINKEDIN_EXPORT_MARKERS = LINKEDIN_MARKERS[1:3]
+
+DOC_LABELS = {"resume": "resumé", "linkedin": "LinkedIn profile"}
+
+
+class DocIssue(BaseModel):
+    doc: Literal["resume", "linkedin"]
+    code: Literal["empty", "too_short", "placeholder", "missing_sections", "wrong_type"]
+    detail: str
+
+
+class DocumentError(ValueError):
+    """Raised when the documents fail the pre-flight checks; `issues` lists why."""
+
+    def __init__(self, issues: List[DocIssue]):
+        super().__init__("; ".join(f"{i.doc}: {i.detail}" for i in issues))
+        self.issues = issues
+
+
+def linkedin_markers(md: str) -> int:
+    """Number of LinkedIn export traits found in `md`."""
+    return sum(bool(marker.search(md)) for marker in LINKEDIN_MARKERS)
+
+
+def is_linkedin_export(md: str) -> bool:
+    """Whether `md` has all the traits of a LinkedIn export that resumés lack."""
+    return all(marker.search(md) for marker in LINKEDIN_EXPORT_MARKERS)
+
+
+def check_doc(md: str, doc: Literal["resume", "linkedin"]) -> List[DocIssue]:
+    """
+    Checks of one document.
+
+    Args:
+        md: Document markdown
+        doc: "resume" or "linkedin"
+
+    Returns:
+        List[DocIssue]: Empty if the document can be extracted
+    """
+    label = DOC_LABELS[doc]
+    text = MARKUP.sub(" ", md or "").strip()
+    if not text:
+        return [DocIssue(doc=doc, code="empty", detail=f"{label} markdown is empty")]
+    words = len(text.split())
+    if len(text) < MIN_DOC_CHARS or words < MIN_DOC_WORDS:
+        return [
+            DocIssue(
+                doc=doc,
+                code="too_short",
+                detail=f"{label} has only {len(text)} characters / {words} words of text",
+            )
+        ]
+
+    issues = []
+    if PLACEHOLDER.search(text):
+        issues.append(DocIssue(doc=doc, code="placeholder", detail=f"{label} contains placeholder text"))
+
+    if not has_profile_section(md):
+        issues.append(
+            DocIssue(
+                doc=doc,
+                code="missing_sections",
+                detail=f"{label} has neither an education nor an experience section",
+            )
+        )
+
+    if doc == "resume" and is_linkedin_export(md):
+        issues.append(
+            DocIssue(doc=doc, code="wrong_type", detail="resumé looks like a LinkedIn profile export")
+        )
+    if doc == "linkedin" and linkedin_markers(md) == 0:
+        # LinkedIn also generates resumé-style PDFs (Easy Apply) without these traits
+        logger.info("LinkedIn profile has none of the export traits")
+    return issues
+
+
+def guard_docs(docs: Dict[str, str]) -> None:
+    """
+    Check all documents of a run before any model is called.
+
+    Args:
+        docs: Markdown per document kind ("resume", "linkedin")
+
+    Raises:
+        DocumentError: If any document fails a check
+    """
+    issues = [issue for doc, md in docs.items() for issue in check_doc(md, doc)]
+    if "resume" in docs and docs.get("linkedin") and docs["resume"].strip() == docs["linkedin"].strip():
+        issues.append(
+            DocIssue(doc="linkedin", code="wrong_type", detail="LinkedIn profile is the same document as the resumé")
+        )
+    if issues:
+        for issue in issues:
+            logger.warning(f"{issue.doc}: {issue.code}: {issue.detail}")
+        raise DocumentError(issues)
@@ -0,0 +1,380 @@
+"""
+Rule-based matching and merging of education / experience entries.
+
+Pairs the entries of two sources (resumé first, LinkedIn second) using
+normalized organization names, fuzzy similarity and date ranges, and merges
+matched pairs field by field in Python. Only pairs the rules cannot decide
+are sent to a model, with a yes/no question about that single pair.
+"""
+
+import difflib
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient, LLMMessage, SystemMessage, UserMessage
+from pydantic import BaseModel, ValidationError
+
+from utils.commonutil import set_logger
+from utils.outrepair import strip_json
+
+logger = set_logger("EntMatch")
+
+# Pair decisions
+SAME = "same"
+DISTINCT = "distinct"
+AMBIGUOUS = "ambiguous"
+
+# Name similarity at or above which two organizations are the same, and
+# below which they are different
+NAME_SAME = 0.85
+NAME_DIFF = 0.6
+# Months two date ranges may be apart and still count as the same period
+DATE_SLACK = 3
+
+# Suffixes and filler words that do not identify an organization
+ORG_STOPWORDS = {
+    "the", "inc", "llc", "ltd", "corp", "corporation", "co", "company", "gmbh", "plc", "lp",
+}
+ACRONYM_SKIP = {"of", "and", "the", "at", "for", "in"}
+MONTHS = {
+    m: i + 1
+    for i, m in enumerate(
+        ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+    )
+}
+PRESENT = {"present", "current", "now", "ongoing", "today"}
+PRESENT_MONTH = 10**6
+
+SYSMSG_MATCH = """
+You decide whether two entries of a candidate's {kind} history, one from the resumé and one from the LinkedIn profile, describe the same {item}.
+Entries can differ in abbreviations, spelling, level of detail and by a few months in dates.
+Return ONLY a JSON object: {{"same": true}} or {{"same": false}}.
+"""
+
+
+class SameEntry(BaseModel):
+    same: bool
+
+
+# Per entry kind: (org field, detail field, start, end, kind label, item label)
+KINDS = {
+    "edu": ("ed_org", "ed_degree", "ed_startdate", "ed_enddate", "education", "education item"),
+    "exp": ("exp_org", "exp_role", "exp_startdate", "exp_enddate", "professional experience", "position"),
+}
+
+
+@dataclass
+class MatchReport:
+    """
+    Pairs that were candidates for a merge and how they were decided.
+    Pairs that are clearly different organizations are not counted.
+    """
+
+    rule_merged: int = 0
+    rule_distinct: int = 0
+    llm_merged: int = 0
+    llm_distinct: int = 0
+    unresolved: int = 0
+
+    @property
+    def decisions(self) -> int:
+        return (
+            self.rule_merged + self.rule_distinct + self.llm_merged + self.llm_distinct + self.unresolved
+        )
+
+    @property
+    def without_inference(self) -> float:
+        """Share of decisions made by the rules alone (1.0 when nothing was decided)."""
+        if not self.decisions:
+            return 1.0
+        return (self.rule_merged + self.rule_distinct) / self.decisions
+
+    def add(self, other: "MatchReport") -> None:
+        self.rule_merged += other.rule_merged
+        self.rule_distinct += other.rule_distinct
+        self.llm_merged += other.llm_merged
+        self.llm_distinct += other.llm_distinct
+        self.unresolved += other.unresolved
+
+
+def normalize_org(name: str) -> str:
+    name = name.lower().replace("&", " and ")
+    words = re.sub(r"[^\w\s]", " ", name).split()
+    return " ".join(w for w in words if w not in ORG_STOPWORDS)
+
+
+def _acronym(norm: str) -> str:
+    return "".join(w[0] for w in norm.split() if w not in ACRONYM_SKIP)
+
+
+def name_similarity(a: Optional[str], b: Optional[str]) -> float:
+    """
+    Similarity of two organization or title strings in [0, 1].
+
+    Exact match after normalization scores 1, an acronym of the other name
+    0.95, one name's words contained in the other's 0.9, otherwise the
+    difflib ratio of the normalized strings.
+    """
+    na, nb = normalize_org(a or ""), normalize_org(b or "")
+    if not na or not nb:
+        return 0.0
+    if na == nb:
+        return 1.0
+    if na.replace(" ", "") == _acronym(nb) or nb.replace(" ", "") == _acronym(na):
+        return 0.95
+    ta, tb = set(na.split()), set(nb.split())
+    if ta <= tb or tb <= ta:
+        return 0.9
+    return difflib.SequenceMatcher(None, na, nb).ratio()
+
+
+def parse_month(value: Optional[str]) -> Tuple[Optional[int], bool]:
+    """
+    Month index (year * 12 + month) of a date string.
+
+    Understands MM/YY, MM/YYYY, "Mon YYYY", YYYY and "Present".
+
+    Returns:
+        Tuple[Optional[int], bool]: (month index or None, whether the month is known)
+    """
+    if not value:
+        return None, False
+    text = value.strip().lower()
+    if text in PRESENT:
+        return PRESENT_MONTH, True
+
+    def year(y: str) -> int:
+        return int(y) + (2000 if int(y) < 70 else 1900) if len(y) == 2 else int(y)
+
+    m = re.fullmatch(r"(\d{1,2})[/\-.](\d{2}|\d{4})", text)
+    if m and 1 <= int(m.group(1)) <= 12:
+        return year(m.group(2)) * 12 + int(m.group(1)) - 1, True
+    m = re.fullmatch(r"([a-z]{3})[a-z]*\.?,?\s+(\d{2}|\d{4})", text)
+    if m and m.group(1) in MONTHS:
+        return year(m.group(2)) * 12 + MONTHS[m.group(1)] - 1, True
+    m = re.fullmatch(r"(\d{4})", text)
+    if m:
+        return int(m.group(1)) * 12, False
+    return None, False
+
+
+def _range(entry: Dict[str, Any], start: str, end: str) -> Optional[Tuple[int, int]]:
+    s, s_month = parse_month(entry.get(start))
+    e, e_month = parse_month(entry.get(end))
+    if s is None and e is None:
+        return None
+    if e is None:
+        # A start date without an end date is a current position ("Present" is null)
+        return s, PRESENT_MONTH
+    # A lone end date stands for a one-point range
+    first = s if s is not None else e
+    # A year without a month spans January to December of that year
+    return first, e if e_month else e + 11
+
+
+def dates_compatible(a: Dict[str, Any], b: Dict[str, Any], start: str, end: str) -> Optional[bool]:
+    """
+    Whether two entries cover the same period, within `DATE_SLACK` months.
+
+    Returns:
+        Optional[bool]: None when either entry has no usable date
+    """
+    ra, rb = _range(a, start, end), _range(b, start, end)
+    if ra is None or rb is None:
+        return None
+    return ra[0] <= rb[1] + DATE_SLACK and rb[0] <= ra[1] + DATE_SLACK
+
+
+def decide(a: Dict[str, Any], b: Dict[str, Any], kind: str) -> Tuple[str, float]:
+    """
+    Rule decision for one (resumé, LinkedIn) pair.
+
+    Returns:
+        Tuple[str, float]: (SAME | DISTINCT | AMBIGUOUS, organization similarity)
+    """
+    org, detail, start, end = KINDS[kind][:4]
+    org_sim = name_similarity(a.get(org), b.get(org))
+    if org_sim < NAME_DIFF:
+        return DISTINCT, org_sim
+
+    dates = dates_compatible(a, b, start, end)
+    detail_sim = name_similarity(a.get(detail), b.get(detail))
+    if kind == "edu":
+        # Same school: one record per degree level
+        same_detail = detail_sim >= NAME_SAME or a.get("ed_lvl") == b.get("ed_lvl")
+    else:
+        # Same company: titles may be shortened ("Senior Software Engineer" / "Software Engineer")
+        same_detail = detail_sim >= NAME_SAME
+
+    if dates is False:
+        # Different periods: another stint, degree or organization
+        return DISTINCT, org_sim
+    if org_sim >= NAME_SAME and same_detail:
+        return SAME, org_sim
+    if kind == "edu" and org_sim >= NAME_SAME and detail_sim < NAME_DIFF:
+        # Different level and unrelated degree at the same school
+        return DISTINCT, org_sim
+    return AMBIGUOUS, org_sim
+
+
+def _more_specific(a: Optional[str], b: Optional[str]) -> Optional[str]:
+    if not a:
+        return b
+    if not b:
+        return a
+    return b if len(b.strip()) > len(a.strip()) else a
+
+
+def _more_precise_date(a: Optional[str], b: Optional[str]) -> Optional[str]:
+    ma, pa = parse_month(a)
+    mb, pb = parse_month(b)
+    if ma is None:
+        return b
+    if mb is None or pa or not pb:
+        return a
+    # b has a month and a does not: take it if it is within a's year
+    return b if ma // 12 == mb // 12 else a
+
+
+def _union(a: Optional[List[str]], b: Optional[List[str]]) -> Optional[List[str]]:
+    if a is None and b is None:
+        return None
+    out, seen = [], set()
+    for item in (a or []) + (b or []):
+        key = item.strip().lower()
+        if key not in seen:
+            seen.add(key)
+            out.append(item)
+    return out
+
+
+def merge_entries(a: Dict[str, Any], b: Dict[str, Any], kind: str) -> Dict[str, Any]:
+    """
+    Merge two entries describing the same item.
+
+    Strings keep the longer (more specific) form, dates the more precise
+    one, lists are unioned in order, other values keep `a` unless missing.
+    """
+    start, end = KINDS[kind][2:4]
+    merged: Dict[str, Any] = {}
+    for key in dict.fromkeys([*a, *b]):
+        va, vb = a.get(key), b.get(key)
+        if key in (start, end):
+            merged[key] = _more_precise_date(va, vb)
+        elif isinstance(va, list) or isinstance(vb, list):
+            merged[key] = _union(va, vb)
+        elif isinstance(va, str) and isinstance(vb, str) and key.endswith(("_org", "_role", "_degree", "_location")):
+            merged[key] = _more_specific(va, vb)
+        else:
+            merged[key] = va if va not in (None, "") else vb
+    return merged
+
+
+def sort_recent_first(entries: List[Dict[str, Any]], kind: str) -> List[Dict[str, Any]]:
+    start, end = KINDS[kind][2:4]
+
+    def key(entry: Dict[str, Any]) -> Tuple[int, int]:
+        r = _range(entry, start, end)
+        return (r[1], r[0]) if r else (-1, -1)
+
+    return sorted(entries, key=key, reverse=True)
+
+
+async def ask_same(
+    client: ChatCompletionClient,
+    a: Dict[str, Any],
+    b: Dict[str, Any],
+    kind: str,
+    cancellation_token: Optional[CancellationToken] = None,
+) -> Optional[bool]:
+    """
+    Ask the model whether one ambiguous pair is the same item.
+
+    Returns:
+        Optional[bool]: The answer, or None if the model gave no valid answer
+    """
+    label, item = KINDS[kind][4:]
+    messages: List[LLMMessage] = [
+        SystemMessage(content=SYSMSG_MATCH.format(kind=label, item=item)),
+        UserMessage(
+            content=f"Resumé entry:\n{json.dumps(a)}\n\nLinkedIn entry:\n{json.dumps(b)}",
+            source="match",
+        ),
+    ]
+    try:
+        result = await client.create(
+            messages, json_output=SameEntry, cancellation_token=cancellation_token
+        )
+        if not isinstance(result.content, str):
+            return None
+        return SameEntry.model_validate_json(strip_json(result.content)).same
+    except (ValidationError, ValueError) as e:
+        logger.warning(f"No valid match answer: {e!r}")
+        return None
+
+
+async def match_entries(
+    first: Sequence[Dict[str, Any]],
+    second: Sequence[Dict[str, Any]],
+    kind: str,
+    client: Optional[ChatCompletionClient] = None,
+    cancellation_token: Optional[CancellationToken] = None,
+) -> Tuple[List[Dict[str, Any]], MatchReport]:
+    """
+    Combine the entries of two sources into one de-duplicated list.
+
+    Pairs the rules mark as the same are merged first (most similar names
+    first, each entry used once). Remaining ambiguous pairs go to `client`
+    one by one; without a client, or without a valid answer, both entries
+    are kept.
+
+    Args:
+        first: Entries of the preferred source (resumé), as dicts
+        second: Entries of the other source (LinkedIn)
+        kind: "edu" or "exp"
+        client: Model client for ambiguous pairs
+
+    Returns:
+        Tuple[List[Dict[str, Any]], MatchReport]: Entries most recent first, and the decisions
+    """
+    report = MatchReport()
+    candidates = []
+    for i, a in enumerate(first):
+        for j, b in enumerate(second):
+            decision, score = decide(a, b, kind)
+            if decision == DISTINCT and score < NAME_DIFF:
+                continue
+            candidates.append((decision, score, i, j))
+    candidates.sort(key=lambda c: (c[0] != SAME, -c[1]))
+
+    used_a, used_b = set(), set()
+    merged: Dict[int, Dict[str, Any]] = {}
+    for decision, score, i, j in candidates:
+        if i in used_a or j in used_b:
+            continue
+        if decision == DISTINCT:
+            report.rule_distinct += 1
+            continue
+        if decision == SAME:
+            report.rule_merged += 1
+        else:
+            same = None
+            if client is not None:
+                same = await ask_same(client, first[i], second[j], kind, cancellation_token)
+            if same is None:
+                report.unresolved += 1
+                continue
+            if not same:
+                report.llm_distinct += 1
+                continue
+            report.llm_merged += 1
+        merged[i] = merge_entries(first[i], second[j], kind)
+        used_a.add(i)
+        used_b.add(j)
+
+    entries = [merged.get(i, a) for i, a in enumerate(first)]
+    entries += [b for j, b in enumerate(second) if j not in used_b]
+    return sort_recent_first(entries, kind), report
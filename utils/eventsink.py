@@ -0,0 +1,81 @@
+"""
+Quiet consumer for GraphFlow streams.
+
+Replaces `autogen_agentchat.ui.Console` where nobody watches the terminal:
+nothing is rendered, streamed token chunks are only counted, and the sink
+keeps what is needed afterwards (last message and completion time per node,
+token usage, the final TaskResult).
+"""
+
+import time
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
+from autogen_agentchat.base import TaskResult
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage
+
+
+class QuietSink:
+    """
+    Collects the outcome of one graph run.
+
+    Args:
+        nodes: Graph node names; messages from other sources (e.g. the task) are ignored
+    """
+
+    def __init__(self, nodes: List[str]):
+        self.nodes = set(nodes)
+        self.started = time.perf_counter()
+        self.done: Dict[str, float] = {}
+        self.messages: Dict[str, BaseChatMessage] = {}
+        self.usage: Dict[str, Dict[str, int]] = {}
+        self.events = 0
+        self.result: Optional[TaskResult] = None
+
+    async def consume(
+        self, stream: AsyncGenerator[BaseAgentEvent | BaseChatMessage | TaskResult, None]
+    ) -> Optional[TaskResult]:
+        """
+        Drain `stream` (e.g. `flow.run_stream(...)`).
+
+        Returns:
+            Optional[TaskResult]: The final result of the run
+        """
+        self.started = time.perf_counter()
+        async for item in stream:
+            if isinstance(item, TaskResult):
+                self.result = item
+            elif isinstance(item, BaseChatMessage):
+                if item.source in self.nodes:
+                    self.done[item.source] = time.perf_counter()
+                    self.messages[item.source] = item
+                if item.models_usage is not None:
+                    usage = self.usage.setdefault(item.source, {"prompt_tokens": 0, "completion_tokens": 0})
+                    usage["prompt_tokens"] += item.models_usage.prompt_tokens
+                    usage["completion_tokens"] += item.models_usage.completion_tokens
+            else:
+                self.events += 1
+        return self.result
+
+    def output(self, node: str) -> Any:
+        """Content of the last message of `node`, or None."""
+        msg = self.messages.get(node)
+        return msg.content if msg is not None else None
+
+    def elapsed(self) -> float:
+        return max(self.done.values(), default=self.started) - self.started
+
+    def stage_latencies(self, parents: Dict[str, List[str]]) -> Dict[str, float]:
+        """
+        Time each node took once it was ready to run.
+
+        Args:
+            parents: Node -> parent nodes, from `DiGraph.get_parents()`
+
+        Returns:
+            Dict[str, float]: Node -> seconds from its last parent completing to its own completion
+        """
+        return {
+            node: t
+            - max((self.done.get(p, self.started) for p in parents.get(node, [])), default=self.started)
+            for node, t in self.done.items()
+        }
@@ -0,0 +1,179 @@
+"""
+Map-reduce extraction of long experience sections.
+
+A single `OutExtExp` generation for a candidate with many positions is slow,
+gets truncated and fails validation as a whole. Here the experience section
+is split into one block per position in Python, every block is extracted by
+its own small request in parallel (map), and the entries are de-duplicated
+and ordered recent first (reduce). A block that fails only loses its own
+position.
+"""
+
+import asyncio
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient, SystemMessage, UserMessage
+from pydantic import ValidationError
+
+from prompts.out_ext import OutComb
+from utils.commonutil import set_logger
+from utils.entmatch import merge_entries, normalize_org, sort_recent_first
+from utils.mdsections import EXP_TITLE, section_lines
+from utils.outrepair import strip_json
+
+logger = set_logger("ExpChunk")
+
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?"
+_DATE = rf"(?:{_MONTH}\s+\d{{4}}|\d{{1,2}}/\d{{2,4}}|\d{{4}})"
+# A position is anchored at its date range ("Jan 2020 - Present", "01/20 – 12/22")
+DATE_RANGE = re.compile(rf"{_DATE}\s*(?:-|–|—|to)\s*(?:{_DATE}|present|current|now)", re.I)
+BULLET = re.compile(r"^\s*([-*•◦▪]|\d+\.)\s")
+HEADING = re.compile(r"^\s*#")
+# Non-blank, non-bullet lines above a date range that still belong to its position
+HEADER_LINES = 3
+
+
+@dataclass
+class ChunkReport:
+    """Positions found and extracted by chunked nodes, accumulated over runs."""
+
+    runs: int = 0
+    single_shot: int = 0
+    chunks: int = 0
+    failed: int = 0
+    elapsed: List[float] = field(default_factory=list)
+
+    @property
+    def failure_rate(self) -> float:
+        return self.failed / self.chunks if self.chunks else 0.0
+
+
+def split_positions(md: str) -> List[Tuple[str, str]]:
+    """
+    Split the experience section of `md` into one block per position.
+
+    Every date range starts a position, together with up to `HEADER_LINES`
+    title / organization lines above it (blank lines are skipped, a bullet
+    ends the previous position, a heading is the first line of the
+    position); the first position also keeps everything above it.
+
+    Returns:
+        List[Tuple[str, str]]: (context, block) per position, where context is
+            the header of the previous position (roles grouped under one
+            company on LinkedIn only name the company once)
+    """
+    lines = section_lines(md, EXP_TITLE)
+    anchors = [i for i, line in enumerate(lines) if DATE_RANGE.search(line)]
+    starts = []
+    for n, a in enumerate(anchors):
+        if n == 0:
+            starts.append(0)
+            continue
+        floor = anchors[n - 1] + 1
+        s, i, header = a, a - 1, 0
+        # docling separates headings and paragraphs with blank lines
+        while i >= floor and header < HEADER_LINES:
+            if not lines[i].strip():
+                i -= 1
+                continue
+            if BULLET.match(lines[i]):
+                break
+            s, header = i, header + 1
+            if HEADING.match(lines[i]):
+                break
+            i -= 1
+        starts.append(s)
+
+    blocks = []
+    for n, s in enumerate(starts):
+        end = starts[n + 1] if n + 1 < len(starts) else len(lines)
+        context = "\n".join(lines[starts[n - 1] : anchors[n - 1] + 1]).strip() if n else ""
+        blocks.append((context, "\n".join(lines[s:end]).strip()))
+    return blocks
+
+
+async def extract_position(
+    client: ChatCompletionClient,
+    system: str,
+    context: str,
+    block: str,
+    cancellation_token: Optional[CancellationToken] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Extract the entries of one position block.
+
+    Returns:
+        Optional[List[Dict[str, Any]]]: The entries, or None if the answer is not a valid `OutExtExp`
+    """
+    content = f"<BLOCK>\n{block}\n</BLOCK>"
+    if context:
+        content = f"<CONTEXT>\n{context}\n</CONTEXT>\n\n{content}"
+    try:
+        result = await client.create(
+            [SystemMessage(content=system), UserMessage(content=content, source="chunk")],
+            json_output=OutComb.OutExtExp,
+            cancellation_token=cancellation_token,
+        )
+        if not isinstance(result.content, str):
+            return None
+        out = OutComb.OutExtExp.model_validate_json(strip_json(result.content))
+        return [e.model_dump(mode="json") for e in out.experience]
+    except (ValidationError, ValueError) as e:
+        logger.warning(f"Invalid position block: {e!r}")
+        return None
+
+
+def _position_key(entry: Dict[str, Any]) -> Tuple[str, str, Any, Any]:
+    return (
+        normalize_org(entry.get("exp_org") or ""),
+        (entry.get("exp_role") or "").strip().lower(),
+        entry.get("exp_startdate"),
+        entry.get("exp_enddate"),
+    )
+
+
+def reduce_positions(results: List[Optional[List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+    """
+    Drop failed blocks, merge entries extracted twice, order recent first.
+
+    Blocks are distinct positions by construction, so only entries with the
+    same organization, title and dates are merged; promotions within one
+    company stay separate (unlike the resumé / LinkedIn matching).
+    """
+    entries: Dict[Tuple[str, str, Any, Any], Dict[str, Any]] = {}
+    for entry in (e for r in results if r for e in r):
+        key = _position_key(entry)
+        entries[key] = merge_entries(entries[key], entry, "exp") if key in entries else entry
+    return sort_recent_first(list(entries.values()), "exp")
+
+
+async def map_positions(
+    client: ChatCompletionClient,
+    system: str,
+    blocks: List[Tuple[str, str]],
+    concurrency: int,
+    cancellation_token: Optional[CancellationToken] = None,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Extract all blocks, at most `concurrency` at a time, and reduce them.
+
+    Returns:
+        Tuple[List[Dict[str, Any]], int]: The entries and the number of failed blocks
+    """
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(context: str, block: str) -> Optional[List[Dict[str, Any]]]:
+        async with slots:
+            return await extract_position(client, system, context, block, cancellation_token)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(one(c, b) for c, b in blocks))
+    failed = sum(r is None for r in results)
+    logger.info(
+        f"{len(blocks)} position blocks in {time.perf_counter() - started:.1f}s, {failed} failed"
+    )
+    return reduce_positions(list(results)), failed
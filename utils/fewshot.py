@@ -0,0 +1,222 @@
+"""
+Few-shot compilation and similarity-based selection.
+
+The examples of `prompts.fewshot_ext` are written for people: banners and
+pretty-printed JSON. `compile_fewshot` turns them into what the prompts
+embed: minified JSON with keys in schema order, fields left out where the
+schema default covers their null / empty value, and plain tags instead of
+banners.
+
+For selection the examples are split into one unit per output entry (the
+input snippet of that entry and its JSON), pooled per section kind across
+the resumé and LinkedIn examples, and indexed once with TF-IDF vectors. For
+a candidate only the `k` units most similar to the matching section of its
+document are rendered into the prompt, instead of every example in full.
+"""
+
+import json
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+import typing
+from typing import Any, Dict, List, Sequence, Tuple
+
+from pydantic import BaseModel
+
+from prompts.fewshot_ext import fsExtLkdEdu, fsExtLkdExp, fsExtResEdu, fsExtResExp
+from prompts.out_ext import OutComb
+from utils.commonutil import set_logger
+from utils.mdsections import EDU_TITLE, EXP_TITLE, section_lines
+
+logger = set_logger("FewShot")
+
+EXAMPLE = re.compile(
+    r"=+ EXAMPLE \d+ START =+\s*Task:\s*\"(?P<task>.*?)\"\s*Output:\s*```json\s*(?P<output>.*?)```",
+    re.S,
+)
+TOKEN = re.compile(r"[a-z][a-z0-9+#]*")
+ORG_WORD = re.compile(r"[A-Za-z]{3,}")
+
+# Section kind -> (section title, output model, list field, org field, pooled few-shot strings)
+POOLS = {
+    "edu": (EDU_TITLE, OutComb.OutExtEdu, "education", "ed_org", (fsExtResEdu, fsExtLkdEdu)),
+    "exp": (EXP_TITLE, OutComb.OutExtExp, "experience", "exp_org", (fsExtResExp, fsExtLkdExp)),
+}
+
+
+@dataclass
+class FewShotUnit:
+    text: str
+    entries: List[Dict[str, Any]]
+
+
+def parse_examples(fewshot: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """(task text, output JSON) of every example in a few-shot string."""
+    return [
+        (m.group("task").strip(), json.loads(m.group("output")))
+        for m in EXAMPLE.finditer(fewshot)
+    ]
+
+
+def entry_model(model_cls: type[BaseModel], list_field: str) -> type[BaseModel]:
+    """Model of the entries of `model_cls.<list_field>`."""
+    return typing.get_args(model_cls.model_fields[list_field].annotation)[0]
+
+
+def compact_entry(entry: Dict[str, Any], model: type[BaseModel]) -> Dict[str, Any]:
+    """
+    `entry` with keys in schema order, without the fields whose null / empty
+    value the schema default already gives. Required fields are kept.
+    """
+    out = {}
+    for name, info in model.model_fields.items():
+        if name not in entry:
+            continue
+        value = entry[name]
+        if not info.is_required() and value in (info.default, None, [], ""):
+            continue
+        out[name] = value
+    # Keys outside the schema keep their place after it
+    out.update({k: v for k, v in entry.items() if k not in model.model_fields})
+    return out
+
+
+def render_examples(
+    examples: Sequence[Tuple[str, List[Dict[str, Any]]]], model_cls: type[BaseModel], list_field: str
+) -> str:
+    """
+    Examples as embedded in the prompts: input text and minified output.
+
+    Args:
+        examples: (input text, output entries) per example
+        model_cls: Output model, e.g. `OutComb.OutExtEdu`
+        list_field: Its list field, e.g. "education"
+    """
+    model = entry_model(model_cls, list_field)
+    blocks = []
+    for text, entries in examples:
+        output = {list_field: [compact_entry(e, model) for e in entries]}
+        blocks.append(
+            f"<example>\n<input>\n{text}\n</input>\n<output>\n"
+            f"{json.dumps(output, ensure_ascii=False, separators=(',', ':'))}\n</output>\n</example>"
+        )
+    return "\n" + "\n".join(blocks) + "\n"
+
+
+def compile_fewshot(fewshot: str, kind: str) -> str:
+    """
+    Compile a few-shot string of `prompts.fewshot_ext` for the prompts.
+
+    Args:
+        fewshot: Examples in the banner / pretty-printed format
+        kind: "edu" or "exp"
+
+    Returns:
+        str: The same examples, compact
+    """
+    _, model_cls, list_field = POOLS[kind][:3]
+    examples = [(text, output.get(list_field, [])) for text, output in parse_examples(fewshot)]
+    return render_examples(examples, model_cls, list_field)
+
+
+def split_units(text: str, entries: List[Dict[str, Any]], org_field: str) -> List[FewShotUnit]:
+    """
+    Cut an example into one unit per entry, at the first mention of each
+    entry's organization after the previous one. Falls back to the whole
+    example when an organization cannot be found in the text.
+    """
+    starts, pos = [], 0
+    for entry in entries:
+        word = ORG_WORD.search(entry.get(org_field) or "")
+        if word is None:
+            return [FewShotUnit(text, entries)]
+        # Prefer a mention opening a line (a heading) over one in running text
+        word = re.escape(word.group())
+        found = re.compile(rf"^[#\s]*{word}", re.I | re.M).search(text, pos) or re.compile(
+            word, re.I
+        ).search(text, pos)
+        if found is None:
+            return [FewShotUnit(text, entries)]
+        starts.append(found.start())
+        pos = found.end()
+    # Each unit starts at the line of its organization
+    starts = [text.rfind("\n", 0, s) + 1 for s in starts]
+    ends = starts[1:] + [len(text)]
+    return [FewShotUnit(text[s:e].strip(), [entry]) for s, e, entry in zip(starts, ends, entries)]
+
+
+def _tf(text: str) -> Counter:
+    return Counter(TOKEN.findall(text.lower()))
+
+
+class FewShotStore:
+    """
+    TF-IDF index over the few-shot units of one section kind.
+
+    Args:
+        model_cls: Output model, e.g. `OutComb.OutExtEdu`
+        list_field: Its list field, e.g. "education"
+        org_field: Entry field used to cut examples into units, e.g. "ed_org"
+        fewshots: Few-shot strings in the `prompts.fewshot_ext` format
+    """
+
+    def __init__(
+        self, model_cls: type[BaseModel], list_field: str, org_field: str, fewshots: Sequence[str]
+    ):
+        self.model_cls = model_cls
+        self.list_field = list_field
+        self.units = [
+            unit
+            for fewshot in fewshots
+            for text, output in parse_examples(fewshot)
+            for unit in split_units(text, output.get(list_field, []), org_field)
+        ]
+        tfs = [_tf(u.text) for u in self.units]
+        df = Counter(term for tf in tfs for term in tf)
+        n = len(self.units)
+        self.idf = {term: math.log((1 + n) / (1 + d)) + 1 for term, d in df.items()}
+        self.vectors = [self._vector(tf) for tf in tfs]
+
+    def _vector(self, tf: Counter) -> Dict[str, float]:
+        vec = {t: (1 + math.log(c)) * self.idf[t] for t, c in tf.items() if t in self.idf}
+        norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+        return {t: v / norm for t, v in vec.items()}
+
+    def select(self, query: str, k: int) -> List[FewShotUnit]:
+        """The `k` units most similar to `query`, most similar first."""
+        q = self._vector(_tf(query))
+        scores = [sum(w * vec.get(t, 0.0) for t, w in q.items()) for vec in self.vectors]
+        ranked = sorted(range(len(self.units)), key=lambda i: scores[i], reverse=True)
+        return [self.units[i] for i in ranked[:k]]
+
+    def render(self, units: Sequence[FewShotUnit]) -> str:
+        """Units as one compiled example."""
+        text = "\n\n".join(u.text for u in units)
+        entries = [e for u in units for e in u.entries]
+        return render_examples([(text, entries)], self.model_cls, self.list_field)
+
+
+@lru_cache(maxsize=None)
+def store(kind: str) -> FewShotStore:
+    """Index of one section kind ("edu" / "exp"), built on first use."""
+    return FewShotStore(*POOLS[kind][1:])
+
+
+def select_fewshots(kind: str, md: str, k: int) -> str:
+    """
+    Few-shot block with the `k` units closest to the `kind` section of `md`.
+
+    Args:
+        kind: "edu" or "exp"
+        md: Candidate document markdown; the whole document is compared when
+            it has no such section
+        k: Units to keep
+
+    Returns:
+        str: Rendered few-shot block
+    """
+    title = POOLS[kind][0]
+    query = "\n".join(section_lines(md, title)) or md
+    return store(kind).render(store(kind).select(query, k))
@@ -0,0 +1,215 @@
+"""
+Critical-path profiling of graph runs.
+
+`AgtProfile` records when every node of a GraphFlow starts and ends. From
+these spans and the graph, `GraphProfile` derives the critical path (the
+chain of nodes that each waited on the previous one and ended last), the
+slack of every other node (how much later it could have ended without
+delaying the run), and, from the telemetry call records, the time each
+model sat idle during the run. The timeline renders as a text Gantt chart,
+as JSON, or in the Chrome trace format (chrome://tracing, Perfetto).
+"""
+
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+from utils.telemetry import CallRecord
+
+# Width of the text Gantt bars, in characters
+GANTT_WIDTH = 60
+
+
+@dataclass
+class NodeSpan:
+    node: str
+    start: float
+    end: float
+    ok: bool = True
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+def merge_intervals(intervals: Sequence[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    """Union of `intervals` as sorted, disjoint intervals."""
+    merged: List[Tuple[float, float]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class GraphProfile:
+    """
+    Node spans of one graph run.
+
+    Args:
+        parents: Node -> parent nodes, from `DiGraph.get_parents()`
+    """
+
+    def __init__(self, parents: Dict[str, List[str]]):
+        self.parents = {node: list(ps) for node, ps in parents.items()}
+        self.spans: Dict[str, NodeSpan] = {}
+        self.calls: List[CallRecord] = []
+        # Call records carry wall-clock times, spans perf_counter times
+        self._clock = (time.time(), time.perf_counter())
+
+    def record(self, node: str, start: float, end: float, ok: bool = True) -> None:
+        """Span of one node activation (perf_counter times); a later activation replaces it."""
+        self.spans[node] = NodeSpan(node, start, end, ok)
+
+    def add_calls(self, records: Sequence[CallRecord]) -> None:
+        """Model calls (`Telemetry.records`) made while the recorded spans ran."""
+        if not self.spans:
+            return
+        t0, t1 = self.origin, self.origin + self.makespan
+        self.calls = [r for r in records if r.agent in self.spans and t0 <= self._perf(r.ts) <= t1]
+
+    def _perf(self, ts: float) -> float:
+        wall, perf = self._clock
+        return ts - wall + perf
+
+    @property
+    def origin(self) -> float:
+        return min((s.start for s in self.spans.values()), default=0.0)
+
+    @property
+    def makespan(self) -> float:
+        return max((s.end for s in self.spans.values()), default=self.origin) - self.origin
+
+    def critical_path(self) -> List[str]:
+        """
+        Nodes from a root to the node that ended last, each one the parent
+        that ended last before its child started.
+        """
+        if not self.spans:
+            return []
+        node = max(self.spans.values(), key=lambda s: s.end).node
+        path = [node]
+        while True:
+            ran = [p for p in self.parents.get(node, []) if p in self.spans]
+            if not ran:
+                break
+            node = max(ran, key=lambda p: self.spans[p].end)
+            path.append(node)
+        return path[::-1]
+
+    def slack(self) -> Dict[str, float]:
+        """Per node, seconds it could have ended later without delaying the run."""
+        children: Dict[str, List[str]] = {n: [] for n in self.spans}
+        for node, ps in self.parents.items():
+            for p in ps:
+                if p in children and node in self.spans:
+                    children[p].append(node)
+        end = self.origin + self.makespan
+        latest: Dict[str, float] = {}
+
+        def latest_end(node: str) -> float:
+            if node not in latest:
+                latest[node] = min(
+                    (latest_end(c) - self.spans[c].duration for c in children[node]), default=end
+                )
+            return latest[node]
+
+        return {node: max(latest_end(node) - s.end, 0.0) for node, s in self.spans.items()}
+
+    def model_idle(self) -> Dict[str, Dict[str, float]]:
+        """Per model: seconds busy with at least one call and idle during the run."""
+        intervals: Dict[str, List[Tuple[float, float]]] = {}
+        for r in self.calls:
+            end = self._perf(r.ts)
+            intervals.setdefault(r.model, []).append((end - r.latency, end))
+        out = {}
+        for model, ivs in sorted(intervals.items()):
+            busy = sum(e - s for s, e in merge_intervals(ivs))
+            out[model] = {"busy": busy, "idle": max(self.makespan - busy, 0.0)}
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Spans relative to the run start, critical path, slack and model idle time."""
+        t0 = self.origin
+        slack = self.slack()
+        return {
+            "makespan": self.makespan,
+            "critical_path": self.critical_path(),
+            "nodes": {
+                node: {"start": s.start - t0, "end": s.end - t0, "ok": s.ok, "slack": slack[node]}
+                for node, s in sorted(self.spans.items(), key=lambda kv: kv[1].start)
+            },
+            "models": self.model_idle(),
+        }
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Spans (process "graph") and model calls (process "models") as Chrome trace events."""
+        t0 = self.origin
+        us = lambda t: round((t - t0) * 1e6)
+        critical = set(self.critical_path())
+        events: List[Dict[str, Any]] = [
+            {"name": "process_name", "ph": "M", "pid": 1, "args": {"name": "graph"}},
+            {"name": "process_name", "ph": "M", "pid": 2, "args": {"name": "models"}},
+        ]
+        for tid, s in enumerate(sorted(self.spans.values(), key=lambda s: s.start), 1):
+            events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": s.node}})
+            events.append(
+                {
+                    "name": s.node,
+                    "cat": "critical" if s.node in critical else "node",
+                    "ph": "X",
+                    "pid": 1,
+                    "tid": tid,
+                    "ts": us(s.start),
+                    "dur": us(s.end) - us(s.start),
+                    "args": {"ok": s.ok},
+                }
+            )
+        models = sorted({r.model for r in self.calls})
+        for tid, model in enumerate(models, 1):
+            events.append({"name": "thread_name", "ph": "M", "pid": 2, "tid": tid, "args": {"name": model}})
+        for r in self.calls:
+            end = self._perf(r.ts)
+            events.append(
+                {
+                    "name": r.agent,
+                    "cat": "call",
+                    "ph": "X",
+                    "pid": 2,
+                    "tid": models.index(r.model) + 1,
+                    "ts": us(end - r.latency),
+                    "dur": round(r.latency * 1e6),
+                    "args": {"prompt_tokens": r.prompt_tokens, "completion_tokens": r.completion_tokens},
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def gantt(self, width: int = GANTT_WIDTH) -> str:
+        """Text timeline, one row per node; critical path rows are drawn with '#'."""
+        if not self.spans:
+            return ""
+        t0, total = self.origin, self.makespan or 1.0
+        critical = set(self.critical_path())
+        slack = self.slack()
+        pad = max(len(n) for n in self.spans)
+        lines = [f"{'':<{pad}}  0s{'':<{width - 2 - len(f'{total:.1f}s')}}{total:.1f}s"]
+        for s in sorted(self.spans.values(), key=lambda s: s.start):
+            a = round((s.start - t0) / total * width)
+            b = max(round((s.end - t0) / total * width), a + 1)
+            bar = " " * a + ("#" if s.node in critical else "-") * (b - a) + " " * (width - b)
+            note = "critical" if s.node in critical else f"slack {slack[s.node]:.1f}s"
+            lines.append(f"{s.node:<{pad}} |{bar}| {s.start - t0:6.1f}-{s.end - t0:6.1f}s {note}")
+        for model, t in self.model_idle().items():
+            lines.append(f"{model}: busy {t['busy']:.1f}s idle {t['idle']:.1f}s ({t['idle'] / total:.0%})")
+        return "\n".join(lines)
+
+    def write(self, path: Path) -> None:
+        """Write `<path>.json` (profile) and `<path>.trace.json` (Chrome trace)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Not with_suffix: run ids may contain dots ("cand.v2_20250101")
+        (path.parent / f"{path.name}.json").write_text(json.dumps(self.to_dict(), indent=2))
+        (path.parent / f"{path.name}.trace.json").write_text(json.dumps(self.chrome_trace()))
@@ -0,0 +1,683 @@
+"""
+Model-client wrappers used by the extraction graph.
+
+Every wrapper is itself a ChatCompletionClient, so it can be handed to an
+AssistantAgent anywhere a plain OllamaChatCompletionClient is used today.
+"""
+
+import asyncio
+import hashlib
+import json
+from dataclasses import asdict, dataclass, field
+from typing import (
+    Any,
+    AsyncGenerator,
+    Dict,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from autogen_core import CancellationToken
+from autogen_core.models import (
+    ChatCompletionClient,
+    CreateResult,
+    LLMMessage,
+    ModelCapabilities,
+    ModelInfo,
+    RequestUsage,
+    SystemMessage,
+)
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel
+
+from utils.commonutil import set_logger
+
+logger = set_logger("LlmClient")
+
+
+def get_model_name(client: ChatCompletionClient) -> str:
+    """
+    Best-effort lookup of the model name behind a (possibly wrapped) client.
+
+    Args:
+        client: Any chat completion client
+
+    Returns:
+        str: The configured model name, or the client class name if unknown
+    """
+    if isinstance(client, WrappedClient):
+        return get_model_name(client.inner)
+    if hasattr(client, "get_create_args"):
+        return str(client.get_create_args().get("model", ""))
+    return type(client).__name__
+
+
+def get_model_config(client: ChatCompletionClient) -> Dict[str, Any]:
+    """
+    Create args (model name and options) behind a (possibly wrapped) client.
+
+    Args:
+        client: Any chat completion client
+
+    Returns:
+        Dict[str, Any]: The create args, or {"model": <class name>} if unknown
+    """
+    if isinstance(client, WrappedClient):
+        return get_model_config(client.inner)
+    if hasattr(client, "get_create_args"):
+        return dict(client.get_create_args())
+    return {"model": type(client).__name__}
+
+
+def make_cache_key(
+    model: str,
+    messages: Sequence[LLMMessage],
+    tools: Sequence[Tool | ToolSchema] = [],
+    json_output: Optional[bool | type[BaseModel]] = None,
+    extra_create_args: Mapping[str, Any] = {},
+) -> str:
+    """
+    Hash a model request the same way autogen's ChatCompletionCache does,
+    prefixed with the model name so keys from different models never collide.
+
+    Returns:
+        str: Hex sha256 digest identifying the request
+    """
+    json_output_data: str | bool | None = None
+    if isinstance(json_output, type) and issubclass(json_output, BaseModel):
+        json_output_data = json.dumps(json_output.model_json_schema())
+    elif isinstance(json_output, bool):
+        json_output_data = json_output
+
+    data = {
+        "model": model,
+        "messages": [message.model_dump() for message in messages],
+        "tools": [(tool.schema if isinstance(tool, Tool) else tool) for tool in tools],
+        "json_output": json_output_data,
+        "extra_create_args": dict(extra_create_args),
+    }
+    serialized = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+class WrappedClient(ChatCompletionClient):
+    """
+    Base for clients that decorate another client. Everything not overridden
+    is forwarded to the inner client unchanged.
+    """
+
+    def __init__(self, inner: ChatCompletionClient):
+        self.inner = inner
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        return await self.inner.create(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+
+    def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        return self.inner.create_stream(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+
+    async def close(self) -> None:
+        await self.inner.close()
+
+    def actual_usage(self) -> RequestUsage:
+        return self.inner.actual_usage()
+
+    def total_usage(self) -> RequestUsage:
+        return self.inner.total_usage()
+
+    def count_tokens(
+        self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> int:
+        return self.inner.count_tokens(messages, tools=tools)
+
+    def remaining_tokens(
+        self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> int:
+        return self.inner.remaining_tokens(messages, tools=tools)
+
+    @property
+    def capabilities(self) -> ModelCapabilities:  # type: ignore
+        return self.inner.capabilities
+
+    @property
+    def model_info(self) -> ModelInfo:
+        return self.inner.model_info
+
+
+"""
+Single-flight coalescing
+"""
+
+
+@dataclass
+class CoalesceStats:
+    requests: int = 0
+    upstream: int = 0
+    coalesced: int = 0
+
+
+class _InFlight:
+    """One upstream call plus the number of callers still waiting on it."""
+
+    def __init__(self, task: "asyncio.Task[CreateResult]"):
+        self.task = task
+        self.waiters = 0
+
+
+class CoalescingClient(WrappedClient):
+    """
+    Shares one upstream call between concurrent identical requests.
+
+    Requests are identified by `make_cache_key`. The first caller starts the
+    upstream call, later callers with the same key await the same task and
+    receive the same CreateResult. Streaming followers get the final result
+    only, without the intermediate chunks.
+    """
+
+    def __init__(self, inner: ChatCompletionClient):
+        super().__init__(inner)
+        self._model = get_model_name(inner)
+        self._inflight: Dict[str, _InFlight] = {}
+        self.stats = CoalesceStats()
+
+    def cache_key(
+        self,
+        messages: Sequence[LLMMessage],
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+    ) -> str:
+        return make_cache_key(self._model, messages, tools, json_output, extra_create_args)
+
+    async def _wait(
+        self, entry: _InFlight, cancellation_token: Optional[CancellationToken]
+    ) -> CreateResult:
+        # Shield the shared task so one caller cancelling does not cancel the rest
+        entry.waiters += 1
+        waiter = asyncio.ensure_future(asyncio.shield(entry.task))
+        if cancellation_token is not None:
+            cancellation_token.link_future(waiter)
+        try:
+            return await waiter
+        finally:
+            entry.waiters -= 1
+            if entry.waiters == 0 and not entry.task.done():
+                entry.task.cancel()
+
+    @staticmethod
+    def _shared(result: CreateResult) -> CreateResult:
+        # Followers did not trigger a model call, report them as cached
+        return result.model_copy(update={"cached": True})
+
+    def _start(self, key: str, coro: Any) -> _InFlight:
+        entry = _InFlight(asyncio.ensure_future(coro))
+        self._inflight[key] = entry
+        self.stats.upstream += 1
+        entry.task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return entry
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        key = self.cache_key(messages, tools, json_output, extra_create_args)
+        self.stats.requests += 1
+
+        entry = self._inflight.get(key)
+        if entry is not None:
+            self.stats.coalesced += 1
+            logger.debug(f"Coalesced request {key[:12]} on {self._model}")
+            return self._shared(await self._wait(entry, cancellation_token))
+
+        entry = self._start(
+            key,
+            self.inner.create(
+                messages,
+                tools=tools,
+                tool_choice=tool_choice,
+                json_output=json_output,
+                extra_create_args=extra_create_args,
+            ),
+        )
+        return await self._wait(entry, cancellation_token)
+
+    async def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        key = self.cache_key(messages, tools, json_output, extra_create_args)
+        self.stats.requests += 1
+
+        entry = self._inflight.get(key)
+        if entry is not None:
+            self.stats.coalesced += 1
+            logger.debug(f"Coalesced stream {key[:12]} on {self._model}")
+            yield self._shared(await self._wait(entry, cancellation_token))
+            return
+
+        # Leader drains the upstream stream in a task and relays chunks here
+        chunks: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+
+        async def drain() -> CreateResult:
+            result: Optional[CreateResult] = None
+            try:
+                async for chunk in self.inner.create_stream(
+                    messages,
+                    tools=tools,
+                    tool_choice=tool_choice,
+                    json_output=json_output,
+                    extra_create_args=extra_create_args,
+                ):
+                    if isinstance(chunk, CreateResult):
+                        result = chunk
+                    else:
+                        chunks.put_nowait(chunk)
+            finally:
+                chunks.put_nowait(None)
+            if result is None:
+                raise RuntimeError("Upstream stream ended without a CreateResult")
+            return result
+
+        entry = self._start(key, drain())
+        entry.waiters += 1
+        try:
+            while (chunk := await chunks.get()) is not None:
+                yield chunk
+            waiter = asyncio.ensure_future(asyncio.shield(entry.task))
+            if cancellation_token is not None:
+                cancellation_token.link_future(waiter)
+            result = await waiter
+        finally:
+            entry.waiters -= 1
+            if entry.waiters == 0 and not entry.task.done():
+                entry.task.cancel()
+        yield result
+
+    def report(self) -> Dict[str, int]:
+        """
+        Returns:
+            Dict[str, int]: Request, upstream and coalesced counters
+        """
+        return asdict(self.stats)
+
+
+"""
+Prompt-cache instrumentation
+"""
+
+
+@dataclass
+class PromptCallStats:
+    model: str
+    prefix: str
+    prompt_tokens: int
+    prompt_eval_tokens: int
+    cached_tokens: int
+    completion_tokens: int
+
+
+@dataclass
+class PromptCacheReport:
+    calls: List[PromptCallStats] = field(default_factory=list)
+
+    def totals(self) -> Dict[str, int]:
+        """
+        Returns:
+            Dict[str, int]: Summed prompt, evaluated and cached tokens over all calls
+        """
+        return {
+            "calls": len(self.calls),
+            "prompt_tokens": sum(c.prompt_tokens for c in self.calls),
+            "prompt_eval_tokens": sum(c.prompt_eval_tokens for c in self.calls),
+            "cached_tokens": sum(c.cached_tokens for c in self.calls),
+        }
+
+
+class PromptStatsClient(WrappedClient):
+    """
+    Records how much of every prompt the backend actually evaluated.
+
+    Ollama reports `prompt_eval_count` (surfaced by autogen as
+    `usage.prompt_tokens`) which only counts tokens that were not served from
+    the KV cache. Comparing it with the locally counted prompt size gives an
+    estimate of the cached prefix for each call. The local count uses the
+    client's tokenizer approximation, so small differences are noise.
+    """
+
+    def __init__(self, inner: ChatCompletionClient):
+        super().__init__(inner)
+        self._model = get_model_name(inner)
+        self.stats = PromptCacheReport()
+
+    def _record(self, messages: Sequence[LLMMessage], result: CreateResult) -> None:
+        # Group calls by the first part of the system message (the shared document prefix)
+        system = next((m.content for m in messages if isinstance(m, SystemMessage)), "")
+        prefix = hashlib.sha256(system[:2048].encode()).hexdigest()[:12]
+
+        prompt_tokens = self.inner.count_tokens(messages)
+        evaluated = result.usage.prompt_tokens
+        call = PromptCallStats(
+            model=self._model,
+            prefix=prefix,
+            prompt_tokens=prompt_tokens,
+            prompt_eval_tokens=evaluated,
+            cached_tokens=max(prompt_tokens - evaluated, 0),
+            completion_tokens=result.usage.completion_tokens,
+        )
+        self.stats.calls.append(call)
+        logger.info(
+            f"{self._model} prefix={prefix} prompt={call.prompt_tokens} "
+            f"evaluated={call.prompt_eval_tokens} cached~={call.cached_tokens}"
+        )
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        result = await self.inner.create(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+        self._record(messages, result)
+        return result
+
+    async def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        async for chunk in self.inner.create_stream(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        ):
+            if isinstance(chunk, CreateResult):
+                self._record(messages, chunk)
+            yield chunk
+
+    def report(self) -> Dict[str, int]:
+        """
+        Returns:
+            Dict[str, int]: Totals of prompt, evaluated and cached tokens
+        """
+        return self.stats.totals()
+
+
+"""
+Latency budgets and hedging
+"""
+
+
+@dataclass
+class BudgetStats:
+    requests: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    timeouts: int = 0
+
+
+class BudgetClient(WrappedClient):
+    """
+    Bounds the latency of a single agent's model calls.
+
+    - `hedge_after`: seconds after which a backup request is sent to `hedge`
+      (a second endpoint or a smaller model). Whichever answers first wins and
+      the other request is cancelled. A failed primary also triggers the hedge.
+    - `timeout`: hard budget in seconds for the whole call. When exceeded all
+      outstanding requests are cancelled and `asyncio.TimeoutError` is raised.
+    - `max_tokens`: cap on generated tokens (Ollama `num_predict`) for the
+      primary model, mostly to stop reasoning models thinking forever.
+    """
+
+    def __init__(
+        self,
+        inner: ChatCompletionClient,
+        timeout: Optional[float] = None,
+        hedge: Optional[ChatCompletionClient] = None,
+        hedge_after: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        name: str = "",
+    ):
+        super().__init__(inner)
+        self.timeout = timeout
+        self.hedge = hedge
+        self.hedge_after = hedge_after
+        self.max_tokens = max_tokens
+        self.name = name or get_model_name(inner)
+        self.stats = BudgetStats()
+
+    def _primary_args(self, extra_create_args: Mapping[str, Any]) -> Mapping[str, Any]:
+        if self.max_tokens is None or "num_predict" in extra_create_args:
+            return extra_create_args
+        return {**extra_create_args, "num_predict": self.max_tokens}
+
+    async def _race(
+        self,
+        primary: "asyncio.Task[CreateResult]",
+        start_hedge: Any,
+        cancellation_token: Optional[CancellationToken],
+        chunks: Optional["asyncio.Queue[str]"] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        """
+        Wait for the first successful result of primary/hedge, honouring the
+        hedge delay and the hard timeout. Streamed chunks from the primary are
+        relayed as they arrive.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        tasks: List["asyncio.Task[Any]"] = [primary]
+        hedge_task: Optional["asyncio.Task[CreateResult]"] = None
+        if cancellation_token is not None:
+            cancellation_token.add_callback(lambda: [t.cancel() for t in tasks])
+
+        def launch_hedge() -> None:
+            nonlocal hedge_task
+            if self.hedge is None or hedge_task is not None:
+                return
+            self.stats.hedged += 1
+            logger.warning(
+                f"{self.name}: no answer after {loop.time() - started:.1f}s, hedging"
+            )
+            hedge_task = asyncio.ensure_future(start_hedge())
+            tasks.append(hedge_task)
+
+        error: Optional[BaseException] = None
+        getter: Optional["asyncio.Task[str]"] = None
+        try:
+            while tasks:
+                # Next wake-up: hedge launch or hard deadline, whichever comes first
+                now = loop.time() - started
+                wakeups = []
+                if self.timeout is not None:
+                    wakeups.append(self.timeout - now)
+                if hedge_task is None and self.hedge is not None and self.hedge_after is not None:
+                    wakeups.append(self.hedge_after - now)
+                wait_for = max(min(wakeups), 0) if wakeups else None
+
+                if chunks is not None and getter is None and not primary.done():
+                    getter = asyncio.ensure_future(chunks.get())
+                waitables = tasks + ([getter] if getter is not None else [])
+                done, _ = await asyncio.wait(
+                    waitables, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if getter is not None and getter in done:
+                    chunk = getter.result()
+                    getter = None
+                    yield chunk
+
+                for task in [t for t in tasks if t in done]:
+                    tasks.remove(task)
+                    if task.cancelled():
+                        continue
+                    if task.exception() is None:
+                        if task is hedge_task:
+                            self.stats.hedge_wins += 1
+                        yield task.result()
+                        return
+                    error = task.exception()
+                    logger.warning(f"{self.name}: request failed: {error!r}")
+                    if task is primary:
+                        launch_hedge()
+
+                elapsed = loop.time() - started
+                if self.timeout is not None and elapsed >= self.timeout:
+                    self.stats.timeouts += 1
+                    raise asyncio.TimeoutError(
+                        f"{self.name}: latency budget of {self.timeout}s exceeded"
+                    )
+                if self.hedge_after is not None and elapsed >= self.hedge_after:
+                    launch_hedge()
+            if error is not None:
+                raise error
+        finally:
+            for task in tasks + ([getter] if getter is not None else []):
+                if not task.done():
+                    task.cancel()
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        self.stats.requests += 1
+        kwargs: Dict[str, Any] = dict(tools=tools, tool_choice=tool_choice, json_output=json_output)
+        primary = asyncio.ensure_future(
+            self.inner.create(
+                messages, extra_create_args=self._primary_args(extra_create_args), **kwargs
+            )
+        )
+
+        def start_hedge() -> Any:
+            assert self.hedge is not None
+            return self.hedge.create(messages, extra_create_args=extra_create_args, **kwargs)
+
+        race = self._race(primary, start_hedge, cancellation_token)
+        try:
+            async for result in race:
+                assert isinstance(result, CreateResult)
+                return result
+        finally:
+            await race.aclose()
+        raise RuntimeError(f"{self.name}: no result produced")
+
+    async def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        self.stats.requests += 1
+        kwargs: Dict[str, Any] = dict(tools=tools, tool_choice=tool_choice, json_output=json_output)
+        chunks: "asyncio.Queue[str]" = asyncio.Queue()
+
+        # Primary is drained in a task so the budget can interrupt it between chunks
+        async def drain() -> CreateResult:
+            result: Optional[CreateResult] = None
+            async for chunk in self.inner.create_stream(
+                messages, extra_create_args=self._primary_args(extra_create_args), **kwargs
+            ):
+                if isinstance(chunk, CreateResult):
+                    result = chunk
+                else:
+                    chunks.put_nowait(chunk)
+            if result is None:
+                raise RuntimeError("Upstream stream ended without a CreateResult")
+            return result
+
+        def start_hedge() -> Any:
+            assert self.hedge is not None
+            return self.hedge.create(messages, extra_create_args=extra_create_args, **kwargs)
+
+        primary = asyncio.ensure_future(drain())
+        race = self._race(primary, start_hedge, cancellation_token, chunks)
+        try:
+            async for item in race:
+                if isinstance(item, CreateResult):
+                    # Flush chunks that arrived together with the final result
+                    while not chunks.empty():
+                        yield chunks.get_nowait()
+                yield item
+        finally:
+            await race.aclose()
+
+    def report(self) -> Dict[str, int]:
+        """
+        Returns:
+            Dict[str, int]: Request, hedge and timeout counters
+        """
+        return asdict(self.stats)
@@ -0,0 +1,342 @@
+"""
+Load balancing of model calls across several Ollama hosts.
+
+`EndpointPool` keeps the health and the pulled models of every host in
+`OLLAMA_ENDPOINTS` and hands out the least busy host that can serve a model.
+`PooledClient` is a ChatCompletionClient built from one of the model configs
+in `common/constants.py` that routes every call through the pool.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncGenerator,
+    Dict,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Union,
+)
+
+import httpx
+from autogen_core import CancellationToken
+from autogen_core.models import (
+    ChatCompletionClient,
+    CreateResult,
+    LLMMessage,
+    ModelCapabilities,
+    ModelInfo,
+    RequestUsage,
+)
+from autogen_core.tools import Tool, ToolSchema
+from autogen_ext.models.ollama import OllamaChatCompletionClient
+from ollama import AsyncClient, ResponseError
+from pydantic import BaseModel
+
+from utils.commonutil import set_logger
+
+logger = set_logger("LlmPool")
+
+# Errors after which a host is taken out of rotation until the next health check
+CONNECTION_ERRORS = (httpx.ConnectError, httpx.ReadError, httpx.RemoteProtocolError, ConnectionError)
+
+
+class NoEndpointError(RuntimeError):
+    """Raised when no healthy host has the requested model."""
+
+
+@dataclass
+class Endpoint:
+    host: str
+    healthy: bool = True
+    models: Set[str] = field(default_factory=set)
+    outstanding: int = 0
+    served: int = 0
+    failures: int = 0
+
+    def has_model(self, model: str) -> bool:
+        # An empty set means the tags have not been fetched yet: assume available
+        if not self.models:
+            return True
+        return model in self.models or f"{model}:latest" in self.models
+
+
+class EndpointPool:
+    """
+    Least-outstanding-requests routing over a fixed list of Ollama hosts.
+
+    Health is refreshed lazily: `acquire` re-checks all hosts (via /api/tags,
+    which also lists the pulled models) when the last check is older than
+    `health_interval` seconds or when no host is usable.
+
+    With `max_inflight` set, `acquire` waits while every usable host already
+    has that many outstanding requests, so callers queue here instead of on
+    the hosts.
+    """
+
+    def __init__(
+        self, hosts: Sequence[str], health_interval: float = 30.0, max_inflight: Optional[int] = None
+    ):
+        if not hosts:
+            raise ValueError("EndpointPool needs at least one host")
+        self.endpoints = [Endpoint(host=h) for h in hosts]
+        self.health_interval = health_interval
+        self.max_inflight = max_inflight
+        # Set (and replaced) on every release to wake the callers waiting for a slot
+        self._released = asyncio.Event()
+        # Never checked: the first `acquire` runs the health check
+        self._last_check = float("-inf")
+        self._check_lock = asyncio.Lock()
+
+    async def _check(self, endpoint: Endpoint) -> None:
+        try:
+            tags = await asyncio.wait_for(AsyncClient(host=endpoint.host).list(), timeout=5)
+            endpoint.models = {m.model for m in tags.models if m.model}
+            if not endpoint.healthy:
+                logger.info(f"{endpoint.host} is back")
+            endpoint.healthy = True
+        except Exception as e:
+            if endpoint.healthy:
+                logger.warning(f"{endpoint.host} failed health check: {e!r}")
+            endpoint.healthy = False
+
+    async def refresh(self, force: bool = False) -> None:
+        """
+        Run the health check on every host.
+
+        Args:
+            force: Check even if the last check is recent
+        """
+        async with self._check_lock:
+            if not force and time.monotonic() - self._last_check < self.health_interval:
+                return
+            await asyncio.gather(*(self._check(ep) for ep in self.endpoints))
+            self._last_check = time.monotonic()
+
+    def _pick(self, model: str, exclude: Set[str]) -> Optional[Endpoint]:
+        usable = [
+            ep
+            for ep in self.endpoints
+            if ep.healthy and ep.host not in exclude and ep.has_model(model)
+        ]
+        if not usable:
+            return None
+        return min(usable, key=lambda ep: (ep.outstanding, ep.served))
+
+    async def acquire(self, model: str, exclude: Set[str] = set()) -> Endpoint:
+        """
+        Reserve the least busy healthy host serving `model`, waiting for a
+        free slot when every such host has `max_inflight` requests.
+
+        Args:
+            model: Ollama model name
+            exclude: Hosts already tried for this request
+
+        Returns:
+            Endpoint: The reserved host; pass it to `release` when done
+        """
+        await self.refresh()
+        while True:
+            endpoint = self._pick(model, exclude)
+            if endpoint is None:
+                await self.refresh(force=True)
+                endpoint = self._pick(model, exclude)
+            if endpoint is None:
+                raise NoEndpointError(f"No healthy endpoint serves {model}")
+            # No await between the check and the reservation: the slot cannot be taken twice
+            if self.max_inflight is None or endpoint.outstanding < self.max_inflight:
+                endpoint.outstanding += 1
+                return endpoint
+            await self._released.wait()
+
+    def release(self, endpoint: Endpoint, error: Optional[BaseException] = None) -> None:
+        """
+        Return a host after a request, marking it down on connection errors.
+
+        Args:
+            endpoint: Host returned by `acquire`
+            error: Exception raised by the request, if any
+        """
+        endpoint.outstanding -= 1
+        self._released.set()
+        self._released = asyncio.Event()
+        if error is None:
+            endpoint.served += 1
+            return
+        if not isinstance(error, Exception):
+            # Cancelled or closed by the caller, not the host's fault
+            return
+        endpoint.failures += 1
+        if isinstance(error, CONNECTION_ERRORS):
+            logger.warning(f"{endpoint.host} unreachable, removing from rotation")
+            endpoint.healthy = False
+
+    def report(self) -> List[Dict[str, Any]]:
+        """
+        Returns:
+            List[Dict[str, Any]]: Per-host health, load and counters
+        """
+        return [
+            {
+                "host": ep.host,
+                "healthy": ep.healthy,
+                "outstanding": ep.outstanding,
+                "served": ep.served,
+                "failures": ep.failures,
+                "models": sorted(ep.models),
+            }
+            for ep in self.endpoints
+        ]
+
+
+def _is_retryable(error: BaseException, model: str, endpoint: Endpoint) -> bool:
+    """Connection errors and 'model not found' move the request to another host."""
+    if isinstance(error, CONNECTION_ERRORS):
+        return True
+    if isinstance(error, ResponseError) and error.status_code == 404:
+        endpoint.models.discard(model)
+        endpoint.models.discard(f"{model}:latest")
+        return True
+    return False
+
+
+class PooledClient(ChatCompletionClient):
+    """
+    Ollama client for one model config, spread over the hosts of a pool.
+
+    One OllamaChatCompletionClient is created per host on first use. A
+    request that fails with a connection error or a missing model is retried
+    on the next best host.
+    """
+
+    def __init__(self, config: Mapping[str, Any], pool: EndpointPool):
+        self.config = dict(config)
+        self.model = self.config["model"]
+        self.pool = pool
+        self._clients: Dict[str, OllamaChatCompletionClient] = {}
+        # Local client used for token counting and model info only
+        self._local = OllamaChatCompletionClient(**self.config)
+
+    def _client(self, host: str) -> OllamaChatCompletionClient:
+        if host not in self._clients:
+            self._clients[host] = OllamaChatCompletionClient(**{**self.config, "host": host})
+        return self._clients[host]
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        tried: Set[str] = set()
+        while True:
+            endpoint = await self.pool.acquire(self.model, tried)
+            tried.add(endpoint.host)
+            try:
+                result = await self._client(endpoint.host).create(
+                    messages,
+                    tools=tools,
+                    tool_choice=tool_choice,
+                    json_output=json_output,
+                    extra_create_args=extra_create_args,
+                    cancellation_token=cancellation_token,
+                )
+            except Exception as e:
+                self.pool.release(endpoint, e)
+                if not _is_retryable(e, self.model, endpoint):
+                    raise
+                logger.warning(f"{self.model} on {endpoint.host} failed, trying next host")
+                continue
+            except BaseException as e:
+                self.pool.release(endpoint, e)
+                raise
+            self.pool.release(endpoint)
+            return result
+
+    async def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        tried: Set[str] = set()
+        while True:
+            endpoint = await self.pool.acquire(self.model, tried)
+            tried.add(endpoint.host)
+            started = False
+            error: Optional[BaseException] = None
+            try:
+                async for chunk in self._client(endpoint.host).create_stream(
+                    messages,
+                    tools=tools,
+                    tool_choice=tool_choice,
+                    json_output=json_output,
+                    extra_create_args=extra_create_args,
+                    cancellation_token=cancellation_token,
+                ):
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                error = e
+                # Once chunks went out the request cannot be moved transparently
+                if started or not _is_retryable(e, self.model, endpoint):
+                    raise
+                logger.warning(f"{self.model} on {endpoint.host} failed, trying next host")
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                self.pool.release(endpoint, error)
+
+    async def close(self) -> None:
+        for client in self._clients.values():
+            await client.close()
+
+    def actual_usage(self) -> RequestUsage:
+        usages = [c.actual_usage() for c in self._clients.values()]
+        return RequestUsage(
+            prompt_tokens=sum(u.prompt_tokens for u in usages),
+            completion_tokens=sum(u.completion_tokens for u in usages),
+        )
+
+    def total_usage(self) -> RequestUsage:
+        usages = [c.total_usage() for c in self._clients.values()]
+        return RequestUsage(
+            prompt_tokens=sum(u.prompt_tokens for u in usages),
+            completion_tokens=sum(u.completion_tokens for u in usages),
+        )
+
+    def count_tokens(
+        self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> int:
+        return self._local.count_tokens(messages, tools=tools)
+
+    def remaining_tokens(
+        self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> int:
+        return self._local.remaining_tokens(messages, tools=tools)
+
+    def get_create_args(self) -> Mapping[str, Any]:
+        return self._local.get_create_args()
+
+    @property
+    def capabilities(self) -> ModelCapabilities:  # type: ignore
+        return self._local.capabilities
+
+    @property
+    def model_info(self) -> ModelInfo:
+        return self._local.model_info
@@ -0,0 +1,71 @@
+"""
+Section lookup in candidate markdown.
+
+docling renders section titles as headings, bold lines or plain lines of
+their own, in any case. A section runs from its title to the title of a
+section of another kind.
+"""
+
+import re
+from typing import List, Pattern
+
+
+def _title(pattern: str) -> Pattern[str]:
+    # PDF text often loses the spaces of spaced-out headings ("WORKEXPERIENCE")
+    return re.compile(pattern.replace(" ", r"\s*"), re.I)
+
+
+# Section titles, as a heading or a line of their own
+EXP_TITLE = _title(
+    r"^(professional |work |relevant |research )?(experience|employment( history)?|work history)$"
+)
+EDU_TITLE = _title(r"^(education|academic background|education (and|&) training)$")
+OTHER_TITLE = _title(
+    r"^(skills|technical skills|projects|certifications?|licenses( & certifications)?|courses"
+    r"|coursework|honors( & awards)?|awards|publications|volunteer( experience)?|volunteering"
+    r"|languages|summary|about|interests|references|top skills|contact)$"
+)
+SECTION_TITLES = (EXP_TITLE, EDU_TITLE, OTHER_TITLE)
+# Keywords of experience / education titles, for checks that must not miss a
+# variant ("Industry Experience", "Education & Certifications")
+PROFILE_KEYWORD = re.compile(r"experience|employment|work\s*history|education|academic", re.I)
+# Lines with more words than this are text, not a title
+MAX_TITLE_WORDS = 5
+
+
+def section_title(line: str) -> str:
+    """A line without heading and emphasis markup, to compare with section titles."""
+    return line.strip().lstrip("#").strip().strip("*_:").strip()
+
+
+def has_profile_section(md: str) -> bool:
+    """Whether a short line of `md` names an experience or education section."""
+    titles = (section_title(line) for line in md.splitlines())
+    return any(PROFILE_KEYWORD.search(t) and len(t.split()) <= MAX_TITLE_WORDS for t in titles)
+
+
+def section_lines(md: str, title: Pattern[str]) -> List[str]:
+    """
+    Lines of the first section whose title matches `title`.
+
+    Args:
+        md: Document markdown
+        title: One of the `*_TITLE` patterns
+
+    Returns:
+        List[str]: Lines after the title, empty if the document has no such section
+    """
+    lines = md.splitlines()
+    start = next((i for i, line in enumerate(lines) if title.match(section_title(line))), None)
+    if start is None:
+        return []
+    others = [t for t in SECTION_TITLES if t is not title]
+    end = next(
+        (
+            i
+            for i in range(start + 1, len(lines))
+            if any(t.match(section_title(lines[i])) for t in others)
+        ),
+        len(lines),
+    )
+    return lines[start + 1 : end]
@@ -0,0 +1,137 @@
+"""
+Node-level memoization of the extraction graph.
+
+Each node output is stored on disk under a hash of what determines it: the
+node's system message, model config and output schema, the settings of
+custom nodes (`memo_config()`), and the messages it received from its
+upstream nodes. Re-running the graph with an unchanged
+resumé then reuses `ExtResEdu` / `ExtResExp` and only executes the nodes
+downstream of what changed. `NodeCheckpoint` stores the outputs of one
+run by node name so a failed run can be resumed.
+"""
+
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from autogen_agentchat.base import ChatAgent
+from autogen_agentchat.messages import BaseChatMessage, StructuredMessage
+
+from utils.commonutil import set_logger
+from utils.llmclient import get_model_config
+
+logger = set_logger("NodeMemo")
+
+
+def message_payload(msg: BaseChatMessage) -> Any:
+    """Content of a message without ids and timestamps."""
+    if isinstance(msg, StructuredMessage):
+        return msg.content.model_dump(mode="json")
+    return msg.to_model_text()
+
+
+def node_key(agent: ChatAgent, inputs: Mapping[str, Any]) -> str:
+    """
+    Hash of everything that determines the output of `agent`.
+
+    Args:
+        agent: Graph node; AssistantAgent internals are used when present,
+            and custom nodes add their settings through `memo_config()`
+        inputs: Upstream source name -> message payload
+
+    Returns:
+        str: Hex digest
+    """
+    system = [m.content for m in getattr(agent, "_system_messages", [])]
+    client = getattr(agent, "_model_client", None)
+    out_type = getattr(agent, "_output_content_type", None)
+    memo_config = getattr(agent, "memo_config", None)
+    payload = {
+        "node": agent.name,
+        "class": type(agent).__name__,
+        "system": system,
+        "model": get_model_config(client) if client is not None else None,
+        "output": out_type.model_json_schema() if out_type is not None else None,
+        "config": memo_config() if memo_config is not None else None,
+        "inputs": {src: inputs[src] for src in sorted(inputs)},
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class NodeMemo:
+    """
+    Directory of memoized node outputs plus the executed / reused log of a run.
+
+    Args:
+        path: Directory holding one `<key>.json` per stored output
+        message_types: Message classes that can be restored, e.g. the
+            `StructuredMessage[...]` types registered with GraphFlow
+    """
+
+    def __init__(self, path: Path, message_types: Sequence[type[BaseChatMessage]]):
+        self.path = Path(path)
+        self.types = {t.__name__: t for t in message_types}
+        self.executed: List[str] = []
+        self.reused: List[str] = []
+
+    def _file(self, key: str, node: str) -> Path:
+        return self.path / f"{key}.json"
+
+    def get(self, key: str, node: str) -> Optional[BaseChatMessage]:
+        file = self._file(key, node)
+        if not file.exists():
+            return None
+        stored = json.loads(file.read_text())
+        if stored.get("key", key) != key:
+            return None
+        data = stored["message"]
+        msg_type = self.types.get(data.get("type", ""))
+        if msg_type is None:
+            logger.warning(f"Unknown stored message type {data.get('type')}, ignoring {file.name}")
+            return None
+        return msg_type.load(data)
+
+    def put(self, key: str, node: str, msg: BaseChatMessage) -> None:
+        file = self._file(key, node)
+        file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = file.with_suffix(".tmp")
+        record = {"node": node, "key": key, "ts": time.time(), "message": msg.dump()}
+        tmp.write_text(json.dumps(record, default=str))
+        tmp.replace(file)
+
+    def report(self) -> Dict[str, List[str]]:
+        """
+        Returns:
+            Dict[str, List[str]]: Node names executed and reused in this run
+        """
+        return {"executed": list(self.executed), "reused": list(self.reused)}
+
+
+class NodeCheckpoint(NodeMemo):
+    """
+    Outputs of one run, one `<node>.json` per completed node.
+
+    Written as soon as a node completes, so a run that fails late in the
+    graph can be resumed with the same run id: completed nodes are restored
+    as long as their inputs are unchanged, and only the rest is executed.
+
+    Args:
+        root: Directory holding one sub-directory per run id
+        run_id: Run to write, or to resume
+        message_types: Message classes that can be restored
+    """
+
+    def __init__(self, root: Path, run_id: str, message_types: Sequence[type[BaseChatMessage]]):
+        super().__init__(Path(root) / run_id, message_types)
+        self.run_id = run_id
+
+    def _file(self, key: str, node: str) -> Path:
+        return self.path / f"{node}.json"
+
+    def completed(self) -> List[str]:
+        """Nodes with a checkpoint in this run."""
+        if not self.path.exists():
+            return []
+        return sorted(f.stem for f in self.path.glob("*.json"))
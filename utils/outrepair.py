@@ -0,0 +1,427 @@
+"""
+Schema-guided repair of structured agent outputs.
+
+When a model answer fails validation against one of the `OutComb` models
+(e.g. `OutExtExp`), we try in order:
+    1. Deterministic fixes on the invalid fields only (enum fuzzy mapping,
+       null/empty defaults for missing values).
+    2. A minimal re-prompt that contains just the broken list entry, its
+       schema and the validation errors, instead of re-running the agent.
+"""
+
+import difflib
+import json
+import re
+import typing
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import (
+    Any,
+    AsyncGenerator,
+    Dict,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from autogen_core import CancellationToken
+from autogen_core.models import (
+    ChatCompletionClient,
+    CreateResult,
+    LLMMessage,
+    SystemMessage,
+    UserMessage,
+)
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel, ValidationError
+
+from utils.commonutil import set_logger
+from utils.llmclient import WrappedClient
+
+logger = set_logger("OutRepair")
+
+# Common spellings the models produce for our enum values
+ENUM_SYNONYMS = {
+    "internship": "Intern",
+    "fulltime": "Full-time",
+    "contract": "Freelance",
+    "selfemployed": "Freelance",
+    "researchassistant": "Research",
+    "onsite": "In-Person",
+    "inperson": "In-Person",
+    "office": "In-Person",
+    "irl": "In-Person",
+    "wfh": "Remote",
+    "bachelors": "Undergraduate",
+    "masters": "Postgraduate",
+    "graduate": "Postgraduate",
+    "phd": "Doctoral",
+    "completed": "Complete",
+    "expected": "Ongoing",
+    "inprogress": "Ongoing",
+}
+
+SYSMSG_REPAIR = """
+You fix a single JSON object that failed schema validation.
+Return ONLY the corrected JSON object matching the schema below. Keep every valid field exactly as it is, change only the fields named in the errors.
+
+### SCHEMA
+{schema}
+"""
+
+
+@dataclass
+class RepairReport:
+    errors: List[str] = field(default_factory=list)
+    fixed: List[str] = field(default_factory=list)
+    reprompted: List[int] = field(default_factory=list)
+    valid: bool = False
+
+
+def strip_json(text: str) -> str:
+    """
+    Pull the JSON payload out of a model answer (drops <think> blocks and ``` fences).
+
+    Args:
+        text: Raw model content
+
+    Returns:
+        str: The JSON text
+    """
+    if "<think>" not in text and "```" not in text:
+        # Plain JSON, the usual answer with json_output set
+        return text.strip()
+    text = re.sub(r"<think>.*?</think>", "", text, flags=re.DOTALL).strip()
+    fence = re.search(r"```(?:json)?\s*(.*?)```", text, flags=re.DOTALL)
+    if fence:
+        text = fence.group(1).strip()
+    return text
+
+
+def _unwrap(annotation: Any) -> Tuple[Any, bool]:
+    """Strip Optional[...] and return (inner type, is_optional)."""
+    args = typing.get_args(annotation)
+    if typing.get_origin(annotation) is Union and type(None) in args:
+        inner = [a for a in args if a is not type(None)]
+        return inner[0], True
+    return annotation, False
+
+
+def _entry_model(model_cls: type[BaseModel], list_field: str) -> Optional[type[BaseModel]]:
+    """Model of the items of a `list[...]` field, e.g. `OutExpInfo` for `experience`."""
+    finfo = model_cls.model_fields.get(list_field)
+    if finfo is None:
+        return None
+    args = typing.get_args(finfo.annotation)
+    if args and isinstance(args[0], type) and issubclass(args[0], BaseModel):
+        return args[0]
+    return None
+
+
+def match_enum(value: Any, enum_cls: type[Enum]) -> Optional[str]:
+    """
+    Map a free-text value onto the closest enum value.
+
+    Args:
+        value: Value produced by the model
+        enum_cls: Target enum
+
+    Returns:
+        Optional[str]: The matching enum value, or None if nothing is close enough
+    """
+    if not isinstance(value, str):
+        return None
+    choices = {m.value.lower(): m.value for m in enum_cls}
+    choices.update({m.name.lower(): m.value for m in enum_cls})
+    key = value.strip().lower()
+    if key in choices:
+        return choices[key]
+
+    compact = re.sub(r"[^a-z]", "", key)
+    synonym = ENUM_SYNONYMS.get(compact)
+    if synonym in choices.values():
+        return synonym
+
+    close = difflib.get_close_matches(key, list(choices), n=1, cutoff=0.6)
+    return choices[close[0]] if close else None
+
+
+def _default_for(annotation: Any) -> Any:
+    """Null default for a missing field: None if optional, [] for lists, "" for strings."""
+    inner, optional = _unwrap(annotation)
+    if optional:
+        return None
+    if typing.get_origin(inner) in (list, List):
+        return []
+    if inner is str:
+        return ""
+    return None
+
+
+def _fix_field(entry: Dict[str, Any], name: str, model: type[BaseModel]) -> bool:
+    """Apply a deterministic fix to one field of one entry. Returns True if changed."""
+    finfo = model.model_fields.get(name)
+    if finfo is None:
+        return False
+    inner, optional = _unwrap(finfo.annotation)
+
+    # Enum values: fuzzy match, else drop to null when allowed
+    if isinstance(inner, type) and issubclass(inner, Enum):
+        mapped = match_enum(entry.get(name), inner)
+        if mapped is not None:
+            entry[name] = mapped
+            return True
+        if optional:
+            entry[name] = None
+            return True
+        return False
+
+    # Missing or null values: fill the schema default
+    if entry.get(name) is None:
+        entry[name] = _default_for(finfo.annotation)
+        return entry[name] is not None or optional
+
+    # Single string where a list is expected
+    if typing.get_origin(inner) in (list, List) and isinstance(entry[name], str):
+        entry[name] = [entry[name]]
+        return True
+    return False
+
+
+def _errors(exc: ValidationError) -> List[Tuple[Tuple[Any, ...], str]]:
+    return [(tuple(e["loc"]), e["msg"]) for e in exc.errors()]
+
+
+def fix_deterministic(
+    model_cls: type[BaseModel], data: Dict[str, Any], report: RepairReport
+) -> Optional[BaseModel]:
+    """
+    Validate `data` against `model_cls`, fixing invalid entry fields in place.
+
+    Args:
+        model_cls: Target model, e.g. `OutComb.OutExtExp`
+        data: Parsed JSON output
+        report: Collects errors seen and fixes applied
+
+    Returns:
+        Optional[BaseModel]: The validated model, or None if errors remain
+    """
+    try:
+        return model_cls.model_validate(data)
+    except ValidationError as exc:
+        errors = _errors(exc)
+    report.errors.extend(f"{'.'.join(map(str, loc))}: {msg}" for loc, msg in errors)
+
+    for loc, _ in errors:
+        # Only list entries (<list_field>, <index>, <field>) are repaired
+        if len(loc) < 3 or not isinstance(loc[1], int):
+            continue
+        entry_model = _entry_model(model_cls, loc[0])
+        entries = data.get(loc[0])
+        if entry_model is None or not isinstance(entries, list) or loc[1] >= len(entries):
+            continue
+        if _fix_field(entries[loc[1]], loc[2], entry_model):
+            report.fixed.append(".".join(map(str, loc[:3])))
+
+    try:
+        return model_cls.model_validate(data)
+    except ValidationError:
+        return None
+
+
+def broken_entries(model_cls: type[BaseModel], data: Dict[str, Any]) -> Dict[Tuple[str, int], List[str]]:
+    """
+    Returns:
+        Dict[Tuple[str, int], List[str]]: (list field, index) -> error messages
+    """
+    try:
+        model_cls.model_validate(data)
+        return {}
+    except ValidationError as exc:
+        errors = _errors(exc)
+    broken: Dict[Tuple[str, int], List[str]] = {}
+    for loc, msg in errors:
+        if len(loc) >= 2 and isinstance(loc[1], int):
+            broken.setdefault((loc[0], loc[1]), []).append(
+                f"{'.'.join(map(str, loc[2:]))}: {msg}"
+            )
+    return broken
+
+
+async def reprompt_entry(
+    client: ChatCompletionClient,
+    entry_model: type[BaseModel],
+    entry: Dict[str, Any],
+    errors: List[str],
+    cancellation_token: Optional[CancellationToken] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Ask the model to fix a single broken entry.
+
+    Args:
+        client: Model client to use
+        entry_model: Schema of the entry, e.g. `OutExpInfo`
+        entry: The invalid entry as parsed
+        errors: Validation messages for this entry
+
+    Returns:
+        Optional[Dict[str, Any]]: The corrected entry, or None if it is still invalid
+    """
+    messages: List[LLMMessage] = [
+        SystemMessage(
+            content=SYSMSG_REPAIR.format(
+                schema=json.dumps(entry_model.model_json_schema(), separators=(",", ":"))
+            )
+        ),
+        UserMessage(
+            content=f"Errors:\n" + "\n".join(errors) + f"\n\nObject:\n{json.dumps(entry)}",
+            source="repair",
+        ),
+    ]
+    result = await client.create(
+        messages, json_output=entry_model, cancellation_token=cancellation_token
+    )
+    if not isinstance(result.content, str):
+        return None
+    try:
+        return entry_model.model_validate_json(strip_json(result.content)).model_dump(mode="json")
+    except ValidationError:
+        return None
+
+
+async def repair_output(
+    model_cls: type[BaseModel],
+    content: str,
+    client: Optional[ChatCompletionClient] = None,
+    cancellation_token: Optional[CancellationToken] = None,
+) -> Tuple[Optional[BaseModel], RepairReport]:
+    """
+    Repair a structured model answer against `model_cls`.
+
+    Args:
+        model_cls: Target model, e.g. `OutComb.OutExtExp`
+        content: Raw model content
+        client: If given, used to re-prompt entries the deterministic pass could not fix
+
+    Returns:
+        Tuple[Optional[BaseModel], RepairReport]: Validated model (None if unrecoverable) and report
+    """
+    report = RepairReport()
+    try:
+        data = json.loads(strip_json(content))
+    except json.JSONDecodeError as exc:
+        report.errors.append(f"json: {exc}")
+        return None, report
+    if not isinstance(data, dict):
+        report.errors.append("json: top-level value is not an object")
+        return None, report
+
+    out = fix_deterministic(model_cls, data, report)
+    if out is None and client is not None:
+        for (list_field, idx), errors in broken_entries(model_cls, data).items():
+            entry_model = _entry_model(model_cls, list_field)
+            if entry_model is None:
+                continue
+            fixed = await reprompt_entry(
+                client, entry_model, data[list_field][idx], errors, cancellation_token
+            )
+            if fixed is not None:
+                data[list_field][idx] = fixed
+                report.reprompted.append(idx)
+        out = fix_deterministic(model_cls, data, report)
+
+    report.valid = out is not None
+    if report.errors:
+        logger.info(
+            f"{model_cls.__name__}: {len(report.errors)} errors, "
+            f"{len(report.fixed)} fixed locally, {len(report.reprompted)} re-prompted, "
+            f"valid={report.valid}"
+        )
+    return out, report
+
+
+class RepairingClient(WrappedClient):
+    """
+    Repairs structured outputs before they reach the agent.
+
+    When `json_output` is a Pydantic model and the answer does not validate,
+    the content of the CreateResult is replaced by the repaired JSON. If the
+    repair fails the original content is returned untouched, so the agent
+    surfaces the usual validation error.
+    """
+
+    def __init__(self, inner: ChatCompletionClient, reprompt: bool = True):
+        super().__init__(inner)
+        self.reprompt = reprompt
+
+    async def _repair(
+        self,
+        result: CreateResult,
+        json_output: Optional[bool | type[BaseModel]],
+        cancellation_token: Optional[CancellationToken],
+    ) -> CreateResult:
+        if not (isinstance(json_output, type) and issubclass(json_output, BaseModel)):
+            return result
+        if not isinstance(result.content, str):
+            return result
+        try:
+            json_output.model_validate_json(result.content)
+            return result
+        except ValidationError:
+            pass
+
+        out, _ = await repair_output(
+            json_output,
+            result.content,
+            self.inner if self.reprompt else None,
+            cancellation_token,
+        )
+        if out is None:
+            return result
+        return result.model_copy(update={"content": out.model_dump_json()})
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        result = await self.inner.create(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+        return await self._repair(result, json_output, cancellation_token)
+
+    async def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        async for chunk in self.inner.create_stream(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        ):
+            if isinstance(chunk, CreateResult):
+                chunk = await self._repair(chunk, json_output, cancellation_token)
+            yield chunk
@@ -0,0 +1,288 @@
+"""
+Declarative pipeline specs for the extraction graph.
+
+A pipeline is a JSON file (see `pipelines/`) listing the agents, their
+models, prompts and output types, and the edges between them. It is
+validated once and compiled to a `DiGraph`; both are cached per file, so a
+run only instantiates fresh agents around the cached graph. Switching the
+topology or the model assignment for an A/B comparison means pointing at
+another file.
+
+Agent kinds:
+    assistant: AssistantAgent with `model` (+ optional `hedge` model), a
+        `prompt` name from `prompts.sysmsg_ext` or an inline `system`
+        message, an optional `doc` ("resume" / "linkedin") whose markdown
+        is prefixed to the prompt, and an optional `output` type name.
+        `fewshot_k` replaces the prompt's examples by the k example entries
+        most similar to the document (`utils.fewshot`). Agents with a `doc`
+        are extractors: their dates are normalized (`utils.datenorm`).
+    merge: AgtMerge of `sources` ("edu" / "exp" in `merge`), `model` for
+        ambiguous pairs; `speculative` merges as soon as both sources have
+        answered instead of when GraphFlow activates it (`utils.speculate`).
+    comb: AgtComb of `exp_source` and `edu_source`, plus optional
+        `sections` ({"proj": <agent>, ...}).
+    chunked: AgtChunk experience extraction of `doc` with `model` (+
+        optional `hedge`); the single-shot `prompt` is used below
+        `min_positions` positions.
+
+Every agent is passed only the last structured message of each of its
+parents (`agents.AgtFilter`); `"context": "all"` keeps the whole
+conversation for an agent that needs it.
+"""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Literal, Optional, Tuple
+
+from autogen_agentchat.agents import AssistantAgent
+from autogen_agentchat.base import ChatAgent
+from autogen_agentchat.teams import DiGraph, DiGraphEdge, DiGraphNode
+from autogen_core.models import ChatCompletionClient
+from pydantic import BaseModel, model_validator
+
+from agents.AgtChunk import AgtChunk
+from agents.AgtComb import OPTIONAL_SECTIONS, AgtComb
+from agents.AgtMerge import AgtMerge
+from common.constants import CHUNK_MIN_POSITIONS, MODEL_CONFIGS
+import prompts.sysmsg_ext as sysmsg
+from prompts.out_ext import OutComb
+from utils.datenorm import DateNormClient
+from utils.docguard import DOC_LABELS
+from utils.fewshot import select_fewshots
+from utils.speculate import SpeculationBoard
+
+PIPELINES_DIR = Path(__file__).parent.parent / "pipelines"
+
+# Output type names usable in specs
+OUTPUT_TYPES: Dict[str, type[BaseModel]] = {
+    "OutExtEdu": OutComb.OutExtEdu,
+    "OutExtExp": OutComb.OutExtExp,
+    "OutExtProj": OutComb.OutExtProj,
+    "OutExtSkill": OutComb.OutExtSkill,
+    "OutExtCert": OutComb.OutExtCert,
+    "OutExtCourse": OutComb.OutExtCourse,
+    "OutComb": OutComb,
+}
+
+# (agent name, model, hedge model) -> client with budgets and telemetry
+ClientFactory = Callable[[str, str, Optional[str]], ChatCompletionClient]
+
+
+class AgentSpec(BaseModel):
+    name: str
+    kind: Literal["assistant", "merge", "comb", "chunked"] = "assistant"
+    model: Optional[str] = None
+    hedge: Optional[str] = None
+    prompt: Optional[str] = None
+    system: Optional[str] = None
+    doc: Optional[Literal["resume", "linkedin"]] = None
+    output: Optional[str] = None
+    stream: bool = False
+    merge: Optional[Literal["edu", "exp"]] = None
+    sources: List[str] = []
+    exp_source: str = "CombExp"
+    edu_source: str = "CombEdu"
+    sections: Dict[str, str] = {}
+    min_positions: int = CHUNK_MIN_POSITIONS
+    fewshot_k: Optional[int] = None
+    context: Literal["parents", "all"] = "parents"
+    speculative: bool = False
+
+    @model_validator(mode="after")
+    def check_fields(self) -> "AgentSpec":
+        for model in (self.model, self.hedge):
+            if model is not None and model not in MODEL_CONFIGS:
+                raise ValueError(f"{self.name}: unknown model {model}")
+        if self.output is not None and self.output not in OUTPUT_TYPES:
+            raise ValueError(f"{self.name}: unknown output type {self.output}")
+        if self.kind == "chunked":
+            if self.model is None or self.prompt is None or self.doc is None:
+                raise ValueError(f"{self.name}: chunked agents need a model, prompt and doc")
+            if self.output not in (None, "OutExtExp"):
+                raise ValueError(f"{self.name}: chunked agents output OutExtExp")
+        if self.kind in ("assistant", "chunked"):
+            if self.model is None:
+                raise ValueError(f"{self.name}: {self.kind} agents need a model")
+            if (self.prompt is None) == (self.system is None):
+                raise ValueError(f"{self.name}: give exactly one of prompt / system")
+            if self.prompt is not None:
+                if not isinstance(getattr(sysmsg, self.prompt, None), str):
+                    raise ValueError(f"{self.name}: unknown prompt {self.prompt}")
+        if self.kind == "merge" and (self.merge is None or len(self.sources) != 2):
+            raise ValueError(f"{self.name}: merge agents need `merge` and two `sources`")
+        if self.speculative and self.kind != "merge":
+            raise ValueError(f"{self.name}: only merge agents can be speculative")
+        if self.fewshot_k is not None and (self.doc is None or self.prompt not in sysmsg.FEWSHOTS):
+            raise ValueError(f"{self.name}: fewshot_k needs a doc and a prompt with examples")
+        unknown = set(self.sections) - set(OPTIONAL_SECTIONS)
+        if unknown:
+            raise ValueError(f"{self.name}: unknown sections {sorted(unknown)}")
+        return self
+
+
+class PipelineSpec(BaseModel):
+    name: str
+    agents: List[AgentSpec]
+    edges: List[Tuple[str, str]]
+
+    @model_validator(mode="after")
+    def check_graph(self) -> "PipelineSpec":
+        names = [a.name for a in self.agents]
+        if len(set(names)) != len(names):
+            raise ValueError(f"{self.name}: duplicate agent names")
+        for src, dst in self.edges:
+            if src not in names or dst not in names:
+                raise ValueError(f"{self.name}: edge {src} -> {dst} references an unknown agent")
+        parents = {n: {s for s, d in self.edges if d == n} for n in names}
+        for agent in self.agents:
+            refs = agent.sources if agent.kind == "merge" else []
+            if agent.kind == "comb":
+                refs = [agent.exp_source, agent.edu_source, *agent.sections.values()]
+            missing = set(refs) - parents[agent.name]
+            if missing:
+                raise ValueError(f"{agent.name}: inputs {sorted(missing)} are not its parents")
+
+        # Kahn's algorithm: every node must be reachable in a topological order
+        remaining = dict(parents)
+        while remaining:
+            ready = [n for n, ps in remaining.items() if not ps & remaining.keys()]
+            if not ready:
+                raise ValueError(f"{self.name}: cycle among {sorted(remaining)}")
+            for n in ready:
+                del remaining[n]
+        # The profile must come from exactly one agent
+        self.final
+        return self
+
+    @property
+    def final(self) -> str:
+        """
+        Name of the agent that answers with the `OutComb` profile: the comb
+        agent, else an agent with `"output": "OutComb"`, else the only leaf.
+        """
+        for candidates in (
+            [a.name for a in self.agents if a.kind == "comb"],
+            [a.name for a in self.agents if a.output == "OutComb"],
+            [a.name for a in self.agents if all(src != a.name for src, _ in self.edges)],
+        ):
+            if len(candidates) == 1:
+                return candidates[0]
+        raise ValueError(f"{self.name}: no single agent produces the final profile")
+
+
+@lru_cache(maxsize=None)
+def _load(path: Path, mtime: float) -> Tuple[PipelineSpec, DiGraph]:
+    spec = PipelineSpec.model_validate(json.loads(path.read_text()))
+    graph = DiGraph(
+        nodes={
+            a.name: DiGraphNode(
+                name=a.name,
+                edges=[DiGraphEdge(target=dst) for src, dst in spec.edges if src == a.name],
+            )
+            for a in spec.agents
+        }
+    )
+    graph.graph_validate()
+    return spec, graph
+
+
+def resolve(pipeline: str | Path) -> Path:
+    """A spec path, or the name of a file in `pipelines/` without `.json`."""
+    path = Path(pipeline)
+    if path.suffix != ".json":
+        path = PIPELINES_DIR / f"{pipeline}.json"
+    return path.resolve()
+
+
+def load_pipeline(pipeline: str | Path) -> Tuple[PipelineSpec, DiGraph]:
+    """
+    Validated spec and compiled graph, cached until the file changes.
+
+    Args:
+        pipeline: Spec path or name in `pipelines/`
+
+    Returns:
+        Tuple[PipelineSpec, DiGraph]: The spec and its graph (do not modify either)
+    """
+    path = resolve(pipeline)
+    return _load(path, path.stat().st_mtime)
+
+
+def _system_message(spec: AgentSpec, docs: Dict[str, str]) -> str:
+    if spec.system is not None:
+        return spec.system
+    if spec.doc is None:
+        return getattr(sysmsg, spec.prompt)
+    md = docs[spec.doc]
+    fewshot = None
+    if spec.fewshot_k is not None:
+        fewshot = select_fewshots(sysmsg.FEWSHOTS[spec.prompt][0], md, spec.fewshot_k)
+    return sysmsg.template(spec.prompt, DOC_LABELS[spec.doc]).render(md, fewshot)
+
+
+def build_agent(
+    spec: AgentSpec,
+    docs: Dict[str, str],
+    client_for: ClientFactory,
+    board: Optional[SpeculationBoard] = None,
+) -> ChatAgent:
+    if spec.kind == "merge":
+        return AgtMerge(
+            name=spec.name,
+            kind=spec.merge,
+            sources=spec.sources,
+            model_client=client_for(spec.name, spec.model, spec.hedge) if spec.model else None,
+            board=board if spec.speculative else None,
+        )
+    if spec.kind == "comb":
+        return AgtComb(
+            name=spec.name,
+            exp_source=spec.exp_source,
+            edu_source=spec.edu_source,
+            sections=spec.sections,
+        )
+    client = client_for(spec.name, spec.model, spec.hedge)
+    if spec.doc is not None:
+        # Extractors answer with dates as written in the document
+        client = DateNormClient(client)
+    if spec.kind == "chunked":
+        return AgtChunk(
+            name=spec.name,
+            md=docs[spec.doc],
+            system=_system_message(spec, docs),
+            position_system=sysmsg.taskExtExpPos,
+            model_client=client,
+            min_positions=spec.min_positions,
+        )
+    return AssistantAgent(
+        name=spec.name,
+        system_message=_system_message(spec, docs),
+        model_client=client,
+        model_client_stream=spec.stream,
+        output_content_type=OUTPUT_TYPES[spec.output] if spec.output else None,
+    )
+
+
+def compile_pipeline(
+    pipeline: str | Path,
+    docs: Dict[str, str],
+    client_for: ClientFactory,
+    board: Optional[SpeculationBoard] = None,
+) -> Tuple[List[ChatAgent], DiGraph]:
+    """
+    Fresh agents for one run around the cached graph.
+
+    Args:
+        pipeline: Spec path or name in `pipelines/`
+        docs: Markdown per document kind ("resume", "linkedin")
+        client_for: Builds the model client of an agent
+        board: Board of the run for speculative agents; without one they
+            are not speculative
+
+    Returns:
+        Tuple[List[ChatAgent], DiGraph]: Participants and graph for GraphFlow
+    """
+    spec, graph = load_pipeline(pipeline)
+    participants = [build_agent(a, docs, client_for, board) for a in spec.agents]
+    return participants, graph.model_copy(deep=True)
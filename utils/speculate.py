@@ -0,0 +1,73 @@
+"""
+Speculative execution of merge nodes.
+
+GraphFlow runs the graph in steps: a node is only activated once every node
+of the previous step has answered, so `CombEdu` waits for the slowest
+extractor of the run (often `ExtLkdExp`), not just for its own two sources.
+A `SpeculationBoard` makes node outputs visible the moment they are
+produced; a speculative `AgtMerge` prepares each source's entries as they
+arrive and merges as soon as it has both, while the rest of the step is
+still running. When GraphFlow then activates it with the same inputs, the
+result is already there (or on its way); different inputs discard it.
+Merges no activation picked up (a node served from memo) are discarded when
+the board is closed at the end of the run.
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Set
+
+from autogen_agentchat.messages import BaseChatMessage
+
+from utils.commonutil import set_logger
+
+logger = set_logger("Speculate")
+
+
+@dataclass
+class SpeculationReport:
+    """Speculative merges used and discarded, accumulated over runs."""
+
+    hits: int = 0
+    misses: int = 0
+    # Seconds of merge work done before the node was activated, per hit
+    ahead: List[float] = field(default_factory=list)
+
+
+class SpeculationBoard:
+    """Node outputs of one run, published as soon as each node answers."""
+
+    def __init__(self):
+        self.outputs: Dict[str, BaseChatMessage] = {}
+        self._subscribers: Dict[str, List[Callable[[BaseChatMessage], None]]] = {}
+        self._on_close: List[Callable[[], None]] = []
+
+    @property
+    def sources(self) -> Set[str]:
+        """Nodes someone subscribed to."""
+        return set(self._subscribers)
+
+    def subscribe(self, source: str, callback: Callable[[BaseChatMessage], None]) -> None:
+        """Call `callback` with every message `source` answers with (called on the event loop)."""
+        self._subscribers.setdefault(source, []).append(callback)
+
+    def on_close(self, callback: Callable[[], None]) -> None:
+        """Call `callback` when the run ends, e.g. to cancel speculative work."""
+        self._on_close.append(callback)
+
+    def close(self) -> None:
+        """End of the run: run the close callbacks, forget the outputs."""
+        for callback in self._on_close:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"closing speculation failed: {e!r}")
+        self.outputs.clear()
+
+    def publish(self, msg: BaseChatMessage) -> None:
+        self.outputs[msg.source] = msg
+        for callback in self._subscribers.get(msg.source, []):
+            try:
+                callback(msg)
+            except Exception as e:
+                # Speculation is an optimization; the regular activation still runs
+                logger.warning(f"speculation on {msg.source} failed: {e!r}")
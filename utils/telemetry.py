@@ -0,0 +1,245 @@
+"""
+Per-agent token and latency telemetry.
+
+`TelemetryClient` wraps the model client of one agent and records every
+call into a shared `Telemetry` sink, which appends JSONL records as they
+happen and can write a Prometheus text-format file (node_exporter textfile
+collector) with the aggregated counters.
+"""
+
+import json
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncGenerator,
+    Dict,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel
+
+from utils.llmclient import WrappedClient, get_model_name
+
+
+@dataclass
+class CallRecord:
+    ts: float
+    run_id: str
+    agent: str
+    model: str
+    prompt_tokens: int
+    completion_tokens: int
+    prompt_cached_tokens: int
+    ttft: Optional[float]
+    latency: float
+    cached: bool
+    ok: bool
+
+
+class Telemetry:
+    """
+    Collects `CallRecord`s for a process.
+
+    Args:
+        jsonl_path: If given, every record is appended to this file immediately
+        run_id: Label attached to every record (e.g. one per batch run)
+    """
+
+    def __init__(self, jsonl_path: Optional[Path] = None, run_id: str = ""):
+        self.jsonl_path = Path(jsonl_path) if jsonl_path else None
+        self.run_id = run_id
+        self.records: List[CallRecord] = []
+
+    def record(self, rec: CallRecord) -> None:
+        self.records.append(rec)
+        if self.jsonl_path is not None:
+            self.jsonl_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.jsonl_path, "a") as f:
+                f.write(json.dumps(asdict(rec)) + "\n")
+
+    def summary(self) -> Dict[Tuple[str, str], Dict[str, float]]:
+        """
+        Returns:
+            Dict[Tuple[str, str], Dict[str, float]]: Aggregates per (agent, model)
+        """
+        out: Dict[Tuple[str, str], Dict[str, float]] = {}
+        for r in self.records:
+            agg = out.setdefault(
+                (r.agent, r.model),
+                {
+                    "calls": 0,
+                    "errors": 0,
+                    "cache_hits": 0,
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                    "prompt_cached_tokens": 0,
+                    "latency_sum": 0.0,
+                    "ttft_sum": 0.0,
+                    "ttft_count": 0,
+                },
+            )
+            agg["calls"] += 1
+            agg["errors"] += 0 if r.ok else 1
+            agg["cache_hits"] += 1 if r.cached else 0
+            agg["prompt_tokens"] += r.prompt_tokens
+            agg["completion_tokens"] += r.completion_tokens
+            agg["prompt_cached_tokens"] += r.prompt_cached_tokens
+            agg["latency_sum"] += r.latency
+            if r.ttft is not None:
+                agg["ttft_sum"] += r.ttft
+                agg["ttft_count"] += 1
+        return out
+
+    def write_prometheus(self, path: Path) -> None:
+        """
+        Write the aggregates in Prometheus text exposition format.
+
+        Args:
+            path: Output file, typically `<textfile_dir>/job_applicator.prom`
+        """
+        metrics = [
+            ("agent_calls_total", "counter", "Model calls per agent", "calls"),
+            ("agent_errors_total", "counter", "Failed model calls per agent", "errors"),
+            ("agent_cache_hits_total", "counter", "Calls served without a model call", "cache_hits"),
+            ("agent_prompt_tokens_total", "counter", "Prompt tokens evaluated", "prompt_tokens"),
+            ("agent_completion_tokens_total", "counter", "Completion tokens generated", "completion_tokens"),
+            ("agent_prompt_cached_tokens_total", "counter", "Prompt tokens reused from the KV cache (estimate)", "prompt_cached_tokens"),
+        ]
+        # Summaries without quantiles: a _sum and a _count sample per series
+        summaries = [
+            ("agent_latency_seconds", "Call latency", "latency_sum", "calls"),
+            ("agent_ttft_seconds", "Time to first token (streamed calls)", "ttft_sum", "ttft_count"),
+        ]
+        summary = self.summary()
+        labelled = []
+        for (agent, model), agg in sorted(summary.items()):
+            labels = f'agent="{agent}",model="{model}"'
+            if self.run_id:
+                labels += f',run_id="{self.run_id}"'
+            labelled.append((labels, agg))
+        lines: List[str] = []
+        for name, kind, help_text, key in metrics:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(f"{name}{{{labels}}} {agg[key]}" for labels, agg in labelled)
+        for name, help_text, sum_key, count_key in summaries:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} summary")
+            for labels, agg in labelled:
+                lines.append(f"{name}_sum{{{labels}}} {agg[sum_key]}")
+                lines.append(f"{name}_count{{{labels}}} {agg[count_key]}")
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so a scraper never reads a half-written file
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text("\n".join(lines) + "\n")
+        tmp.replace(path)
+
+
+class TelemetryClient(WrappedClient):
+    """
+    Records one `CallRecord` per model call made on behalf of `agent`.
+    """
+
+    def __init__(self, inner: ChatCompletionClient, agent: str, telemetry: Telemetry):
+        super().__init__(inner)
+        self.agent = agent
+        self.telemetry = telemetry
+        self._model = get_model_name(inner)
+
+    def _record(
+        self,
+        messages: Sequence[LLMMessage],
+        started: float,
+        ttft: Optional[float],
+        result: Optional[CreateResult],
+    ) -> None:
+        prompt_tokens = completion_tokens = cached_prompt = 0
+        # Cached and coalesced results carry the usage of the call that produced
+        # them; counting it again would inflate the token totals
+        if result is not None and not result.cached:
+            prompt_tokens = result.usage.prompt_tokens
+            completion_tokens = result.usage.completion_tokens
+            cached_prompt = max(self.inner.count_tokens(messages) - prompt_tokens, 0)
+        self.telemetry.record(
+            CallRecord(
+                ts=time.time(),
+                run_id=self.telemetry.run_id,
+                agent=self.agent,
+                model=self._model,
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                prompt_cached_tokens=cached_prompt,
+                ttft=ttft,
+                latency=time.perf_counter() - started,
+                cached=bool(result is not None and result.cached),
+                ok=result is not None,
+            )
+        )
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        started = time.perf_counter()
+        result: Optional[CreateResult] = None
+        try:
+            result = await self.inner.create(
+                messages,
+                tools=tools,
+                tool_choice=tool_choice,
+                json_output=json_output,
+                extra_create_args=extra_create_args,
+                cancellation_token=cancellation_token,
+            )
+            return result
+        finally:
+            self._record(messages, started, None, result)
+
+    async def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        started = time.perf_counter()
+        ttft: Optional[float] = None
+        result: Optional[CreateResult] = None
+        try:
+            async for chunk in self.inner.create_stream(
+                messages,
+                tools=tools,
+                tool_choice=tool_choice,
+                json_output=json_output,
+                extra_create_args=extra_create_args,
+                cancellation_token=cancellation_token,
+            ):
+                if isinstance(chunk, CreateResult):
+                    result = chunk
+                elif ttft is None:
+                    ttft = time.perf_counter() - started
+                yield chunk
+        finally:
+            self._record(messages, started, ttft, result)